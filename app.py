@@ -3,13 +3,14 @@ AIA 2.0 — Dual-Team AI Investment Agency Dashboard
 투자 에이전시 대시보드 메인 애플리케이션
 """
 
+import os
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-# import altair as alt  # Python 3.14 호환성 문제로 임시 제거
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+from instrumentation import begin_run, dump_metrics, instrumented, recorder, timed
+
+# 차트·데이터 라이브러리와 planning 모듈은 각 화면 함수 안에서 필요한 것만 가져옵니다
+# (인트로 화면은 pandas/Plotly 없이 바로 표시되어 첫 요청 지연이 줄어듭니다)
 
 # 페이지 설정
 st.set_page_config(
@@ -19,46 +20,29 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# 유틸리티 함수들
-def format_money(value):
-    """숫자를 한국식 화폐 단위로 변환"""
-    if value >= 1000000000000:  # 조
-        return f"{value/1000000000000:.1f}조원"
-    elif value >= 100000000:  # 억
-        return f"{value/100000000:.1f}억원"
-    elif value >= 10000:  # 만
-        return f"{value/10000:.0f}만원"
-    else:
-        return f"{value:,.0f}원"
-
-def format_percent(value):
-    """소수를 퍼센트로 변환"""
-    return f"{value*100:.1f}%" if value < 1 else f"{value:.1f}%"
-
-def get_stock_info(종목코드):
-    """종목 정보 조회 (더미 데이터)"""
-    # 실제로는 API에서 가져올 데이터
-    stock_data = {
-        '005930': {'name': '삼성전자', 'sector': '반도체', 'price': 68000, 'PER': 12.5, 'RSI': 45.2, '밴드대비': -8.5},
-        '000660': {'name': 'SK하이닉스', 'sector': '반도체', 'price': 89000, 'PER': 15.2, 'RSI': 38.7, '밴드대비': -12.3},
-        '373220': {'name': 'LG에너지솔루션', 'sector': '배터리', 'price': 420000, 'PER': 22.1, 'RSI': 55.8, '밴드대비': 2.1},
-        '207940': {'name': '삼성바이오로직스', 'sector': '바이오', 'price': 750000, 'PER': 28.5, 'RSI': 62.3, '밴드대비': 8.7},
-        '035720': {'name': '카카오', 'sector': 'IT서비스', 'price': 42000, 'PER': 35.2, 'RSI': 41.2, '밴드대비': -15.2},
-        '051910': {'name': 'LG화학', 'sector': '화학', 'price': 320000, 'PER': 18.7, 'RSI': 52.1, '밴드대비': -3.4},
-        '006400': {'name': '삼성SDI', 'sector': '배터리', 'price': 380000, 'PER': 16.8, 'RSI': 48.9, '밴드대비': -6.7},
-        '028260': {'name': '삼성물산', 'sector': '건설', 'price': 85000, 'PER': 8.9, 'RSI': 33.5, '밴드대비': -18.9},
-        '323410': {'name': '카카오뱅크', 'sector': '금융', 'price': 18500, 'PER': 12.3, 'RSI': 44.1, '밴드대비': -9.8},
-        '454740': {'name': 'L&K바이오메드', 'sector': '바이오', 'price': 24500, 'PER': 45.2, 'RSI': 67.8, '밴드대비': 12.4}
-    }
+# 화면 표시 함수들
+@instrumented("figure.simulation")
+def draw_simulation_chart(결과):
+    """몬테카를로 백분위 밴드 차트"""
+    import plotly.graph_objects as go
+    
+    밴드 = 결과['bands']
+    연도 = 결과['years']
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=연도, y=밴드[95], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=연도, y=밴드[5], fill='tonexty', fillcolor='rgba(31,119,180,0.15)',
+                             line=dict(width=0), name='5~95%'))
+    fig.add_trace(go.Scatter(x=연도, y=밴드[75], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+    fig.add_trace(go.Scatter(x=연도, y=밴드[25], fill='tonexty', fillcolor='rgba(31,119,180,0.35)',
+                             line=dict(width=0), name='25~75%'))
+    fig.add_trace(go.Scatter(x=연도, y=밴드[50], line=dict(color='#1f77b4', width=2), name='중앙값'))
+    fig.add_trace(go.Scatter(x=연도, y=결과['invested'], line=dict(color='gray', dash='dash'), name='누적 원금'))
+    fig.update_layout(
+        height=350, xaxis_title="경과 연수", yaxis_title="평가금액 (원)",
+        title=f"자산 분포 ({결과['paths_done']:,} / {결과['paths_total']:,} 경로)"
+    )
     
-    return stock_data.get(종목코드, {
-        'name': f'종목{종목코드}',
-        'sector': '기타',
-        'price': 50000 + np.random.randint(-20000, 20000),
-        'PER': 15 + np.random.randint(-10, 15),
-        'RSI': 50 + np.random.randint(-30, 30),
-        '밴드대비': np.random.randint(-20, 20)
-    })
+    return fig
 
 def init_session_state():
     """세션 상태 초기화"""
@@ -83,6 +67,16 @@ def init_session_state():
     if 'decision' not in st.session_state:
         st.session_state.decision = None
 
+def plan_graph(**입력):
+    """세션별 증분 계획 그래프 — 현재 세션 상태로 입력을 갱신해 반환 (바뀐 입력의 하위 노드만 재계산)"""
+    from planning import PlanInputs, build_plan_graph
+    
+    if 'plan_graph' not in st.session_state:
+        st.session_state.plan_graph = build_plan_graph()
+    graph = st.session_state.plan_graph
+    graph.update(PlanInputs.from_state(st.session_state), 확정포트폴리오=st.session_state.get('final_portfolio'), **입력)
+    return graph
+
 def show_progress_bar():
     """현재까지의 선택 요약바 표시"""
     col1, col2, col3, col4 = st.columns(4)
@@ -109,7 +103,7 @@ def show_progress_bar():
             st.warning("📊 거시: 미선택")
     
     with col4:
-        현재단계 = ["인트로", "거시전략가", "자산배분가", "섹터리서처", "종목애널리스트", "CIO전략실"][st.session_state.current_tab]
+        현재단계 = ["인트로", "거시전략가", "자산배분가", "섹터리서처", "종목애널리스트", "CIO전략실", "Trade Planner"][st.session_state.current_tab]
         st.success(f"📍 현재: {현재단계}")
     
     st.divider()
@@ -145,6 +139,16 @@ def tab_intro():
             help="• 안정형: 원금 보전 중시, 낮은 변동성 선호\n• 중립형: 적절한 수익과 위험의 균형\n• 공격형: 높은 수익 추구, 변동성 수용"
         )
         
+        # 투자기간 입력
+        horizon_years = st.number_input(
+            "투자 기간 (년)",
+            min_value=1,
+            max_value=30,
+            value=10,
+            step=1,
+            help="최종 포트폴리오 시뮬레이션에 사용할 투자 기간입니다"
+        )
+        
         # 선호시장 선택
         market_preference = st.radio(
             "선호 시장",
@@ -159,11 +163,14 @@ def tab_intro():
         # 시작하기 버튼
         if st.button("🚀 투자 분석 시작하기", type="primary", width="stretch"):
             # 프로필 저장
-            st.session_state.profile = {
-                "asset": asset_amount,
-                "성향": risk_preference,
-                "시장": market_preference
-            }
+            from planning import Profile
+            
+            st.session_state.profile = Profile(
+                asset=asset_amount,
+                성향=risk_preference,
+                시장=market_preference,
+                기간=horizon_years
+            )
             st.session_state.current_tab = 1
             st.rerun()
     
@@ -192,6 +199,9 @@ def tab_intro():
 
 def tab_macro():
     """② 거시전략가 탭"""
+    import pandas as pd
+    import plotly.graph_objects as go
+    
     st.title("📊 거시전략가 — 시장 환경 분석")
     
     col1, col2 = st.columns([2, 1])
@@ -325,6 +335,10 @@ def tab_macro():
 
 def tab_allocation():
     """③ 자산배분가 탭"""
+    import plotly.graph_objects as go
+
+    from planning import format_money
+    
     st.title("💰 자산배분가 — 포트폴리오 구성")
     
     st.markdown("### 🎯 3가지 자산배분 전략")
@@ -461,30 +475,38 @@ def tab_allocation():
 
 def tab_sector():
     """④ 섹터 리서처 탭"""
+    import pandas as pd
+    import plotly.express as px
+
+    from planning import SECTOR_THEMES, build_sector_table, theme_sectors
+    
     st.title("🔍 섹터리서처 — 유망 산업 발굴")
     
-    # 섹터 상대강도 데이터 (더미)
-    sector_data = {
-        "섹터": ["AI/반도체", "로봇/자동화", "2차전지", "바이오/헬스", "게임/엔터", "화학/소재", "자동차", "에너지", "유틸리티", "필수소비재"],
-        "상대강도": [24, 18, 15, 8, 5, -2, -3, -5, -8, -12]
-    }
+    # 섹터 상대강도 순위 (가격 기반, 거래일마다 한 번 계산하는 세션 공용 캐시)
+    df_sector = build_sector_table()
+    섹터강도 = dict(zip(df_sector["섹터"], df_sector["상대강도"]))
+    테마섹터 = {테마: theme_sectors(테마, df_sector) for 테마 in SECTOR_THEMES}
     
-    df_sector = pd.DataFrame(sector_data)
+    def 테마목록(테마):
+        return "\n".join(f"        • {섹터} ({섹터강도.get(섹터, float('nan')):+.0f}%)" for 섹터 in 테마섹터[테마])
     
     st.markdown("### 📊 섹터별 상대강도 분석")
     
     # 바차트 생성
-    fig = px.bar(
-        df_sector, 
-        x="상대강도", 
-        y="섹터", 
-        orientation='h',
-        color="상대강도",
-        color_continuous_scale="RdYlGn",
-        title="최근 3개월 대비 상대강도 (%)"
-    )
-    fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    with timed("figure.sector_strength"):
+        fig = px.bar(
+            df_sector, 
+            x="상대강도", 
+            y="섹터", 
+            orientation='h',
+            color="상대강도",
+            color_continuous_scale="RdYlGn",
+            hover_data=["1개월", "6개월", "종목수"],
+            title="최근 3개월 KOSPI 대비 상대강도 (%)"
+        )
+    
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
     
     st.markdown("---")
     st.markdown("### 🎯 섹터 투자 테마 선택")
@@ -493,11 +515,9 @@ def tab_sector():
     
     with col1:
         st.markdown("#### 🚀 성장섹터")
-        st.info("""
+        st.info(f"""
         **핵심 테마: AI 혁신**
-        • AI/반도체 (+24%)
-        • 로봇/자동화 (+18%)
-        • 2차전지 (+15%)
+{테마목록("성장")}
         
         **투자 논리:**
         • 4차 산업혁명 가속화
@@ -506,16 +526,14 @@ def tab_sector():
         """)
         
         if st.button("🚀 성장섹터 선택", key="sector_growth"):
-            st.session_state.choice_sector = ["AI/반도체", "로봇/자동화", "2차전지"]
+            st.session_state.choice_sector = 테마섹터["성장"]
             st.success("성장섹터가 선택되었습니다!")
     
     with col2:
         st.markdown("#### 💰 배당/가치섹터")
-        st.info("""
+        st.info(f"""
         **핵심 테마: 밸류 투자**
-        • 에너지 (-5%)
-        • 유틸리티 (-8%)
-        • 금융/보험 (0%)
+{테마목록("가치")}
         
         **투자 논리:**
         • 저평가 구간 진입
@@ -524,16 +542,14 @@ def tab_sector():
         """)
         
         if st.button("💰 배당/가치섹터 선택", key="sector_value"):
-            st.session_state.choice_sector = ["에너지", "유틸리티", "금융/보험"]
+            st.session_state.choice_sector = 테마섹터["가치"]
             st.success("배당/가치섹터가 선택되었습니다!")
     
     with col3:
         st.markdown("#### 🛡️ 안정소비섹터")
-        st.info("""
+        st.info(f"""
         **핵심 테마: 방어 투자**
-        • 필수소비재 (-12%)
-        • 바이오/헬스 (+8%)
-        • 통신서비스 (-3%)
+{테마목록("방어")}
         
         **투자 논리:**
         • 경기 둔감 특성
@@ -542,7 +558,7 @@ def tab_sector():
         """)
         
         if st.button("🛡️ 안정소비섹터 선택", key="sector_defensive"):
-            st.session_state.choice_sector = ["필수소비재", "바이오/헬스", "통신서비스"]
+            st.session_state.choice_sector = 테마섹터["방어"]
             st.success("안정소비섹터가 선택되었습니다!")
     
     # 선택된 섹터 표시
@@ -552,7 +568,8 @@ def tab_sector():
         
         선택된섹터 = st.session_state.choice_sector
         for i, 섹터 in enumerate(선택된섹터):
-            상대강도 = df_sector[df_sector["섹터"] == 섹터]["상대강도"].iloc[0] if 섹터 in df_sector["섹터"].values else 0
+            상대강도 = 섹터강도.get(섹터, 0)
+            상대강도 = 0 if pd.isna(상대강도) else 상대강도
             
             col1, col2, col3 = st.columns([2, 1, 1])
             with col1:
@@ -578,6 +595,8 @@ def tab_sector():
 
 def tab_analyst():
     """⑤ 종목 애널리스트 탭"""
+    from planning import format_money, lookup_stock_info, pick_factor_scores, screen_universe
+    
     st.title("📈 종목애널리스트 — 개별 종목 분석")
     
     # 분석 기준 선택
@@ -593,36 +612,22 @@ def tab_analyst():
     
     st.markdown("---")
     
-    # 선택된 섹터 기반 종목 데이터 생성 (더미)
+    # 선택된 섹터 기반 전체 종목 스크리닝
     선택섹터 = st.session_state.choice_sector or ["AI/반도체", "로봇/자동화"]
     
-    stock_data = {
-        "종목명": ["삼성전자", "네이버", "레인보우로보틱스", "LG에너지솔루션", "카카오", "셀트리온"],
-        "섹터": ["AI/반도체", "AI/반도체", "로봇/자동화", "2차전지", "AI/반도체", "바이오/헬스"],
-        "시총": [450, 45, 6.5, 85, 25, 35],
-        "현재가": [78000, 198000, 337000, 485000, 55000, 185000],
-        "PER": [20.5, 34.0, 82.1, 28.5, 45.2, 25.8],
-        "PBR": [2.1, 4.2, 5.2, 3.8, 3.5, 2.9],
-        "RSI": [58, 62, 64, 45, 55, 72],
-        "밴드대비": [2.6, 8.8, 16.2, -5.2, 12.1, 22.5]
-    }
-    
-    df_stocks = pd.DataFrame(stock_data)
-    
-    # 선택된 섹터의 종목만 필터링
-    if 선택섹터:
-        df_filtered = df_stocks[df_stocks["섹터"].isin(선택섹터)]
-    else:
-        df_filtered = df_stocks
-    
     st.markdown("### 📊 종목 분석 결과")
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
+        페이지 = st.session_state.get("analyst_page", 1) - 1
+        결과 = screen_universe(선택섹터, 저평가_switch, 안정성_switch, 성장성_switch, page=페이지)
+        df_filtered = 결과["표"]
+        
         # 선택 가능한 테이블 생성
         if not df_filtered.empty:
             st.markdown("#### 💼 추천 종목 리스트")
+            st.caption(f"조건 충족 {결과['전체']:,}종목 중 {결과['페이지']+1}/{결과['페이지수']} 페이지 (종합점수 순)")
             
             # 각 종목에 대한 카드 형태로 표시
             for idx, row in df_filtered.iterrows():
@@ -649,7 +654,7 @@ def tab_analyst():
                             st.info(f"밴드: {row['밴드대비']:+.1f}%")
                     
                     # 종목 담기 버튼
-                    if st.button(f"📝 {row['종목명']} 포트폴리오에 담기", key=f"pick_{idx}"):
+                    if st.button(f"📝 {row['종목명']} 포트폴리오에 담기", key=f"pick_{row['종목코드']}"):
                         if row['종목명'] not in st.session_state.picks:
                             st.session_state.picks.append(row['종목명'])
                             st.success(f"{row['종목명']}이(가) 포트폴리오에 추가되었습니다!")
@@ -657,6 +662,10 @@ def tab_analyst():
                             st.warning(f"{row['종목명']}은(는) 이미 포트폴리오에 있습니다.")
                     
                     st.divider()
+            
+            if 결과['페이지수'] > 1:
+                st.session_state.analyst_page = 결과['페이지'] + 1  # 필터 변경으로 페이지 수가 줄어든 경우 보정
+                st.number_input("페이지", min_value=1, max_value=결과['페이지수'], key="analyst_page")
         else:
             st.warning("선택된 섹터의 종목이 없습니다.")
     
@@ -666,16 +675,15 @@ def tab_analyst():
         if st.session_state.picks:
             for i, 종목 in enumerate(st.session_state.picks):
                 # 해당 종목의 정보 가져오기
-                종목정보 = df_stocks[df_stocks["종목명"] == 종목].iloc[0] if 종목 in df_stocks["종목명"].values else None
+                종목정보 = lookup_stock_info(종목)
                 
                 if 종목정보 is not None:
                     with st.container():
                         st.markdown(f"**{i+1}. {종목}**")
                         
-                        # 점수 계산 (더미)
-                        저평가점수 = max(0, min(100, 100 - 종목정보['PER'] * 2))
-                        안정성점수 = max(0, min(100, 100 - abs(종목정보['RSI'] - 50)))
-                        기술점수 = max(0, min(100, 50 + 종목정보['밴드대비']))
+                        # 팩터 점수 (스크리너와 같은 공식)
+                        점수 = pick_factor_scores(종목정보)
+                        저평가점수, 안정성점수, 기술점수 = 점수['저평가'], 점수['안정성'], 점수['기술']
                         
                         col_a, col_b = st.columns(2)
                         with col_a:
@@ -719,107 +727,13 @@ def tab_analyst():
     else:
         st.warning("포트폴리오에 종목을 추가해주세요.")
 
-def generate_final_portfolio():
-    """사용자 선택을 기반으로 최종 포트폴리오 생성"""
-    
-    # 기본 정보 추출
-    사용자성향 = st.session_state.profile.get('성향', '중립형')
-    거시선택 = st.session_state.choice_macro
-    자산배분선택 = st.session_state.choice_alloc
-    선택섹터 = st.session_state.choice_sector or []
-    선택종목 = st.session_state.picks or []
-    사용자자산 = st.session_state.profile.get("asset", 2000) * 10000  # 만원을 원으로 변환
-    
-    # 자산배분 매핑
-    배분매핑 = {
-        "방어형": {"채권": 45, "주식": 35, "현금": 15, "금": 5},
-        "균형형": {"채권": 30, "주식": 55, "현금": 10, "금": 5},
-        "공격형": {"채권": 15, "주식": 75, "현금": 5, "금": 5}
-    }
-    
-    # 기본 배분 선택
-    기본배분 = 배분매핑.get(자산배분선택, 배분매핑["균형형"])
-    최종배분 = 기본배분.copy()
-    
-    # 거시 환경에 따른 조정
-    if 거시선택 == "보수형":
-        최종배분["채권"] = min(60, 최종배분["채권"] + 10)
-        최종배분["주식"] = max(20, 최종배분["주식"] - 8)
-        최종배분["현금"] = min(25, 최종배분["현금"] + 8)
-    elif 거시선택 == "공격형":
-        최종배분["주식"] = min(80, 최종배분["주식"] + 10)
-        최종배분["채권"] = max(10, 최종배분["채권"] - 8)
-        최종배분["현금"] = max(5, 최종배분["현금"] - 2)
-    
-    # 사용자 성향에 따른 미세 조정
-    if 사용자성향 == "안정형" and 거시선택 != "보수형":
-        최종배분["채권"] = min(50, 최종배분["채권"] + 5)
-        최종배분["주식"] = max(30, 최종배분["주식"] - 5)
-    elif 사용자성향 == "공격형" and 거시선택 != "공격형":
-        최종배분["주식"] = min(75, 최종배분["주식"] + 5)
-        최종배분["채권"] = max(15, 최종배분["채권"] - 5)
-    
-    # 정규화 (합계 100%)
-    총합 = sum(최종배분.values())
-    for k in 최종배분:
-        최종배분[k] = round(최종배분[k] / 총합 * 100, 1)
-    
-    # 종목 선정 (선택된 종목들 우선, 없으면 섹터 기반)
-    if 선택종목:
-        핵심종목 = 선택종목[:5]  # 최대 5개
-    else:
-        # 섹터 기반 기본 종목
-        기본종목 = []
-        if "AI/반도체" in 선택섹터:
-            기본종목.extend(["삼성전자", "네이버"])
-        if "로봇/자동화" in 선택섹터:
-            기본종목.append("레인보우로보틱스")
-        if "2차전지" in 선택섹터:
-            기본종목.append("LG에너지솔루션")
-        if "바이오/헬스" in 선택섹터:
-            기본종목.append("셀트리온")
-        
-        if not 기본종목:  # 선택된 섹터가 없으면 기본 우량주
-            기본종목 = ["삼성전자", "LG에너지솔루션", "셀트리온"]
-        
-        핵심종목 = 기본종목[:5]
-    
-    # 수익률/위험도 계산
-    주식비중 = 최종배분["주식"] / 100
-    
-    # 성향과 선택에 따른 리스크 계수
-    리스크계수 = 1.0
-    if 사용자성향 == "공격형":
-        리스크계수 += 0.2
-    elif 사용자성향 == "안정형":
-        리스크계수 -= 0.2
-    
-    if 거시선택 == "공격형":
-        리스크계수 += 0.1
-    elif 거시선택 == "보수형":
-        리스크계수 -= 0.1
-    
-    기대수익률 = (주식비중 * 0.12 * 리스크계수 + (1-주식비중) * 0.04)
-    변동성 = (주식비중 * 0.25 * 리스크계수 + (1-주식비중) * 0.05)
-    샤프비율 = 기대수익률 / 변동성 if 변동성 > 0 else 0
-    
-    # 투자 금액 계산
-    자산별금액 = {}
-    for 자산, 비중 in 최종배분.items():
-        자산별금액[자산] = int(사용자자산 * 비중 / 100)
-    
-    return {
-        "배분": 최종배분,
-        "종목": 핵심종목,
-        "수익률": 기대수익률,
-        "위험도": 변동성,
-        "샤프": 샤프비율,
-        "투자금액": 자산별금액,
-        "총자산": 사용자자산
-    }
-
 def tab_cio():
     """⑥ CIO 전략실 탭"""
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from planning import format_money, format_percent, get_portfolio_simulation, get_stock_info
+    
     st.title("🏆 CIO전략실 — 맞춤형 최종 포트폴리오")
     
     st.markdown("### 🎯 당신만의 투자 포트폴리오가 완성되었습니다!")
@@ -838,8 +752,8 @@ def tab_cio():
             종목수 = len(st.session_state.picks) if st.session_state.picks else 0
             st.info(f"**🎯 투자 대상**\n• 섹터: {섹터}\n• 선택 종목: {종목수}개")
     
-    # 최종 포트폴리오 생성
-    final_portfolio = generate_final_portfolio()
+    # 최종 포트폴리오 생성 (성향·거시·배분·종목 중 바뀐 입력의 하위 단계만 다시 계산)
+    final_portfolio = plan_graph().get("최종포트폴리오")
     
     st.markdown("---")
     
@@ -858,6 +772,9 @@ def tab_cio():
         with col_c:
             st.metric("샤프 비율", f"{final_portfolio['샤프']:.2f}", help="위험 대비 수익 효율성")
         
+        최적화설명 = {"min_variance": "최소분산", "max_sharpe": "최대 샤프", "target_risk": "목표 변동성"}
+        st.caption(f"⚙️ 평균-분산 최적화: {최적화설명[final_portfolio['최적화방식']]} (자산별 최소/최대 비중 제약)")
+        
         st.markdown("---")
         
         # 자산 배분
@@ -876,15 +793,16 @@ def tab_cio():
         st.dataframe(df_배분, width="stretch", hide_index=True)
         
         # 파이차트
-        fig = go.Figure(data=[go.Pie(
-            labels=list(final_portfolio['배분'].keys()),
-            values=list(final_portfolio['배분'].values()),
-            hole=0.4,
-            textinfo='label+percent',
-            textfont_size=12
-        )])
-        fig.update_layout(height=300, showlegend=True, title="자산 배분 비율")
-        st.plotly_chart(fig, width="stretch")
+        with timed("figure.final_allocation"):
+            fig = go.Figure(data=[go.Pie(
+                labels=list(final_portfolio['배분'].keys()),
+                values=list(final_portfolio['배분'].values()),
+                hole=0.4,
+                textinfo='label+percent',
+                textfont_size=12
+            )])
+            fig.update_layout(height=300, showlegend=True, title="자산 배분 비율")
+            st.plotly_chart(fig, width="stretch")
     
     with col2:
         st.markdown("### 🎯 핵심 종목 구성")
@@ -894,19 +812,8 @@ def tab_cio():
                 with st.container():
                     st.markdown(f"**{i}. {종목}**")
                     
-                    # 종목별 간단한 정보 (더미)
-                    if 종목 == "삼성전자":
-                        st.caption("🏭 반도체 | 시총 1위 | 배당주")
-                    elif 종목 == "네이버":
-                        st.caption("💻 IT | 플랫폼 | 성장주")
-                    elif 종목 == "레인보우로보틱스":
-                        st.caption("🤖 로봇 | 혁신기업 | 테마주")
-                    elif 종목 == "LG에너지솔루션":
-                        st.caption("🔋 배터리 | 글로벌 | ESG")
-                    elif 종목 == "셀트리온":
-                        st.caption("💊 바이오 | 신약개발 | 성장")
-                    else:
-                        st.caption("📈 우량주")
+                    # 종목별 간단한 정보
+                    st.caption(get_stock_info(종목)['caption'])
                     
                     st.divider()
         else:
@@ -933,6 +840,36 @@ def tab_cio():
         st.success(근거텍스트)
     
     
+    # 몬테카를로 시뮬레이션
+    st.markdown("---")
+    st.markdown("### 🎲 투자 기간 성과 시뮬레이션")
+    
+    투자기간 = st.session_state.profile.get('기간', 10)
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        월적립금 = st.number_input("월 적립금 (만원)", min_value=0, max_value=10000, value=0, step=10)
+        st.caption(f"투자 기간 {투자기간}년 · 월 단위 리밸런싱 · 10만 경로")
+        지표영역 = st.empty()
+    with col2:
+        차트영역 = st.empty()
+    
+    표시경로 = []
+    
+    def show_simulation(결과):
+        # 계산 중에는 배치가 끝날 때마다 같은 자리에 다시 그림 (경로 수가 늘었을 때만)
+        if 표시경로 and 표시경로[-1] == 결과['paths_done']:
+            return
+        표시경로.append(결과['paths_done'])
+        차트영역.plotly_chart(draw_simulation_chart(결과), width="stretch", key=f"simulation_{결과['paths_done']}")
+        with 지표영역.container():
+            st.metric("원금 손실 확률", format_percent(결과['prob_loss']))
+            st.metric("만기 자산 (중앙값)", format_money(결과['terminal_median']))
+            st.metric("만기 자산 (하위 5%)", format_money(결과['terminal_p5']))
+            st.metric("만기 자산 (상위 5%)", format_money(결과['terminal_p95']))
+    
+    시뮬레이션 = get_portfolio_simulation(final_portfolio, 투자기간, 월적립금 * 10000, on_batch=show_simulation)
+    show_simulation(시뮬레이션)
+    
     # 최종 결정 및 요약
     st.markdown("---")
     st.markdown("### 🎊 포트폴리오 확정하기")
@@ -941,6 +878,7 @@ def tab_cio():
     
     if st.button("✅ 이 포트폴리오로 확정하기", type="primary", width="stretch"):
         st.session_state.decision = "최종포트폴리오확정"
+        st.session_state.final_portfolio = final_portfolio
         
         # 최종 요약서
         with st.expander("📋 최종 투자 포트폴리오 확정서", expanded=True):
@@ -1003,11 +941,75 @@ def tab_cio():
             st.session_state.current_tab = 1  # 거시전략가부터 다시 시작
             st.rerun()
 
+def show_diagnostics():
+    """숨김 진단 패널 — 이번 실행 구간, 이름별 누적 시간·할당, 세션 메모리, 지표 JSON 내려받기"""
+    import json
+
+    import pandas as pd
+
+    from instrumentation import session_footprint
+    from planning import encode_session
+    
+    지표 = recorder.snapshot()
+    with st.expander("🩺 진단 (렌더 시간·할당)", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("세션 재실행 횟수", st.session_state.diag_runs)
+        with col2:
+            st.metric("프로세스 실행 횟수", 지표['runs'])
+        with col3:
+            탭시간 = sum(x['ms'] for x in 지표['last_run'] if x['name'].startswith('tab.'))
+            st.metric("이번 탭 렌더", f"{탭시간:.1f}ms")
+        
+        st.markdown("**이번 실행 구간** (들여쓰기 = 안쪽 구간, 바깥 구간 시간은 안쪽 포함)")
+        구간 = pd.DataFrame([
+            {"구간": "　" * x['depth'] + x['name'], "시간(ms)": round(x['ms'], 2), "할당 블록": x['blocks']}
+            for x in 지표['last_run']
+        ])
+        st.dataframe(구간, width="stretch", hide_index=True)
+        
+        st.markdown("**누적 통계** (프로세스 공용, 총 시간 순)")
+        누적 = pd.DataFrame([
+            {"이름": 이름, "호출": x['calls'], "총(ms)": round(x['total_ms'], 1), "평균(ms)": round(x['mean_ms'], 2),
+             "최대(ms)": round(x['max_ms'], 2), "할당 블록": x['blocks']}
+            for 이름, x in 지표['stats'].items()
+        ])
+        st.dataframe(누적, width="stretch", hide_index=True)
+        
+        if 'plan_graph' in st.session_state:
+            st.markdown("**계획 그래프** (이번 실행에서 다시 계산한 노드: "
+                        f"{', '.join(st.session_state.plan_graph.recomputed) or '없음'})")
+            st.dataframe(pd.DataFrame(st.session_state.plan_graph.status()), width="stretch", hide_index=True)
+        
+        점유 = session_footprint(st.session_state)
+        총점유 = sum(점유.values())
+        직렬화 = len(encode_session(st.session_state))
+        st.markdown("**세션 메모리** (키별 추정 점유 — 참조하는 객체 포함, 앞 키와 공유하는 객체는 한 번만)")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("세션 점유", f"{총점유 / 1024:.1f}KB")
+        with col2:
+            st.metric("GB당 세션 수", f"{(1 << 30) // max(총점유, 1):,}")
+        with col3:
+            st.metric("저장 크기 (encode_session)", f"{직렬화:,}B")
+        st.dataframe(pd.DataFrame([{"키": 키, "바이트": 크기} for 키, 크기 in 점유.items()]), width="stretch", hide_index=True)
+        
+        st.download_button(
+            "📥 지표 JSON 내려받기",
+            json.dumps(지표, ensure_ascii=False, indent=2),
+            file_name="aia_metrics.json",
+            mime="application/json",
+        )
+
 def main():
     """메인 애플리케이션"""
     
     # 세션 상태 초기화
     init_session_state()
+    begin_run()
+    if 'plan_graph' in st.session_state:
+        st.session_state.plan_graph.begin_run()
+    st.session_state.diag_runs = st.session_state.get('diag_runs', 0) + 1
     
     # 상단 제목
     st.title("🏦 AIA 2.0 — Dual-Team AI Investment Agency")
@@ -1035,21 +1037,10 @@ def main():
     
     st.markdown("---")
     
-    # 탭별 컨텐츠 표시
-    if current_tab == 0:
-        tab_intro()
-    elif current_tab == 1:
-        tab_macro()
-    elif current_tab == 2:
-        tab_allocation()
-    elif current_tab == 3:
-        tab_sector()
-    elif current_tab == 4:
-        tab_analyst()
-    elif current_tab == 5:
-        tab_cio()
-    elif current_tab == 6:
-        tab_trade_planner()
+    # 탭별 컨텐츠 표시 (탭 함수별 실행 시간·할당 계측)
+    탭함수 = [tab_intro, tab_macro, tab_allocation, tab_sector, tab_analyst, tab_cio, tab_trade_planner][current_tab]
+    with timed(f"tab.{탭함수.__name__.removeprefix('tab_')}"):
+        탭함수()
     
     # 하단 네비게이션
     st.markdown("---")
@@ -1070,12 +1061,18 @@ def main():
             if st.button("다음 단계 ➡️", key="nav_next"):
                 st.session_state.current_tab = min(6, current_tab + 1)
                 st.rerun()
-
-if __name__ == "__main__":
-    main()
+    
+    # 진단 패널 (?diag=1 또는 AIA_DIAGNOSTICS=1) · 지표 파일 (AIA_METRICS_PATH)
+    if st.query_params.get("diag") == "1" or os.environ.get("AIA_DIAGNOSTICS") == "1":
+        show_diagnostics()
+    dump_metrics()
 
 def tab_trade_planner():
     """Trade Planner - 모멘텀+RSI 기반 매수·매도 타이밍 및 전략 설정"""
+    import pandas as pd
+
+    from planning import format_money, format_percent, get_strategy_backtest, pick_exit_levels, pick_monitoring_schedule
+    
     st.header("⚡ Trade Planner")
     st.markdown("**모멘텀 + RSI 지표 기반 단순하고 실용적인 매매 전략을 제시합니다**")
     
@@ -1132,103 +1129,48 @@ def tab_trade_planner():
     
     st.markdown("---")
     
-    # 전체 투자 전략 설정
-    st.markdown("### 🎯 전체 투자 실행 전략")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        투자방식 = st.selectbox(
-            "투자 실행 방식",
-            ["일시불 투자", "분할 매수 (DCA)", "하락시 점진 매수", "기술적 타이밍"],
-            help="포트폴리오 전체를 어떤 방식으로 구축할지 선택하세요"
-        )
-        
-        실행기간 = st.selectbox(
-            "투자 실행 기간",
-            ["즉시 실행", "1주일 내", "1개월 내", "3개월 내", "6개월 내"],
-            help="전체 포트폴리오 구축을 완료할 기간을 설정하세요"
-        )
-    
-    with col2:
-        리밸런싱주기 = st.selectbox(
-            "리밸런싱 주기",
-            ["분기별 (3개월)", "반기별 (6개월)", "연간 (12개월)", "편차 20% 도달시", "시장 상황 변화시"],
-            help="포트폴리오 비중을 재조정할 주기를 설정하세요"
-        )
-        
-        위험관리방식 = st.selectbox(
-            "위험 관리 방식",
-            ["스톱로스 -20%", "스톱로스 -15%", "시장상황 모니터링", "장기 보유", "변동성 기준 조정"],
-            help="손실 제한 및 위험 관리 방식을 선택하세요"
-        )
-    
-    st.markdown("---")
-    
-    # 자산별 상세 트레이드 플랜
-    st.markdown("### 📈 자산별 트레이드 플랜")
-    
-    for 자산, 비중 in final_portfolio['배분'].items():
-        if 비중 > 0:
-            투자금액 = final_portfolio['투자금액'][자산]
-            
-            with st.expander(f"💰 {자산} ({비중}% | {format_money(투자금액)})", expanded=True):
-                
-                # 자산별 특성에 따른 전략 제안
-                if "주식" in 자산 or "ETF" in 자산:
-                    매수전략 = generate_stock_trade_plan(자산, 투자금액, 투자방식)
-                elif "채권" in 자산:
-                    매수전략 = generate_bond_trade_plan(자산, 투자금액, 투자방식)
-                elif "현금" in 자산:
-                    매수전략 = generate_cash_trade_plan(자산, 투자금액)
-                else:
-                    매수전략 = generate_default_trade_plan(자산, 투자금액, 투자방식)
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("**📊 매수 전략**")
-                    for step in 매수전략['매수단계']:
-                        st.write(f"• {step}")
-                    
-                    st.markdown("**⏰ 타이밍 신호**")
-                    for signal in 매수전략['타이밍신호']:
-                        st.write(f"• {signal}")
-                
-                with col2:
-                    st.markdown("**💡 매도 조건**")
-                    for condition in 매수전략['매도조건']:
-                        st.write(f"• {condition}")
-                    
-                    st.markdown("**⚠️ 위험 신호**")
-                    for risk in 매수전략['위험신호']:
-                        st.write(f"• {risk}")
-                
-                # 분할매수 스케줄이 있는 경우
-                if '분할스케줄' in 매수전략:
-                    st.markdown("**📅 분할 매수 스케줄**")
-                    스케줄_df = pd.DataFrame(매수전략['분할스케줄'])
-                    st.dataframe(스케줄_df, width="stretch")
-    
-    st.markdown("---")
+    # 실행 전략 설정 · 자산별 플랜 · 실행 캘린더 (선택 상자 변경 시 이 조각만 재실행)
+    trade_planner_execution(final_portfolio)
     
     # 종목별 상세 트레이드 플랜 (사용자가 선택한 종목들)
     if hasattr(st.session_state, 'picks') and st.session_state.picks:
         st.markdown("### 🎯 선별 종목별 상세 전략")
         
-        for 종목코드 in st.session_state.picks:
-            종목정보 = get_stock_info(종목코드)
+        # 종목별 지표·신호점수·위험평가 (세션 캐시, 새로 추가된 종목만 계산)
+        종목지표 = pick_panel_data(st.session_state.picks)
+        위험관리방식 = st.session_state.get('tp_risk', "스톱로스 -20%")
+        모니터링일정 = pick_monitoring_schedule()
+        
+        # 선택 종목에 전략 규칙을 적용한 과거 성과
+        백테스트 = get_strategy_backtest([x['정보'] for x in 종목지표])
+        st.markdown("**📊 전략 백테스트 (최근 10년, 선택 종목 동일가중)**")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("연평균 수익률", format_percent(백테스트['cagr']))
+        with col2:
+            st.metric("최대 낙폭", format_percent(백테스트['max_drawdown']))
+        with col3:
+            적중률 = 백테스트['hit_rate']
+            st.metric("매매 적중률", format_percent(적중률) if 백테스트['trades'] else "-", help=f"청산 거래 {백테스트['trades']}건 기준")
+        with col4:
+            st.metric("연간 회전율", f"{백테스트['turnover']:.1f}회")
+        
+        for 지표 in 종목지표:
+            signal_score = 지표['신호점수']
+            종목정보 = 지표['정보']
+            현재가 = 지표['현재가']
+            RSI = 지표['RSI']
+            ma20_momentum = 지표['ma20']
+            ma60_momentum = 지표['ma60']
             
-            with st.expander(f"📈 {종목정보['name']} ({종목코드})", expanded=False):
+            with timed("trade_planner.pick_panel"), st.expander(f"📈 {종목정보['name']} ({종목정보['code']})", expanded=False):
                 
                 # 현재 기술적 분석 상태
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    현재가 = 종목정보.get('price', 50000 + np.random.randint(-10000, 10000))
                     st.metric("현재가", format_money(현재가))
                     
-                    RSI = 종목정보.get('RSI', 50 + np.random.randint(-30, 30))
                     if RSI > 70:
                         rsi_status = "🔴 과매수"
                     elif RSI < 30:
@@ -1238,10 +1180,6 @@ def tab_trade_planner():
                     st.metric("RSI 지표", f"{RSI:.1f}", help=rsi_status)
                 
                 with col2:
-                    # 단순 모멘텀 계산 (20일 이동평균 기준)
-                    이동평균20 = 현재가 * (0.95 + np.random.random() * 0.1)
-                    ma20_momentum = ((현재가 - 이동평균20) / 이동평균20) * 100
-                    
                     momentum_color = "🟢" if ma20_momentum > 0 else "🔴"
                     st.metric("20일선 모멘텀", f"{ma20_momentum:+.1f}%", help=f"{momentum_color} {'상승' if ma20_momentum > 0 else '하락'} 추세")
                     
@@ -1256,14 +1194,10 @@ def tab_trade_planner():
                 
                 with col3:
                     # 60일 장기 모멘텀
-                    이동평균60 = 현재가 * (0.90 + np.random.random() * 0.2)
-                    ma60_momentum = ((현재가 - 이동평균60) / 이동평균60) * 100
-                    
                     long_momentum_color = "🟢" if ma60_momentum > 0 else "🔴"
                     st.metric("60일선 모멘텀", f"{ma60_momentum:+.1f}%", help=f"{long_momentum_color} 장기 추세")
                     
-                    # 전체 신호 계산
-                    signal_score = calculate_momentum_rsi_signal(RSI, ma20_momentum, ma60_momentum)
+                    # 전체 신호 (일괄 계산된 점수)
                     if signal_score >= 70:
                         signal_status = "🟢 강한 매수"
                     elif signal_score >= 40:
@@ -1273,7 +1207,7 @@ def tab_trade_planner():
                     st.metric("종합 신호", signal_status)
                 
                 # 매수/매도 시그널 및 전략
-                매수신호점수 = calculate_momentum_rsi_signal(RSI, ma20_momentum, ma60_momentum)
+                매수신호점수 = signal_score
                 
                 col1, col2 = st.columns(2)
                 
@@ -1302,69 +1236,222 @@ def tab_trade_planner():
                 with col2:
                     st.markdown("**💡 모멘텀 기반 매도 전략**")
                     
-                    # 목표 수익률을 모멘텀 강도에 따라 조정
-                    if ma20_momentum > 10:
-                        목표수익률 = 25  # 강한 상승 모멘텀
-                    elif ma20_momentum > 5:
-                        목표수익률 = 20  # 보통 상승 모멘텀
-                    elif ma20_momentum > 0:
-                        목표수익률 = 15  # 약한 상승 모멘텀
-                    else:
-                        목표수익률 = 10  # 하락 모멘텀
-                    
-                    손절가 = 현재가 * 0.85
-                    목표가 = 현재가 * (1 + 목표수익률/100)
+                    # 선택한 위험 관리 방식의 경로 평가로 손절가·목표가 결정
+                    위험평가 = 지표['위험평가'][위험관리방식]
+                    매도기준 = pick_exit_levels(현재가, ma20_momentum, 위험평가)
+                    목표수익률 = 매도기준['목표수익률']
+                    손절가 = 매도기준['손절가']
+                    목표가 = 매도기준['목표가']
                     
                     st.write(f"• **목표가**: {format_money(목표가)} (+{목표수익률}%)")
-                    st.write(f"• **손절가**: {format_money(손절가)} (-15%)")
+                    if 손절가 is None:
+                        st.write(f"• **손절가**: 없음 ({위험관리방식})")
+                    elif 매도기준['추적손절']:
+                        st.write(f"• **손절가**: 보유 중 고점 대비 -{매도기준['손절률']}% 추적 손절 "
+                                 f"(현재가 기준 시작 {format_money(손절가)}, 고점 갱신 시 함께 상향, {위험관리방식})")
+                    else:
+                        st.write(f"• **손절가**: {format_money(손절가)} (-{매도기준['손절률']}%, {위험관리방식})")
                     st.write("• RSI 70 이상 + 모멘텀 둔화시 50% 매도")
                     st.write("• RSI 80 이상시 추가 30% 매도")
                     st.write("• 모멘텀 하락 전환시 전량 매도 검토")
                 
+                # 위험 관리 방식별 평가 (과거 6개월 보유 구간, 장기 보유 대비)
+                st.markdown(f"**🛡️ 위험 관리 방식 비교** (6개월 보유 경로 {위험평가['paths']:,}개, 장기 보유 대비)")
+                st.dataframe(pd.DataFrame([
+                    {"방식": 방식, "청산 비율": format_percent(x['exit_rate']), "낙폭 감소": f"{x['drawdown_cut'] * 100:.1f}%p",
+                     "휩소 비율": format_percent(x['whipsaw_rate']), "포기 수익": f"{x['return_given_up'] * 100:+.1f}%p"}
+                    for 방식, x in 지표['위험평가'].items()
+                ]), width="stretch", hide_index=True)
+                
                 # 주간/월간 모니터링 포인트
                 st.markdown("**📅 모멘텀+RSI 모니터링 일정**")
                 
-                모니터링_df = pd.DataFrame({
-                    '주기': ['매일 장마감 후', '매주 월요일', '매월 첫째주', '분기별'],
-                    '체크포인트': [
-                        'RSI 지표 + 20일선 모멘텀 확인',
-                        '60일선 장기 모멘텀 추세 점검',
-                        '모멘텀 전환점 및 매매 타이밍 재조정',
-                        '전체 포지션 리뷰 및 전략 수정'
-                    ],
-                    '매수 조건': [
-                        'RSI < 40 + 모멘텀 상승 전환',
-                        'RSI < 30 + 20일선 골든크로스',  
-                        '장기 하락 후 모멘텀 반등 신호',
-                        '시장 사이클 변화에 따른 재진입'
-                    ],
-                    '매도 조건': [
-                        'RSI > 70 + 모멘텀 둔화',
-                        'RSI > 80 or 20일선 데드크로스',
-                        '목표 수익률 달성 + 모멘텀 피크',
-                        '장기 모멘텀 하락 전환 확인'
-                    ]
-                })
+                st.dataframe(모니터링일정, width="stretch")
+    
+    st.markdown("---")
+    
+    # 트레이딩 체크리스트
+    trade_planner_checklist()
+
+@st.fragment
+@instrumented("trade_planner.execution")
+def trade_planner_execution(final_portfolio):
+    """실행 전략 설정 → 자산별 트레이드 플랜 · 실행 캘린더
+
+    선택 상자를 바꾸면 이 조각만 다시 실행되고 종목별 패널·체크리스트는 그대로 둡니다.
+    의존 관계: 투자방식 → 자산별 플랜·캘린더, 실행기간 → 캘린더,
+    리밸런싱주기 → 주기별 비교(확정 배분마다 한 번 계산한 결과에서 선택만 바뀜),
+    위험관리방식 → 종목별 손절가·목표가 (조각 밖 종목 패널이라 전체 재실행)
+    """
+    import pandas as pd
+
+    from planning import (
+        DIP_LADDER, format_money, format_percent, generate_execution_calendar, generate_order_plan,
+        get_rebalancing_comparison,
+    )
+    
+    # 전체 투자 전략 설정
+    st.markdown("### 🎯 전체 투자 실행 전략")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        투자방식 = st.selectbox(
+            "투자 실행 방식",
+            ["일시불 투자", "분할 매수 (DCA)", "하락시 점진 매수", "기술적 타이밍"],
+            help="포트폴리오 전체를 어떤 방식으로 구축할지 선택하세요",
+            key="tp_invest_mode"
+        )
+        
+        실행기간 = st.selectbox(
+            "투자 실행 기간",
+            ["즉시 실행", "1주일 내", "1개월 내", "3개월 내", "6개월 내"],
+            help="전체 포트폴리오 구축을 완료할 기간을 설정하세요",
+            key="tp_period"
+        )
+    
+    with col2:
+        리밸런싱주기 = st.selectbox(
+            "리밸런싱 주기",
+            ["분기별 (3개월)", "반기별 (6개월)", "연간 (12개월)", "편차 20% 도달시", "시장 상황 변화시"],
+            help="포트폴리오 비중을 재조정할 주기를 설정하세요",
+            key="tp_rebalance"
+        )
+        
+        # 확정 배분을 과거 자산군 수익률에 재현한 주기별 비교 (수수료·거래세·슬리피지 반영)
+        리밸런싱비교 = get_rebalancing_comparison(final_portfolio)
+        선택주기 = 리밸런싱비교['policies'][리밸런싱주기]
+        st.caption(
+            f"과거 {리밸런싱비교['years']:.0f}년 재현: 조정 {선택주기['rebalances']}회 · "
+            f"연 회전율 {format_percent(선택주기['turnover'])} · 비용 연 {선택주기['cost_drag'] * 1e4:.1f}bp · "
+            f"추적오차 {format_percent(선택주기['tracking_error'])}"
+        )
+        
+        위험관리방식 = st.selectbox(
+            "위험 관리 방식",
+            ["스톱로스 -20%", "스톱로스 -15%", "시장상황 모니터링", "장기 보유", "변동성 기준 조정"],
+            help="손실 제한 및 위험 관리 방식을 선택하세요 (종목별 손절가·목표가에 반영)",
+            key="tp_risk"
+        )
+        # 종목별 패널은 이 조각 밖에 있으므로 방식이 바뀌면 화면 전체를 다시 실행
+        if 위험관리방식 != st.session_state.setdefault('tp_risk_applied', 위험관리방식):
+            st.session_state.tp_risk_applied = 위험관리방식
+            st.rerun()
+    
+    with st.expander("🔁 리밸런싱 주기 비교", expanded=False):
+        st.dataframe(pd.DataFrame([
+            {"주기": 주기, "조정 횟수": x['rebalances'], "연 회전율": format_percent(x['turnover']),
+             "비용 (연 bp)": round(x['cost_drag'] * 1e4, 1), "추적오차": format_percent(x['tracking_error']),
+             "연수익률 (비용 차감)": format_percent(x['cagr'])}
+            for 주기, x in 리밸런싱비교['policies'].items()
+        ]), width="stretch", hide_index=True)
+        st.caption("추적오차: 매일 목표 비중을 유지하는 무비용 포트폴리오 대비 · 비용: 수수료, 주식 매도 증권거래세, 호가 스프레드")
+    
+    st.markdown("---")
+    
+    # 자산별 상세 트레이드 플랜
+    st.markdown("### 📈 자산별 트레이드 플랜")
+    트레이드플랜 = plan_graph(투자방식=투자방식).get("트레이드플랜")
+    
+    for 자산, 비중 in final_portfolio['배분'].items():
+        if 비중 > 0:
+            투자금액 = final_portfolio['투자금액'][자산]
+            
+            with timed("trade_planner.asset_panel"), st.expander(f"💰 {자산} ({비중}% | {format_money(투자금액)})", expanded=True):
+                
+                # 자산별 특성에 따른 전략 제안 (확정 포트폴리오·투자방식이 바뀔 때만 다시 생성)
+                매수전략 = 트레이드플랜[자산]
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("**📊 매수 전략**")
+                    for step in 매수전략['매수단계']:
+                        st.write(f"• {step}")
+                    
+                    st.markdown("**⏰ 타이밍 신호**")
+                    for signal in 매수전략['타이밍신호']:
+                        st.write(f"• {signal}")
                 
-                st.dataframe(모니터링_df, width="stretch")
+                with col2:
+                    st.markdown("**💡 매도 조건**")
+                    for condition in 매수전략['매도조건']:
+                        st.write(f"• {condition}")
+                    
+                    st.markdown("**⚠️ 위험 신호**")
+                    for risk in 매수전략['위험신호']:
+                        st.write(f"• {risk}")
+                
+                # 분할매수 스케줄이 있는 경우
+                if '분할스케줄' in 매수전략:
+                    st.markdown("**📅 분할 매수 스케줄**")
+                    스케줄_df = pd.DataFrame(매수전략['분할스케줄'])
+                    st.dataframe(스케줄_df, width="stretch")
     
     st.markdown("---")
     
     # 전체 포트폴리오 실행 캘린더
     st.markdown("### 📅 투자 실행 캘린더")
     
-    if 투자방식 == "분할 매수 (DCA)":
-        generate_dca_calendar(final_portfolio, 실행기간)
-    elif 투자방식 == "하락시 점진 매수":
-        generate_dip_buying_calendar(final_portfolio)
-    elif 투자방식 == "기술적 타이밍":
-        generate_technical_calendar(final_portfolio)
-    else:
-        generate_lump_sum_calendar(final_portfolio)
+    사다리 = None
+    if 투자방식 == "하락시 점진 매수":
+        # 사다리를 고치면 이 조각만 다시 실행되고 경로는 캐시에서 재사용 (평가만 다시 계산)
+        st.caption("하락폭·매수비중(%)을 고치거나 행을 추가하면 과거·모의 경로에서 바로 다시 평가합니다")
+        사다리표 = st.data_editor(
+            pd.DataFrame([{'하락폭 (%)': 단['하락폭'], '매수비중 (%)': 단['매수비중']} for 단 in DIP_LADDER]),
+            num_rows="dynamic", hide_index=True, key="tp_dip_ladder",
+            column_config={
+                '하락폭 (%)': st.column_config.NumberColumn(min_value=0.5, max_value=90, step=0.5),
+                '매수비중 (%)': st.column_config.NumberColumn(min_value=0, max_value=100, step=5),
+            },
+        ).dropna()
+        사다리 = list(zip(사다리표['하락폭 (%)'], 사다리표['매수비중 (%)']))
+        if not any(비중 > 0 for _, 비중 in 사다리):
+            st.warning("매수비중이 있는 가단이 없어 기본 사다리로 평가합니다")
+            사다리 = None
+    
+    실행캘린더 = generate_execution_calendar(final_portfolio, 투자방식, 실행기간, 사다리=사다리)
+    st.markdown(f"**{실행캘린더['제목']}**")
+    st.dataframe(실행캘린더['표'], width="stretch")
+    
+    if '평가' in 실행캘린더:
+        과거 = 실행캘린더['평가']['historical']
+        모의 = 실행캘린더['평가']['simulated']
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("일시불 대비 매입단가", f"{-과거['entry_discount'] * 100:+.2f}%",
+                      help="미체결 비중은 대기기간 마지막 날 매수한다고 본 평균 매입단가 (음수면 사다리가 더 싸게 삼)")
+        with col2:
+            st.metric("일시불보다 싸게 산 비율", f"{과거['beat_rate'] * 100:.0f}%")
+        with col3:
+            st.metric("미체결 현금", f"{과거['idle_cash'] * 100:.0f}%",
+                      help=f"대기기간({과거['horizon']}거래일) 말까지 체결되지 않은 비중 · 자금 가중 평균 대기 {과거['idle_days']:.0f}거래일")
+        st.caption(
+            f"과거 {과거['paths']:,}개 구간 · 모의 {모의['paths']:,}개 경로 — 모의 기준 매입단가 "
+            f"{-모의['entry_discount'] * 100:+.2f}%, 미체결 현금 {모의['idle_cash'] * 100:.0f}%"
+        )
     
-    st.markdown("---")
+    # 회차별 주문 수량 (자산군 ETF·선택 종목의 정수 주식 수, 매수 수수료·슬리피지 포함)
+    주문계획 = generate_order_plan(final_portfolio, 투자방식, 실행기간, 사다리=사다리)
+    with st.expander(f"🧾 {주문계획['제목']}", expanded=False):
+        if 주문계획['안내']:
+            st.info(주문계획['안내'])
+        st.dataframe(주문계획['표'], width="stretch", hide_index=True)
+        st.caption(
+            f"잔여현금 {format_money(주문계획['잔여현금'])} · 예수금(현금 자산) {format_money(주문계획['예수금'])} · "
+            f"목표 대비 오차 {주문계획['목표오차'] * 100:.2f}%"
+        )
+        st.download_button(
+            "📥 주문 파일 (CSV)", 주문계획['주문파일'].to_csv(index=False).encode("utf-8-sig"),
+            file_name="orders.csv", mime="text/csv", key="tp_order_file"
+        )
     
-    # 트레이딩 체크리스트
+    st.markdown("---")
+
+@st.fragment
+@instrumented("trade_planner.checklist")
+def trade_planner_checklist():
+    """트레이딩 체크리스트 (체크·완료 버튼은 이 조각만 다시 실행)"""
     st.markdown("### ✅ 트레이딩 실행 체크리스트")
     
     체크리스트 = [
@@ -1400,336 +1487,26 @@ def tab_trade_planner():
         - 장기 모멘텀과 단기 RSI의 조화로운 매매 타이밍 포착
         """)
 
-def generate_stock_trade_plan(자산명, 투자금액, 투자방식):
-    """주식/ETF 모멘텀+RSI 기반 매매 전략 생성"""
-    if 투자방식 == "분할 매수 (DCA)":
-        return {
-            '매수단계': [
-                "1차: RSI 50 이하 + 모멘텀 중립시 40% 매수",
-                "2차: RSI 40 이하 + 모멘텀 상승시 30% 추가", 
-                "3차: RSI 30 이하 + 모멘텀 강화시 20% 추가",
-                "4차: RSI 20 이하 극과매도시 10% 마지막 매수"
-            ],
-            '타이밍신호': [
-                "RSI 30-40 구간 + 20일선 모멘텀 상승",
-                "RSI 과매도 + 60일선 지지 확인",
-                "단기 모멘텀 반등 + 장기 추세 유지",
-                "거래량 증가와 함께 RSI 상승"
-            ],
-            '매도조건': [
-                "RSI 70 이상 + 모멘텀 둔화시 50% 매도",
-                "RSI 80 이상시 30% 추가 매도",
-                "모멘텀 하락 전환 + RSI 피크시 매도 고려",
-                "장기 모멘텀 하락시 전량 매도"
-            ],
-            '위험신호': [
-                "RSI 과매수 + 모멘텀 급격한 둔화",
-                "20일선 데드크로스 + RSI 하락",
-                "거래량 급증과 함께 RSI 급락",
-                "장기 모멘텀 하락 전환 신호"
-            ],
-            '분할스케줄': [
-                {'주차': '1주차', '비중': '40%', '금액': format_money(투자금액 * 0.4), '조건': 'RSI 50↓ + 모멘텀 중립'},
-                {'주차': '2주차', '비중': '30%', '금액': format_money(투자금액 * 0.3), '조건': 'RSI 40↓ + 모멘텀 상승'},
-                {'주차': '3-4주차', '비중': '20%', '금액': format_money(투자금액 * 0.2), '조건': 'RSI 30↓ + 모멘텀 강화'},
-                {'주차': '5-8주차', '비중': '10%', '금액': format_money(투자금액 * 0.1), '조건': 'RSI 20↓ 극과매도'}
-            ]
-        }
-    else:
-        return {
-            '매수단계': [
-                "RSI + 모멘텀 복합신호 확인 후 일시불 매수",
-                "매수 즉시 RSI 80 손절라인 설정",
-                "모멘텀 지속성 확인하여 포지션 유지"
-            ],
-            '타이밍신호': [
-                "RSI 30-40 구간 + 모멘텀 상승 전환",
-                "20일선 골든크로스 + RSI 상승",
-                "거래량 폭증 + RSI 과매도 탈출",
-                "장기 모멘텀 지지 + 단기 반등"
-            ],
-            '매도조건': [
-                "RSI 70 이상 + 모멘텀 피크 확인",
-                "20일선 데드크로스 + RSI 하락",
-                "목표 수익률 달성 + 모멘텀 둔화",
-                "RSI 80 이상 강제 손절"
-            ],
-            '위험신호': [
-                "RSI 급락 + 모멘텀 급속 하락",
-                "거래량 폭증과 함께 RSI 과매수",
-                "장기 모멘텀 하락 전환",
-                "시장 전체 RSI 과열 신호"
-            ]
-        }
-
-def generate_bond_trade_plan(자산명, 투자금액, 투자방식):
-    """채권 매매 전략 생성"""
-    return {
-        '매수단계': [
-            "금리 상승 국면에서 단계별 매수",
-            "듀레이션 리스크 고려한 분산 매수",
-            "만기별 래더링 전략 적용"
-        ],
-        '타이밍신호': [
-            "중앙은행 통화정책 변화",
-            "국채 금리 상승 추세",
-            "신용 스프레드 확대",
-            "인플레이션 지표 안정화"
-        ],
-        '매도조건': [
-            "금리 하락 국면 진입",
-            "만기 1년 이내 도달",
-            "신용 등급 하향",
-            "더 좋은 대안 발생"
-        ],
-        '위험신호': [
-            "급격한 금리 변동",
-            "발행기관 신용도 악화",
-            "유동성 부족 현상",
-            "통화정책 불확실성 증가"
-        ]
-    }
-
-def generate_cash_trade_plan(자산명, 투자금액):
-    """현금성 자산 관리 전략"""
-    return {
-        '매수단계': [
-            "고금리 예적금 우선 배치",
-            "CMA/MMF 등 유동성 자산 활용",
-            "단기 채권형 펀드 고려"
-        ],
-        '타이밍신호': [
-            "시장 불확실성 증가",
-            "투자 기회 대기",
-            "금리 상승 국면",
-            "포트폴리오 리밸런싱 필요"
-        ],
-        '매도조건': [
-            "매력적인 투자 기회 발생",
-            "금리 하락 전환점",
-            "자산 재배분 필요",
-            "긴급 자금 필요"
-        ],
-        '위험신호': [
-            "인플레이션 급상승",
-            "금리 급락",
-            "통화 가치 하락",
-            "기회비용 증가"
-        ]
-    }
-
-def generate_default_trade_plan(자산명, 투자금액, 투자방식):
-    """기본 매매 전략 생성"""
-    return {
-        '매수단계': [
-            "시장 상황 분석 후 매수",
-            "리스크 관리 하에 진입",
-            "분산 투자 원칙 적용"
-        ],
-        '타이밍신호': [
-            "기술적 지표 호전",
-            "펀더멘털 개선",
-            "시장 심리 회복",
-            "거시 환경 안정"
-        ],
-        '매도조건': [
-            "목표 수익률 달성",
-            "투자 논리 변화",
-            "리스크 증가",
-            "더 나은 기회 발생"
-        ],
-        '위험신호': [
-            "예상치 못한 변수",
-            "시장 구조 변화",
-            "유동성 위기",
-            "시스템 리스크"
-        ]
-    }
-
-def calculate_momentum_rsi_signal(rsi, ma20_momentum, ma60_momentum):
-    """단순 모멘텀 + RSI 기반 매매 신호 계산"""
-    score = 0
-    
-    # RSI 신호 (50% 가중치)
-    if rsi < 30:
-        score += 50  # 강한 매수
-    elif rsi < 40:
-        score += 30  # 보통 매수  
-    elif rsi < 50:
-        score += 10  # 약한 매수
-    elif rsi > 70:
-        score -= 30  # 매도 신호
-    elif rsi > 80:
-        score -= 50  # 강한 매도
-    
-    # 단기 모멘텀 신호 (30% 가중치)
-    if ma20_momentum > 5:
-        score += 30
-    elif ma20_momentum > 0:
-        score += 15
-    elif ma20_momentum < -5:
-        score -= 20
-    elif ma20_momentum < -10:
-        score -= 30
-    
-    # 장기 모멘텀 신호 (20% 가중치)
-    if ma60_momentum > 10:
-        score += 20
-    elif ma60_momentum > 0:
-        score += 10
-    elif ma60_momentum < -10:
-        score -= 15
-    elif ma60_momentum < -20:
-        score -= 25
-    
-    return max(0, min(100, score))
-
-def calculate_buy_signal_score(rsi, bollinger_position, ma20_diff, ma60_diff):
-    """단순 모멘텀 + RSI 기반 매수 신호 점수 계산 (0-100)"""
-    score = 50  # 기본 점수
-    
-    # RSI 기반 점수 (가중치 40%)
-    if rsi < 30:
-        rsi_score = 40  # 강한 매수 신호
-    elif rsi < 40:
-        rsi_score = 25  # 보통 매수 신호
-    elif rsi < 50:
-        rsi_score = 10  # 약한 매수 신호
-    elif rsi > 70:
-        rsi_score = -30  # 매도 신호
-    elif rsi > 80:
-        rsi_score = -50  # 강한 매도 신호
-    else:
-        rsi_score = 0  # 중립
-    
-    # 모멘텀 기반 점수 (가중치 60%)
-    momentum_score = 0
-    
-    # 20일선 모멘텀 (30% 가중치)
-    if ma20_diff > 5:
-        momentum_score += 20
-    elif ma20_diff > 0:
-        momentum_score += 10
-    elif ma20_diff < -5:
-        momentum_score -= 15
-    elif ma20_diff < -10:
-        momentum_score -= 25
-    
-    # 60일선 모멘텀 (30% 가중치)  
-    if ma60_diff > 10:
-        momentum_score += 20
-    elif ma60_diff > 0:
-        momentum_score += 10
-    elif ma60_diff < -10:
-        momentum_score -= 15
-    elif ma60_diff < -20:
-        momentum_score -= 25
-    
-    # 최종 점수 계산
-    final_score = score + rsi_score + momentum_score
-    
-    return max(0, min(100, final_score))
-
-def generate_dca_calendar(portfolio, 실행기간):
-    """DCA 실행 캘린더 생성"""
-    st.markdown("**분할 매수 일정표**")
-    
-    if 실행기간 == "1주일 내":
-        periods = 7
-        interval = "일"
-    elif 실행기간 == "1개월 내":
-        periods = 4
-        interval = "주"
-    elif 실행기간 == "3개월 내":
-        periods = 12
-        interval = "주"
-    else:
-        periods = 6
-        interval = "월"
-    
-    # 분할 매수 스케줄 생성
-    today = pd.Timestamp.now()
-    dates = pd.date_range(start=today, periods=periods+1, freq='W' if interval == "주" else 'D' if interval == "일" else 'M')[1:]
-    
-    총투자금 = sum(portfolio['투자금액'].values())
-    회차별금액 = 총투자금 / periods
-    
-    calendar_data = []
-    for i, date in enumerate(dates):
-        calendar_data.append({
-            '일정': date.strftime('%Y-%m-%d (%a)'),
-            f'{interval}차': f"{i+1}/{periods}",
-            '투자금액': format_money(회차별금액),
-            '누적금액': format_money(회차별금액 * (i+1)),
-            '비고': f"전체 포트폴리오 {100/periods:.1f}% 매수"
-        })
-    
-    calendar_df = pd.DataFrame(calendar_data)
-    st.dataframe(calendar_df, width="stretch")
+def pick_panel_data(picks):
+    """선택 종목별 패널 데이터 (지표·신호점수·위험 관리 방식별 평가)
 
-def generate_dip_buying_calendar(portfolio):
-    """하락매수 조건표 생성"""
-    st.markdown("**하락매수 조건표**")
-    
-    조건_data = [
-        {'하락폭': '-5%', '매수비중': '30%', '대상': '안정적 대형주/ETF', '조건': 'RSI 40 이하'},
-        {'하락폭': '-10%', '매수비중': '40%', '대상': '전체 포트폴리오', '조건': '볼린저밴드 하단'},
-        {'하락폭': '-15%', '매수비중': '20%', '대상': '성장주 위주', '조건': 'RSI 30 이하'},
-        {'하락폭': '-20%', '매수비중': '10%', '대상': '전략적 기회', '조건': '공포지수 최고점'}
-    ]
-    
-    조건_df = pd.DataFrame(조건_data)
-    st.dataframe(조건_df, width="stretch")
+    종목별로 세션에 보관하고 기준봉이 바뀌거나 새 종목이 추가될 때만 계산합니다.
+    (위험평가는 세션 공용 캐시의 결과를 참조만 하므로 세션마다 복사되지 않습니다)
+    """
+    from planning import get_pick_risk_profile, score_picks
+    from shared_cache import current_asof
+    
+    asof = current_asof()
+    캐시 = st.session_state.get('pick_panels')
+    if 캐시 is None or 캐시['asof'] != asof:
+        캐시 = st.session_state.pick_panels = {'asof': asof, '종목': {}}
+    
+    for 지표 in score_picks([x for x in dict.fromkeys(picks) if x not in 캐시['종목']]):
+        지표['위험평가'] = get_pick_risk_profile(지표['정보'])
+        지표['정보'] = {k: 지표['정보'][k] for k in ('code', 'name', 'price')}   # 패널·백테스트에 쓰는 항목만 보관
+        캐시['종목'][지표['코드']] = 지표
+    return [캐시['종목'][x] for x in picks]
 
-def generate_technical_calendar(portfolio):
-    """모멘텀+RSI 기반 기술적 분석 체크포인트"""
-    st.markdown("**모멘텀+RSI 기술적 분석 체크포인트**")
-    
-    체크포인트_data = [
-        {
-            '주기': '매일 장마감 후', 
-            '체크항목': 'RSI 지표 + 20일선 모멘텀', 
-            '매수 조건': 'RSI < 40 + 모멘텀 상승',
-            '매도 조건': 'RSI > 70 + 모멘텀 둔화',
-            '액션': '단기 매매 신호 확인'
-        },
-        {
-            '주기': '매주 월요일', 
-            '체크항목': '60일선 장기 모멘텀 + RSI 추세', 
-            '매수 조건': 'RSI < 30 + 장기 모멘텀 지지',
-            '매도 조건': 'RSI > 80 + 장기 모멘텀 하락',
-            '액션': '주간 트렌드 방향성 확인'
-        },
-        {
-            '주기': '매월 첫째주', 
-            '체크항목': '월간 모멘텀 사이클 + RSI 패턴', 
-            '매수 조건': '월간 RSI 바닥권 + 모멘텀 전환',
-            '매도 조건': '월간 RSI 고점 + 모멘텀 피크',
-            '액션': '중기 포지션 재조정'
-        },
-        {
-            '주기': '분기별', 
-            '체크항목': '장기 모멘텀 사이클 + RSI 매크로', 
-            '매수 조건': '분기 RSI 저점 + 모멘텀 사이클 전환',
-            '매도 조건': '분기 RSI 고점 + 모멘텀 사이클 피크',
-            '액션': '전체 포트폴리오 리밸런싱'
-        }
-    ]
-    
-    체크포인트_df = pd.DataFrame(체크포인트_data)
-    st.dataframe(체크포인트_df, width="stretch")
 
-def generate_lump_sum_calendar(portfolio):
-    """일시불 투자 체크리스트"""
-    st.markdown("**일시불 투자 실행 체크리스트**")
-    
-    체크리스트_data = [
-        {'순서': '1단계', '항목': '시장 상황 최종 점검', '완료': False},
-        {'순서': '2단계', '항목': '포트폴리오 배분 확인', '완료': False},
-        {'순서': '3단계', '항목': '매수 주문 일괄 실행', '완료': False},
-        {'순서': '4단계', '항목': '손절/목표가 설정', '완료': False},
-        {'순서': '5단계', '항목': '모니터링 알림 설정', '완료': False}
-    ]
-    
-    체크리스트_df = pd.DataFrame(체크리스트_data)
-    st.dataframe(체크리스트_df, width="stretch")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+AIA 2.0 — 모멘텀 + RSI 전략 백테스트 엔진
+Trade Planner 규칙을 여러 종목 가격 행렬(종목 × 일자)에 한 번에 적용합니다.
+
+전략 규칙 (tab_trade_planner 전략 개요와 동일)
+- 매수: RSI 30-40 구간 + 20일선 모멘텀 상승 전환
+- 50% 매도: RSI 70 초과 + 모멘텀 둔화 (포지션당 1회)
+- 전량 매도: RSI 80 초과 (강제 매도) 또는 진입가 대비 -15% 손절
+
+신호는 전 구간 배열 연산으로 미리 계산하고, 포지션은 일자 루프 대신 거래 회차 단위로
+모든 종목의 진입·부분매도·청산일을 찾아 갱신합니다 (손절가가 진입가에 따라 달라지므로
+회차 사이는 순차적이지만, 반복 횟수는 종목당 거래 횟수 수준). 신호는 당일 종가에 체결되고
+다음 거래일 수익률부터 반영되어 미래 정보를 쓰지 않습니다.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from indicators import TRADING_DAYS, ma_momentum, rsi_wilder
+
+DEFAULT_RULES = {
+    "buy_rsi_low": 30,
+    "buy_rsi_high": 40,
+    "take_profit_rsi": 70,
+    "force_sell_rsi": 80,
+    "stop_loss": 0.15,
+    "cost_bps": 0.0,       # 편도 거래비용 (bp)
+}
+
+_EXIT_SCAN_DAYS = 64   # 청산일 탐색 시 한 번에 읽는 일수
+
+
+def _signals(close, rules):
+    """전 구간 신호 행렬 계산 (RSI, 모멘텀 전환)"""
+    rsi = rsi_wilder(close)
+    momentum = ma_momentum(close, 20)
+    slope = np.full(close.shape, np.nan)
+    slope[:, 1:] = np.diff(momentum, axis=1)
+    prev_slope = np.full(close.shape, np.nan)
+    prev_slope[:, 1:] = slope[:, :-1]
+
+    turning_up = (slope > 0) & (prev_slope <= 0)
+    slowing = slope < 0
+    buy = (rsi >= rules["buy_rsi_low"]) & (rsi <= rules["buy_rsi_high"]) & turning_up
+    take_half = (rsi > rules["take_profit_rsi"]) & slowing
+    force_sell = rsi > rules["force_sell_rsi"]
+    return buy, take_half, force_sell
+
+
+def _next_true(mask):
+    """각 일자(당일 포함) 이후 첫 True 일자 — (종목 × 일자+1) int32, 없으면 n_days (마지막 열은 n_days)"""
+    n_days = mask.shape[1]
+    out = np.full((mask.shape[0], n_days + 1), n_days, dtype=np.int32)
+    out[:, :n_days] = np.where(mask, np.arange(n_days, dtype=np.int32), n_days)
+    return np.minimum.accumulate(out[:, ::-1], axis=1)[:, ::-1]
+
+
+def _first_exit(close, force_sell, rows, start, threshold, window=_EXIT_SCAN_DAYS):
+    """진입 후 첫 전량 매도일 (강제 매도 신호 또는 종가 ≤ 손절가, start일부터) — 없으면 n_days
+
+    보유 기간만큼만 읽도록 종목별로 window일씩 앞으로 훑습니다.
+    """
+    n_days = close.shape[1]
+    exit_day = np.full(len(rows), n_days)
+    start = start.copy()
+    pending = np.flatnonzero(start < n_days)
+    offsets = np.arange(window)
+    while pending.size:
+        days = start[pending, np.newaxis] + offsets
+        inside = days < n_days
+        np.minimum(days, n_days - 1, out=days)
+        r = rows[pending, np.newaxis]
+        hit = inside & (force_sell[r, days] | (close[r, days] <= threshold[pending, np.newaxis]))
+        found = hit.any(axis=1)
+        exit_day[pending[found]] = days[found, hit[found].argmax(axis=1)]
+        start[pending] += window
+        pending = pending[~found & (start[pending] < n_days)]
+    return exit_day
+
+
+def _simulate(close, rules):
+    """가격 블록 하나의 전략 시뮬레이션 — 종목 합계 단위의 집계값 반환
+
+    거래 회차 단위로 처리합니다: 회차마다 모든 종목의 다음 진입일(매수 신호)을 찾고,
+    그 진입가로 정해지는 손절가와 강제 매도 신호로 청산일을, 그 사이 첫 50% 매도 신호로
+    부분 매도일을 정합니다. 반복 횟수는 일자 수가 아니라 종목당 최대 거래 횟수이며,
+    포지션 경로와 일간 손익은 진입·매도일의 포지션 변화량 누적합으로 한 번에 계산합니다.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n_tickers, n_days = close.shape
+    buy, take_half, force_sell = _signals(close, rules)
+    buy[:, 0] = False   # 첫날은 전일 종가가 없어 진입하지 않음
+
+    returns = np.zeros(close.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1.0
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    cost = rules["cost_bps"] / 10000.0
+    stop_ratio = 1.0 - rules["stop_loss"]
+    next_buy = _next_true(buy)
+    next_half = _next_true(take_half)
+
+    # 포지션 변화량 (진입 +1, 50% 매도 -0.5, 전량 매도 -잔량) — 종목마다 이벤트 일자는 서로 다름
+    delta = np.zeros((n_tickers, n_days))
+    wins = 0
+    trades = 0
+    open_positions = 0
+    rows = np.arange(n_tickers)
+    search_from = np.zeros(n_tickers, dtype=np.int64)
+    while rows.size:
+        entry_day = next_buy[rows, search_from]
+        rows, entry_day = rows[entry_day < n_days], entry_day[entry_day < n_days]
+        if not rows.size:
+            break
+        entry = close[rows, entry_day]
+        exit_day = _first_exit(close, force_sell, rows, entry_day + 1, entry * stop_ratio)
+        half_day = next_half[rows, entry_day + 1]
+        half = half_day < exit_day
+
+        delta[rows, entry_day] = 1.0
+        delta[rows[half], half_day[half]] = -0.5
+        realized = np.where(half, 0.5 * (close[rows, np.minimum(half_day, n_days - 1)] / entry - 1.0), 0.0)
+        closed = exit_day < n_days
+        remaining = np.where(half, 0.5, 1.0)[closed]
+        delta[rows[closed], exit_day[closed]] = -remaining
+        realized = realized[closed] + remaining * (close[rows[closed], exit_day[closed]] / entry[closed] - 1.0)
+        trades += int(closed.sum())
+        wins += int((realized > 0).sum())
+        open_positions += int((~closed).sum())
+
+        # 청산 다음 날부터 다시 진입 신호 탐색 (보유 중이던 종목은 청산일에 재진입하지 않음)
+        rows, search_from = rows[closed], exit_day[closed] + 1
+        rows, search_from = rows[search_from < n_days], search_from[search_from < n_days]
+
+    position = np.cumsum(delta, axis=1)
+    change = np.abs(delta).sum(axis=0)
+    daily_sum = np.zeros(n_days)        # 종목별 일간 손익의 합
+    daily_sum[1:] = np.einsum("ij,ij->j", position[:, :-1], returns[:, 1:]) - change[1:] * cost
+
+    return {
+        "daily_sum": daily_sum,
+        "traded": float(change.sum()),  # 누적 |포지션 변화|
+        "exposure": float(position[:, 1:].sum()),
+        "wins": wins,
+        "trades": trades,
+        "open_positions": open_positions,
+        "n_tickers": n_tickers,
+    }
+
+
+def _merge(parts):
+    """블록별 집계값 합산"""
+    merged = dict(parts[0])
+    for part in parts[1:]:
+        for key in ("daily_sum", "traded", "exposure", "wins", "trades", "open_positions", "n_tickers"):
+            merged[key] = merged[key] + part[key]
+    return merged
+
+
+def _metrics(totals, periods_per_year):
+    """동일가중 포트폴리오 성과 지표"""
+    n_tickers = totals["n_tickers"]
+    n_days = len(totals["daily_sum"])
+    daily = totals["daily_sum"] / n_tickers
+    equity = np.cumprod(1.0 + daily)
+    years = max(n_days - 1, 1) / periods_per_year
+    peak = np.maximum.accumulate(equity)
+    trades = totals["trades"]
+    return {
+        "cagr": float(equity[-1] ** (1.0 / years) - 1.0) if equity[-1] > 0 else -1.0,
+        "max_drawdown": float((equity / peak - 1.0).min()),
+        "hit_rate": totals["wins"] / trades if trades else float("nan"),
+        "turnover": float(totals["traded"] / n_tickers / years),   # 연간 매매 회전율 (편도 합계)
+        "exposure": float(totals["exposure"] / n_tickers / max(n_days - 1, 1)),
+        "trades": trades,
+        "open_positions": totals["open_positions"],
+        "equity": equity,
+    }
+
+
+def run_backtest(close, rules=None, workers=None, chunk_size=256, periods_per_year=TRADING_DAYS):
+    """모멘텀+RSI 전략 백테스트 (종목별 동일가중)
+
+    close: (종목 × 일자) 종가 행렬. workers가 2 이상이면 종목을 chunk_size 단위로
+    나눠 프로세스 풀에서 계산한 뒤 합산합니다.
+    반환값: cagr, max_drawdown, hit_rate(청산 거래 중 수익 비율), turnover(연간),
+    exposure(평균 투자비중), trades, open_positions, equity(누적 자산곡선)
+    """
+    rules = {**DEFAULT_RULES, **(rules or {})}
+    close = np.atleast_2d(np.asarray(close, dtype=np.float64))
+    if close.shape[1] < 2:
+        raise ValueError("백테스트에는 최소 2거래일 이상의 가격이 필요합니다")
+
+    if workers is None or workers <= 1 or close.shape[0] <= chunk_size:
+        return _metrics(_simulate(close, rules), periods_per_year)
+
+    workers = min(workers, os.cpu_count() or 1)
+    blocks = [close[i:i + chunk_size] for i in range(0, close.shape[0], chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_simulate, blocks, [rules] * len(blocks)))
+    return _metrics(_merge(parts), periods_per_year)
@@ -0,0 +1,293 @@
+"""
+AIA 2.0 — 플래너 벤치마크
+신호 점수, RSI, 최종 포트폴리오, 분할 매수 캘린더, 주문 수량, 화폐 포맷을 여러 규모로 측정
+
+    python benchmarks.py                        # 전체 측정 → 이력 추가, 기준값 대비 회귀 검사
+    python benchmarks.py --only rsi_wilder --scales 1 100
+    python benchmarks.py --save-baseline        # 이번 결과를 기준값(benchmarks/baseline.json)으로 저장
+
+규모(n)는 종목 또는 고객 프로필 수입니다. 항목마다 한 번씩 호출하는 벤치마크는
+호출별 지연시간을, 전체를 한 번에 처리하는 벤치마크(RSI)는 일괄 호출 지연시간을
+백분위(p50/p95/p99)로 기록하고 처리량은 중앙값 지연 기준 초당 항목 수입니다.
+(공유 장비의 순간 잡음에 평균보다 덜 흔들립니다)
+입력은 고정 시드로 생성하고 가격 데이터는 데모 피드를 사용하므로 네트워크 없이 동작합니다.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+DEFAULT_SCALES = (1, 100, 10_000)
+# 실행 이력은 장비별 로컬 기록(data/, 버전 관리 제외), 기준값은 저장소에 커밋해 공유
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bench_history.json")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# 기준값 대비 처리량 하락 또는 p95 지연 증가가 이 비율을 넘으면 회귀
+# (p95 증가가 NOISE_FLOOR초 미만이면 타이머·스케줄러 잡음으로 보고 무시)
+REGRESSION_THRESHOLD = 0.20
+NOISE_FLOOR = 5e-6
+
+# 회귀로 보이는 항목은 최대 CONFIRM_RUNS번 다시 측정해 가장 좋은 값으로 판정
+CONFIRM_RUNS = 2
+
+# 규모별 측정 시간(초)과 최대 호출 수 — 둘 중 먼저 도달할 때까지 반복 (최소 1회)
+MIN_TIME = 0.5
+MAX_CALLS = 200_000
+
+
+def _signal_inputs(n, rng):
+    return list(zip(rng.uniform(10, 90, n).tolist(), rng.uniform(-15, 15, n).tolist(), rng.uniform(-25, 25, n).tolist()))
+
+
+def _bench_momentum_rsi_signal(n, rng):
+    from signals import calculate_momentum_rsi_signal
+    return calculate_momentum_rsi_signal, _signal_inputs(n, rng), 1
+
+
+def _bench_buy_signal_score(n, rng):
+    from signals import calculate_buy_signal_score
+    rows = [(rsi, b, m20, m60) for (rsi, m20, m60), b in zip(_signal_inputs(n, rng), rng.uniform(-0.2, 1.2, n).tolist())]
+    return calculate_buy_signal_score, rows, 1
+
+
+def _bench_rsi_wilder(n, rng):
+    """step_stock_analyzer와 같은 RSI 계산 (종목 × 250거래일 종가를 한 번에)"""
+    from indicators import rsi_wilder
+    prices = 50000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n, 250)), axis=1))
+    return rsi_wilder, [(prices,)], n
+
+
+def _profile_inputs(n, rng):
+    from planning import PlanInputs
+    성향 = ["안정형", "중립형", "공격형"]
+    관점 = ["보수형", "중립형", "공격형", None]
+    배분 = ["방어형", "균형형", "공격형", None]
+    섹터 = ["AI/반도체", "로봇/자동화", "2차전지", "바이오/헬스"]
+    return [
+        PlanInputs.from_state({
+            "profile": {"asset": int(rng.integers(100, 100_000)), "성향": 성향[rng.integers(3)]},
+            "choice_macro": 관점[rng.integers(4)],
+            "choice_alloc": 배분[rng.integers(4)],
+            "choice_sector": list(rng.choice(섹터, rng.integers(0, 3), replace=False)),
+        })
+        for _ in range(n)
+    ]
+
+
+def _bench_final_portfolio(n, rng):
+    from planning import generate_final_portfolio
+    return generate_final_portfolio, [(inputs,) for inputs in _profile_inputs(n, rng)], 1
+
+
+def _bench_dca_calendar(n, rng):
+    from planning import generate_dca_calendar
+    기간 = ["1주일 내", "1개월 내", "3개월 내", "6개월 내"]
+    rows = [
+        ({"투자금액": {"주식": float(a * 0.6), "채권": float(a * 0.4)}}, 기간[rng.integers(4)], "2024-10-15")
+        for a in rng.integers(1_000_000, 1_000_000_000, n)
+    ]
+    return generate_dca_calendar, rows, 1
+
+
+def _bench_order_sizing(n, rng):
+    """고객 n명 × 30개 상품 목표 금액을 정수 매매단위로 (한 번에)"""
+    from orders import round_lots
+    targets = rng.uniform(1e5, 5e6, (n, 30))
+    lot_costs = rng.uniform(3e3, 8e5, (n, 30))
+    return round_lots, [(targets, lot_costs)], n
+
+
+def _bench_format_money(n, rng):
+    from planning import format_money
+    return format_money, [(v,) for v in (10 ** rng.uniform(2, 13, n)).tolist()], 1
+
+
+# 이름 → 준비 함수 (n, rng) → (측정 함수, 호출 인자 목록, 호출당 항목 수)
+BENCHMARKS = {
+    "momentum_rsi_signal": _bench_momentum_rsi_signal,
+    "buy_signal_score": _bench_buy_signal_score,
+    "rsi_wilder": _bench_rsi_wilder,
+    "final_portfolio": _bench_final_portfolio,
+    "dca_calendar": _bench_dca_calendar,
+    "order_sizing": _bench_order_sizing,
+    "format_money": _bench_format_money,
+}
+
+
+def run_benchmark(name, n, seed=0):
+    """벤치마크 하나를 규모 n으로 측정 — {처리량, 지연 백분위·평균(초), 반복, 호출 수}"""
+    fn, calls, per_call = BENCHMARKS[name](n, np.random.default_rng(seed))
+    fn(*calls[0])  # 워밍업 (지연 import·캐시 적재 제외)
+
+    latencies = []
+    elapsed = 0.0
+    repeats = 0
+    clock = time.perf_counter
+    gc.collect()
+    gc.disable()  # timeit과 같이 측정 중 GC 중단 (실행 순서에 따른 편차 제거)
+    try:
+        while repeats == 0 or (elapsed < MIN_TIME and len(latencies) < MAX_CALLS):
+            for args in calls:
+                start = clock()
+                fn(*args)
+                took = clock() - start
+                latencies.append(took)
+                elapsed += took
+            repeats += 1
+    finally:
+        gc.enable()
+
+    lat = np.array(latencies)
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    return {
+        "throughput": per_call / float(p50),
+        "mean": elapsed / len(lat),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "repeats": repeats,
+        "calls": len(lat),
+    }
+
+
+def run_suite(names=None, scales=DEFAULT_SCALES, seed=0, progress=None):
+    """선택 벤치마크 × 규모 측정 — {이름: {규모(str): 결과}}"""
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = {}
+        for n in scales:
+            results[name][str(n)] = run_benchmark(name, n, seed)
+            if progress:
+                progress(name, n, results[name][str(n)])
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """기준값 대비 회귀 목록 — [(이름, 규모, 지표, 기준값, 현재값)]"""
+    regressions = []
+    for name, by_scale in results.items():
+        for n, cur in by_scale.items():
+            base = baseline.get(name, {}).get(n)
+            if base is None:
+                continue
+            if cur["throughput"] < base["throughput"] * (1 - threshold):
+                regressions.append((name, n, "throughput", base["throughput"], cur["throughput"]))
+            if cur["p95"] > base["p95"] * (1 + threshold) and cur["p95"] - base["p95"] > NOISE_FLOOR:
+                regressions.append((name, n, "p95", base["p95"], cur["p95"]))
+    return regressions
+
+
+def _best(a, b):
+    """두 측정 중 좋은 값 (처리량 최대, 지연 최소)"""
+    best = {k: min(a[k], b[k]) for k in ("mean", "p50", "p95", "p99")}
+    best["throughput"] = max(a["throughput"], b["throughput"])
+    best["repeats"] = a["repeats"] + b["repeats"]
+    best["calls"] = a["calls"] + b["calls"]
+    return best
+
+
+def confirm_regressions(results, baseline, threshold=REGRESSION_THRESHOLD, seed=0, runs=CONFIRM_RUNS):
+    """회귀 항목을 다시 측정해 일시적 잡음을 걸러낸 회귀 목록 (results는 최선값으로 갱신)"""
+    regressions = compare(results, baseline, threshold)
+    for _ in range(runs):
+        flagged = {(name, n) for name, n, *_ in regressions}
+        if not flagged:
+            break
+        for name, n in flagged:
+            results[name][n] = _best(results[name][n], run_benchmark(name, int(n), seed))
+        regressions = compare(results, baseline, threshold)
+    return regressions
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_json(path, value):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def _format_latency(seconds):
+    return f"{seconds * 1e6:,.1f}µs" if seconds < 1e-3 else f"{seconds * 1e3:,.2f}ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="플래너 벤치마크 (처리량·지연 백분위 기록, 회귀 검사)")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="측정할 벤치마크")
+    parser.add_argument("--scales", nargs="+", type=int, default=list(DEFAULT_SCALES), help="규모 (종목/프로필 수)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="이력 JSON 경로")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="회귀 판정 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    def progress(name, n, r):
+        print(f"{name:<22}{n:>8,}{r['throughput']:>16,.0f}/s"
+              f"{_format_latency(r['p50']):>12}{_format_latency(r['p95']):>12}{_format_latency(r['p99']):>12}",
+              flush=True)
+
+    print(f"{'벤치마크':<18}{'규모':>10}{'처리량':>15}{'p50':>14}{'p95':>12}{'p99':>12}")
+    results = run_suite(args.only, args.scales, args.seed, progress)
+    baseline = None if args.save_baseline else _load_json(args.baseline, None)
+    regressions = confirm_regressions(results, baseline, args.threshold, args.seed) if baseline else []
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    history = _load_json(args.history, [])
+    history.append(record)
+    _save_json(args.history, history)
+    print(f"이력 저장: {args.history} ({len(history)}회)")
+
+    if args.save_baseline:
+        baseline = _load_json(args.baseline, {})
+        for name, by_scale in results.items():
+            baseline.setdefault(name, {}).update(by_scale)
+        _save_json(args.baseline, baseline)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("기준값 없음 — --save-baseline으로 저장하면 다음 실행부터 회귀를 검사합니다")
+        return 0
+    for name, n, metric, base, cur in regressions:
+        if metric == "throughput":
+            print(f"⚠ 회귀: {name} n={n} 처리량 {base:,.0f}/s → {cur:,.0f}/s ({cur / base - 1:+.0%})")
+        else:
+            print(f"⚠ 회귀: {name} n={n} p95 {_format_latency(base)} → {_format_latency(cur)} ({cur / base - 1:+.0%})")
+    if not regressions:
+        print(f"회귀 없음 (기준값 대비 ±{args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+AIA 2.0 — 하락매수 사다리 시뮬레이터
+확정 배분 포트폴리오의 과거·모의 가격 경로 수천 개에 하락매수 사다리(하락폭별 매수 비중)를 한 번에 적용합니다.
+
+경로는 시작가(계획 시점 평가금액) 1로 정규화한 (경로 × 대기일+1) 행렬입니다.
+- historical_paths(): 과거 자산군 일간 수익률을 목표 비중으로 합친 포트폴리오 지수의 겹치는 대기기간 구간 전체
+- simulated_paths(): 같은 포트폴리오 일간 로그수익률 평균·표준편차로 만든 기하 브라운 운동 경로
+
+가단 i는 경로의 누적 최저가가 1 − 하락폭ᵢ 이하가 된 첫날 종가에 체결됩니다.
+누적 최저가는 단조 감소하므로 (경로 × 가단 × 일) 비교 한 번과 argmax로 모든 가단의 체결일을 찾습니다.
+대기기간 안에 체결되지 않은 비중은 마지막 날 종가에 일괄 매수한다고 보고(일시불 대비 비교용),
+그 전까지는 현금으로 놀고 있던 것으로 계산합니다.
+
+지표 (일시불 = 시작가 1에 전액 매수)
+- fill_probability: 가단별 체결 확률
+- entry_discount: 평균 매입단가(가중 조화평균)의 일시불 대비 할인율 (양수면 사다리가 싸게 삼)
+- filled_discount: 체결된 비중만의 평균 할인율
+- beat_rate: 사다리 평균 매입단가가 일시불보다 낮았던 경로 비율
+- idle_cash: 대기기간 말까지 체결되지 않은 비중 평균, idle_days: 자금 가중 평균 대기일
+"""
+
+import numpy as np
+
+# 하락폭(비율) → 매수 비중 (합 1로 정규화)
+DEFAULT_LADDER = ((0.05, 0.30), (0.10, 0.40), (0.15, 0.20), (0.20, 0.10))
+
+# 대기 기간 (거래일, 6개월)
+DEFAULT_HORIZON = 126
+
+
+def _clean_returns(returns):
+    returns = np.asarray(returns, dtype=np.float64)
+    return returns[np.isfinite(returns)]
+
+
+def historical_paths(returns, horizon=DEFAULT_HORIZON):
+    """포트폴리오 일간 수익률의 겹치는 horizon일 구간 전체를 시작가 1로 정규화한 경로 (경로 × horizon+1)"""
+    returns = _clean_returns(returns)
+    if len(returns) < horizon:
+        return np.empty((0, horizon + 1))
+    level = np.concatenate([[1.0], np.cumprod(1.0 + returns)])
+    windows = np.lib.stride_tricks.sliding_window_view(level, horizon + 1)
+    return windows / windows[:, :1]
+
+
+def simulated_paths(returns, horizon=DEFAULT_HORIZON, n_paths=2000, seed=0):
+    """포트폴리오 일간 로그수익률 평균·표준편차를 따르는 모의 경로 (경로 × horizon+1)"""
+    returns = _clean_returns(returns)
+    log_returns = np.log1p(returns) if len(returns) > 1 else np.zeros(2)
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(log_returns.mean(), log_returns.std(ddof=1), (n_paths, horizon))
+    paths = np.ones((n_paths, horizon + 1))
+    paths[:, 1:] = np.exp(np.cumsum(steps, axis=1))
+    return paths
+
+
+def normalize_ladder(ladder):
+    """(하락폭, 비중) 목록 → 하락폭 오름차순 (drops, fractions) 배열 (비중 합 1)"""
+    ladder = [(float(drop), float(fraction)) for drop, fraction in ladder if fraction and fraction > 0]
+    if not ladder:
+        raise ValueError("매수 비중이 있는 가단이 없습니다")
+    drops, fractions = np.array(sorted(ladder)).T
+    if np.any(drops < 0) or np.any(drops >= 1):
+        raise ValueError("하락폭은 0 이상 1 미만이어야 합니다")
+    return drops, fractions / fractions.sum()
+
+
+def evaluate_ladder(paths, ladder=DEFAULT_LADDER):
+    """사다리 하나를 경로 전체에 적용
+
+    반환값: {paths, horizon, rungs: [{drop, fraction, fill_probability, mean_fill_day, fill_discount}],
+             entry_discount, filled_discount, beat_rate, idle_cash, idle_days}
+    가단은 하락폭 오름차순이며 rungs의 fraction은 정규화된 비중입니다.
+    """
+    paths = np.asarray(paths, dtype=np.float64)
+    drops, fractions = normalize_ladder(ladder)
+    n_paths, n_days = paths.shape
+    horizon = n_days - 1
+    empty_rungs = [
+        {"drop": float(d), "fraction": float(f), "fill_probability": 0.0, "mean_fill_day": None, "fill_discount": None}
+        for d, f in zip(drops, fractions)
+    ]
+    if n_paths == 0:
+        return {"paths": 0, "horizon": horizon, "rungs": empty_rungs, "entry_discount": 0.0,
+                "filled_discount": None, "beat_rate": 0.0, "idle_cash": 1.0, "idle_days": float(horizon)}
+
+    # (경로 × 가단 × 일) — 누적 최저가가 가단 가격 이하가 된 첫날
+    running_min = np.minimum.accumulate(paths, axis=1)
+    hit = running_min[:, None, :] <= (1.0 - drops)[None, :, None]
+    first = hit.argmax(axis=2)
+    filled = np.take_along_axis(hit, first[:, :, None], axis=2)[:, :, 0]
+    day = np.where(filled, first, horizon)
+    price = np.take_along_axis(paths, day, axis=1)           # 미체결 가단은 마지막 날 종가
+
+    # 평균 매입단가 = 투입 자금 / 매수 수량 (비중 합 1)
+    units = (fractions / price).sum(axis=1)
+    entry_discount = 1.0 - 1.0 / units
+    filled_weight = filled @ fractions
+    filled_units = np.where(filled, fractions / price, 0.0).sum(axis=1)
+    any_filled = filled_weight > 0
+    filled_discount = 1.0 - filled_weight[any_filled] / filled_units[any_filled]
+
+    fill_probability = filled.mean(axis=0)
+    rungs = []
+    for i, rung in enumerate(empty_rungs):
+        column = filled[:, i]
+        rung["fill_probability"] = float(fill_probability[i])
+        if column.any():
+            rung["mean_fill_day"] = float(first[column, i].mean())
+            rung["fill_discount"] = float(1.0 - price[column, i].mean())
+        rungs.append(rung)
+
+    return {
+        "paths": n_paths,
+        "horizon": horizon,
+        "rungs": rungs,
+        "entry_discount": float(entry_discount.mean()),
+        "filled_discount": float(filled_discount.mean()) if any_filled.any() else None,
+        "beat_rate": float((entry_discount > 0).mean()),
+        "idle_cash": float(1.0 - filled_weight.mean()),
+        "idle_days": float((day @ fractions).mean()),
+    }
+
+
+def compare_ladder(historical, simulated, ladder=DEFAULT_LADDER):
+    """과거·모의 경로 평가를 함께 반환 — {"historical": ..., "simulated": ...}"""
+    return {"historical": evaluate_ladder(historical, ladder), "simulated": evaluate_ladder(simulated, ladder)}
@@ -0,0 +1,418 @@
+"""
+AIA 2.0 — 기술적 지표 엔진
+NumPy 기반 벡터화 지표 계산 (RSI, 이동평균, 볼린저밴드, 변동성)
+
+모든 함수는 1차원 (일자) 또는 2차원 (종목 × 일자) 가격 배열을 받아
+마지막 축(일자)을 따라 전체 시계열을 한 번에 계산합니다.
+워밍업 구간(윈도우가 채워지기 전)은 NaN으로 채워집니다.
+
+NaN 가격(상장 전·거래정지)은 건너뜁니다. 워밍업은 종목별 첫 유효 가격부터 세고,
+중간 결측은 이동 윈도우에서 빼고 평균을 내며(재귀 평활은 직전 유효 가격으로 채워 계산),
+결측일 당일의 지표만 NaN입니다. 재귀 평활은 결측 여부와 관계없이 같은 블록 누적합 경로를 씁니다.
+"""
+
+import numpy as np
+
+TRADING_DAYS = 252
+
+# 재귀 평활(EMA/Wilder) 블록의 감쇠 범위: decay**-블록길이 ≤ e**_EWM_LOG_RANGE (float64 범위 안)
+_EWM_LOG_RANGE = 300.0
+
+# compute_indicators 종목 축 블록 크기 (중간 배열이 캐시에 머무는 크기)
+_ROW_BLOCK = 32
+
+
+def _as_float_2d(prices):
+    """입력을 (종목 × 일자) float64 배열로 변환"""
+    arr = np.asarray(prices, dtype=np.float64)
+    squeeze = arr.ndim == 1
+    if squeeze:
+        arr = arr[np.newaxis, :]
+    elif arr.ndim != 2:
+        raise ValueError("가격 배열은 1차원(일자) 또는 2차원(종목 × 일자)이어야 합니다")
+    return arr, squeeze
+
+
+def _restore(arr, squeeze):
+    """입력 차원에 맞게 결과 배열 복원"""
+    return arr[0] if squeeze else arr
+
+
+def _first_valid(arr):
+    """종목별 첫 유효값 위치 (전부 NaN이면 일자 수)"""
+    valid = ~np.isnan(arr)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), arr.shape[1])
+
+
+def _window_sums(csum, window):
+    """누적합 → 이동합계 (워밍업 구간 NaN)"""
+    out = np.empty(csum.shape)
+    if window > csum.shape[1]:
+        out.fill(np.nan)
+        return out
+    out[:, : window - 1] = np.nan
+    out[:, window - 1] = csum[:, window - 1]
+    np.subtract(csum[:, window:], csum[:, :-window], out=out[:, window:])
+    return out
+
+
+def _gaps(missing):
+    """결측 마스크 → 이동평균 보정 정보 (결측이 없으면 None)
+
+    (마스크, 종목별 첫 유효 위치, 첫 유효값 이후 결측의 (종목, 일자) 위치)
+    첫 유효값 이전 결측은 워밍업으로 가려지므로, 유효 개수 보정은 그 뒤의 결측 주변 윈도우에만 필요합니다.
+    """
+    if missing is None or not missing.any():
+        return None
+    valid = ~missing
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), missing.shape[1])
+    inner = missing.sum(axis=1) != first
+    if inner.any():
+        rows = np.flatnonzero(inner)
+        gap_rows, gap_days = np.nonzero(missing[rows] & (np.arange(missing.shape[1]) >= first[rows, np.newaxis]))
+        holes = (rows[gap_rows], gap_days)
+    else:
+        holes = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+    return missing, first, holes
+
+
+def _prepare(arr):
+    """(결측을 직전 유효값으로 채운 배열, _gaps 결과) — 첫 유효값 이전은 NaN 유지, 결측이 없으면 (arr, None)"""
+    gaps = _gaps(np.isnan(arr))
+    if gaps is None or not len(gaps[2][0]):
+        return arr, gaps
+    # 연속 결측은 구간 시작 전날(유효값)에서 채움 — 결측 위치는 (종목, 일자) 순으로 정렬되어 있음
+    rows, days = gaps[2]
+    run_start = np.ones(len(rows), dtype=bool)
+    run_start[1:] = (rows[1:] != rows[:-1]) | (days[1:] != days[:-1] + 1)
+    source = days[run_start][np.cumsum(run_start) - 1] - 1
+    filled = arr.copy()
+    filled[rows, days] = arr[rows, source]
+    return filled, gaps
+
+
+def _rolling_means(arr, windows, gaps):
+    """윈도우별 이동평균 목록 (누적합은 한 번만 계산, gaps: _gaps 결과)
+
+    결측이 있으면 윈도우 안 유효값만 평균하고, 종목별 첫 유효값부터 window일이 지나야 값이 나오며
+    결측일 당일은 NaN입니다. 중간 결측이 드물면 그 결측이 걸친 윈도우만 유효 개수로 다시 나눕니다.
+    """
+    if gaps is None:
+        csum = np.cumsum(arr, axis=1)
+    else:
+        missing, first, (hole_rows, hole_days) = gaps
+        csum = np.cumsum(np.where(missing, 0.0, arr), axis=1)
+        late = np.flatnonzero(first > 0)
+        n_days = arr.shape[1]
+        dense_holes = len(hole_rows) * max(windows) * 8 > arr.size
+        if dense_holes:
+            counts = np.cumsum(~missing, axis=1, dtype=np.int32)
+    means = []
+    for window in windows:
+        out = _window_sums(csum, window)
+        out /= window
+        if gaps is not None:
+            if dense_holes:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    out *= window / _window_sums(counts, window)
+            elif len(hole_rows):
+                # 결측 하나가 걸친 윈도우 끝 위치: 결측일부터 window일 — 위치별 결측 수만큼 개수에서 뺌
+                ends = (hole_days[:, np.newaxis] + np.arange(window)).ravel()
+                flat = np.repeat(hole_rows, window) * n_days + ends
+                flat, lost = np.unique(flat[ends < n_days], return_counts=True)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    out.flat[flat] *= window / (window - lost)
+            if len(late):
+                # 워밍업은 종목별 첫 유효값부터 — 가장 늦은 워밍업이 끝나는 열까지만 확인
+                cols = min(int(first[late].max()) + window - 1, n_days)
+                head = out[late, :cols]
+                head[np.arange(cols) < (first[late] + window - 1)[:, np.newaxis]] = np.nan
+                out[late, :cols] = head
+            if len(hole_rows):
+                out[missing] = np.nan
+        means.append(out)
+    return means
+
+
+def _rolling_mean(arr, window):
+    """이동평균 (워밍업 구간 NaN, 결측은 윈도우 안 유효값만 평균)"""
+    return _rolling_means(arr, (window,), _gaps(np.isnan(arr)))[0]
+
+
+def _recursive_mean(values, alpha, start, seed):
+    """y[t] = (1-alpha)*y[t-1] + alpha*x[t] 재귀식을 블록 단위 누적합으로 계산
+
+    start 시점의 값은 seed(종목별 초기값)이며, 그 이전 구간은 NaN입니다.
+    블록 내부는 닫힌 해(감쇠 가중 누적합)로 한 번에 풀어 일자별 루프를 없앱니다.
+    start는 종목별 배열일 수 있습니다 — 가장 이른 시작점에서 0으로 출발하고 종목별 시작일 입력을
+    seed/alpha로 두면 그날 값이 정확히 seed가 되므로 같은 경로로 풉니다. start 이후 x에 NaN이 없어야 합니다.
+    """
+    if np.ndim(start) == 0:
+        return _recursive_mean_dense(values, alpha, int(start), seed)
+
+    n_rows, n_days = values.shape
+    start = np.asarray(start, dtype=np.int64)
+    seed = np.asarray(seed, dtype=np.float64)
+    first = int(start.min()) if n_rows else n_days
+    if first >= n_days:
+        return np.full(values.shape, np.nan)
+
+    # 시작 전 구간은 가장 늦은 시작점까지만 있으므로 그 열까지만 마스킹
+    cols = min(int(start.max()), n_days)
+    before = np.arange(cols) < start[:, np.newaxis]
+    x = values.copy()
+    x[:, :cols][before] = 0.0
+    late = np.flatnonzero((start > first) & (start < n_days))
+    x[late, start[late]] = seed[late] / alpha
+    out = _recursive_mean_dense(x, alpha, first, np.where(start == first, seed, 0.0))
+    out[:, :cols][before] = np.nan
+    return out
+
+
+def _recursive_mean_dense(values, alpha, start, seed):
+    """공통 시작 시점의 _recursive_mean"""
+    n_days = values.shape[1]
+    out = np.empty(values.shape)
+    out[:, :start] = np.nan
+    if start >= n_days:
+        return out
+    out[:, start] = seed
+    if alpha >= 1.0:
+        out[:, start + 1:] = values[:, start + 1:]
+        return out
+
+    decay = 1.0 - alpha
+    block_len = max(1, int(_EWM_LOG_RANGE / -np.log(decay)))
+    steps = np.arange(1, min(block_len, n_days - start - 1) + 1, dtype=np.float64)
+    growth = alpha * decay ** -steps
+    shrink = decay ** steps
+    prev = out[:, start]
+    pos = start + 1
+    while pos < n_days:
+        end = min(pos + block_len, n_days)
+        width = end - pos
+        block = out[:, pos:end]
+        np.multiply(values[:, pos:end], growth[:width], out=block)
+        block[:, 0] += prev                 # 직전 값은 누적합 첫 항에 더해 블록 전체로 전파
+        np.cumsum(block, axis=1, out=block)
+        block *= shrink[:width]
+        prev = block[:, -1]
+        pos = end
+    return out
+
+
+def _window_seed(values, window):
+    """종목별 첫 유효값부터 window일의 평균과 그 마지막 위치 (재귀 평활 초기값)
+
+    values는 첫 유효값 이전에만 NaN이 있는 배열(_prepare로 채운 배열)입니다.
+    """
+    if not np.isnan(values[:, 0]).any():
+        return values[:, :window].mean(axis=1), window - 1
+    first = _first_valid(values)
+    start = first + window - 1
+    idx = np.minimum(first[:, np.newaxis] + np.arange(window), values.shape[1] - 1)
+    seed = np.take_along_axis(values, idx, axis=1).mean(axis=1)
+    seed[start >= values.shape[1]] = np.nan
+    return seed, start
+
+
+def _ema(filled, gaps, window):
+    """지수이동평균 (첫 window일 SMA로 초기화, window 1이면 가격 그대로) — filled·gaps: _prepare 결과"""
+    if window <= 1:
+        out = filled.copy()
+    elif window > filled.shape[1]:
+        return np.full(filled.shape, np.nan)
+    else:
+        seed, start = _window_seed(filled, window)
+        out = _recursive_mean(filled, 2.0 / (window + 1), start, seed)
+    if gaps is not None:
+        out[gaps[0]] = np.nan
+    return out
+
+
+def _momentum(arr, ma):
+    """이동평균 대비 괴리율 (%)"""
+    out = np.subtract(arr, ma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out /= ma
+    out *= 100.0
+    return out
+
+
+def _rolling_std(arr, window, gaps, mean=None):
+    """이동표준편차 (모표준편차) — mean이 주어지면 재사용, gaps: _gaps 결과"""
+    # 종목별 첫 유효값을 빼서 제곱합의 자릿수 손실을 줄임
+    base = arr[:, :1]
+    if gaps is not None and gaps[0][:, 0].any():
+        first = np.minimum(gaps[1], arr.shape[1] - 1)
+        base = np.take_along_axis(arr, first[:, np.newaxis], axis=1)
+    centered = arr - base
+    if mean is None:
+        mean = _rolling_means(arr, (window,), gaps)[0]
+    var = _rolling_means(np.square(centered, out=centered), (window,), gaps)[0]
+    shifted = mean - base
+    var -= np.square(shifted, out=shifted)
+    np.clip(var, 0, None, out=var)
+    return np.sqrt(var, out=var)
+
+
+def _bollinger(arr, window, num_std, gaps, mid=None):
+    """%B 계산: 0.5 + (가격 - 중심선) / (2 * num_std * 표준편차)"""
+    if mid is None:
+        mid = _rolling_means(arr, (window,), gaps)[0]
+    std = _rolling_std(arr, window, gaps, mid)
+    std *= 2.0 * num_std
+    flat = std == 0
+    pos = np.subtract(arr, mid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pos /= std
+    pos += 0.5
+    pos[flat] = 0.5
+    return pos
+
+
+def _volatility(filled, gaps, window, annualize):
+    """로그수익률 이동 표본표준편차 — 결측 구간은 직전 유효 가격 대비 수익률 (결측일 당일은 NaN)"""
+    out = np.empty(filled.shape)
+    out[:, 0] = np.nan
+    if filled.shape[1] <= window:
+        out.fill(np.nan)
+        return out
+    log_price = np.log(filled)
+    log_ret = np.diff(log_price, axis=1)
+    if gaps is None:
+        # 윈도우 수익률 합 = 양 끝 로그가격 차이
+        mean = np.empty(log_ret.shape)
+        mean[:, : window - 1] = np.nan
+        np.subtract(log_price[:, window:], log_price[:, :-window], out=mean[:, window - 1:])
+        mean /= window
+        (var,) = _rolling_means(np.square(log_ret, out=log_ret), (window,), None)
+    else:
+        # 수익률 결측: 가격 결측일과 첫 유효 가격일까지 (첫 수익률은 첫 유효일 다음 날)
+        missing, first, (hole_rows, hole_days) = gaps
+        ret_missing = missing[:, 1:].copy()
+        ret_missing[np.arange(log_ret.shape[1]) < first[:, np.newaxis]] = True
+        log_ret[ret_missing] = np.nan
+        ret_gaps = (ret_missing, np.minimum(first, log_ret.shape[1]), (hole_rows, hole_days - 1))
+        mean, = _rolling_means(log_ret, (window,), ret_gaps)
+        var, = _rolling_means(np.square(log_ret, out=log_ret), (window,), ret_gaps)
+    var -= np.square(mean, out=mean)
+    np.clip(var, 0, None, out=var)
+    var *= window / max(window - 1, 1)
+    if annualize:
+        var *= TRADING_DAYS
+    np.sqrt(var, out=out[:, 1:])
+    return out
+
+
+def _rsi(filled, gaps, window):
+    """Wilder RSI 본체: 100 * 평균상승 / (평균상승 + 평균하락) — filled·gaps: _prepare 결과"""
+    out = np.full(filled.shape, np.nan)
+    if filled.shape[1] <= window:
+        return out
+
+    # 결측일은 직전 유효 가격으로 채워 변화량 0 (다음 유효일 변화량은 직전 유효 가격 대비)
+    change = np.diff(filled, axis=1)
+    gains = np.maximum(change, 0.0)
+    losses = np.subtract(gains, change, out=change)
+
+    alpha = 1.0 / window
+    gain_seed, start = _window_seed(gains, window)
+    loss_seed, _ = _window_seed(losses, window)
+    avg_gain = _recursive_mean(gains, alpha, start, gain_seed)
+    avg_loss = _recursive_mean(losses, alpha, start, loss_seed)
+
+    total = np.add(avg_gain, avg_loss, out=avg_loss)
+    rsi = out[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(avg_gain, total, out=rsi)
+    rsi *= 100.0
+    # 손실이 없으면 100 (위 식으로 자동 처리), 변화가 전혀 없으면 중립 50
+    rsi[total == 0] = 50.0
+    out[:, :window] = np.nan
+    if gaps is not None:
+        out[gaps[0]] = np.nan
+    return out
+
+
+def sma(prices, window):
+    """단순이동평균 (SMA)"""
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_rolling_mean(arr, window), squeeze)
+
+
+def ema(prices, window):
+    """지수이동평균 (EMA, 첫 window일 SMA로 초기화)"""
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_ema(*_prepare(arr), window), squeeze)
+
+
+def rsi_wilder(prices, window=14):
+    """Wilder 방식 RSI (0-100)
+
+    첫 window개 변화량의 단순평균으로 초기화한 뒤 1/window 평활을 적용합니다.
+    """
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_rsi(*_prepare(arr), window), squeeze)
+
+
+def ma_momentum(prices, window):
+    """이동평균 대비 괴리율 (%) — Trade Planner의 20일/60일선 모멘텀"""
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_momentum(arr, _rolling_mean(arr, window)), squeeze)
+
+
+def rolling_std(prices, window):
+    """이동표준편차 (모표준편차, 워밍업 구간 NaN)"""
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_rolling_std(arr, window, _gaps(np.isnan(arr))), squeeze)
+
+
+def bollinger_position(prices, window=20, num_std=2.0):
+    """볼린저밴드 내 위치 (%B: 하단 0, 상단 1)"""
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_bollinger(arr, window, num_std, _gaps(np.isnan(arr))), squeeze)
+
+
+def rolling_volatility(prices, window=20, annualize=True):
+    """로그수익률 이동 변동성 (연율화 옵션)"""
+    arr, squeeze = _as_float_2d(prices)
+    return _restore(_volatility(*_prepare(arr), window, annualize), squeeze)
+
+
+def _indicator_block(arr):
+    """compute_indicators의 행 블록 단위 계산 (결측 확인·채우기와 가격 누적합은 한 번만)"""
+    filled, gaps = _prepare(arr)
+    sma20, sma60 = _rolling_means(arr, (20, 60), gaps)
+    return {
+        "rsi": _rsi(filled, gaps, 14),
+        "sma20": sma20,
+        "sma60": sma60,
+        "ema20": _ema(filled, gaps, 20),
+        "ema60": _ema(filled, gaps, 60),
+        "ma20_momentum": _momentum(arr, sma20),
+        "ma60_momentum": _momentum(arr, sma60),
+        "bollinger_position": _bollinger(arr, 20, 2.0, gaps, sma20),
+        "volatility": _volatility(filled, gaps, 20, True),
+    }
+
+
+def compute_indicators(prices):
+    """가격 행렬에서 앱이 사용하는 지표 전체(RSI14, 20/60일선)를 한 번에 계산
+
+    20일 이동평균은 모멘텀·볼린저밴드 계산에 재사용하고, 중간 배열이
+    CPU 캐시에 머물도록 종목 축을 _ROW_BLOCK 단위로 나누어 처리합니다.
+    결측이 있는 종목은 뒤쪽 블록으로 모아 결측 없는 블록이 빠른 경로를 타게 합니다.
+    """
+    arr, squeeze = _as_float_2d(prices)
+    gappy = np.isnan(arr).any(axis=1)
+    order = np.argsort(gappy, kind="stable") if gappy.any() and not gappy.all() else None
+    result = {}
+    for lo in range(0, arr.shape[0], _ROW_BLOCK):
+        rows = slice(lo, lo + _ROW_BLOCK) if order is None else order[lo:lo + _ROW_BLOCK]
+        block = _indicator_block(arr[rows])
+        if not result:
+            result = {k: np.empty(arr.shape) for k in block}
+        for key, values in block.items():
+            result[key][rows] = values
+    return {k: _restore(v, squeeze) for k, v in result.items()}
@@ -0,0 +1,227 @@
+"""
+AIA 2.0 — 화면·핫패스 계측
+탭 함수와 무거운 도우미(차트 생성, DataFrame 구성, 계획 생성)의 실행 시간·할당 기록
+
+    from instrumentation import instrumented, timed
+
+    @instrumented("plan.final_portfolio")
+    def generate_final_portfolio(inputs): ...
+
+    with timed("tab.trade_planner"):
+        tab_trade_planner()
+
+이름별 누적 통계(호출 수, 총/최근/최대 시간, 순할당 블록)는 프로세스 공용이고,
+이번 실행(재실행 한 번)의 구간 목록은 스레드별로 따로 모읍니다 — 스트림릿은 세션마다
+스크립트를 별도 스레드에서 실행하므로 세션끼리 섞이지 않습니다.
+할당은 sys.getallocatedblocks() 차이(구간 동안 늘어난 파이썬 객체 블록 수)이며,
+tracemalloc이 켜져 있으면(PYTHONTRACEMALLOC=1 등) 바이트 단위 증가량도 함께 기록합니다.
+스트림릿을 가져오지 않으므로 planning 패키지·배치 실행에서도 같은 계측을 씁니다.
+
+session_footprint()는 세션 상태 키별 메모리 점유(참조를 따라간 객체 크기 합)를 추정합니다.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+from contextlib import contextmanager
+
+# 이번 실행 구간 목록 최대 길이 (종목이 많아도 진단 패널이 과도하게 커지지 않도록)
+MAX_SPANS = 500
+
+
+class Stat:
+    """이름별 누적 통계"""
+
+    __slots__ = ("calls", "total", "last", "max", "blocks", "bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+        self.blocks = 0
+        self.bytes = 0
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1e3,
+            "mean_ms": self.total / self.calls * 1e3 if self.calls else 0.0,
+            "last_ms": self.last * 1e3,
+            "max_ms": self.max * 1e3,
+            "blocks": self.blocks,
+            "bytes": self.bytes,
+        }
+
+
+class Recorder:
+    """스레드 안전 계측 레지스트리 (이름별 누적 + 스레드별 이번 실행 구간)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {}
+        self.runs = 0
+        self.started = time.time()
+
+    def _spans(self):
+        spans = getattr(self._local, "spans", None)
+        if spans is None:
+            spans = self._local.spans = []
+            self._local.depth = 0
+        return spans
+
+    def begin_run(self):
+        """스크립트 실행(재실행) 시작 — 이번 실행 구간 목록 초기화, 실행 횟수 증가"""
+        self._local.spans = []
+        self._local.depth = 0
+        with self._lock:
+            self.runs += 1
+            return self.runs
+
+    def record(self, name, seconds, blocks=0, nbytes=0, depth=0):
+        """구간 하나 기록"""
+        spans = self._spans()
+        if len(spans) < MAX_SPANS:
+            spans.append({"name": name, "ms": seconds * 1e3, "blocks": blocks, "bytes": nbytes, "depth": depth})
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = Stat()
+            stat.calls += 1
+            stat.total += seconds
+            stat.last = seconds
+            stat.max = max(stat.max, seconds)
+            stat.blocks += blocks
+            stat.bytes += nbytes
+
+    @contextmanager
+    def timed(self, name):
+        """with 블록 실행 시간·순할당 기록 (중첩 가능, 바깥 구간은 안쪽 구간 포함)"""
+        self._spans()
+        depth = self._local.depth
+        self._local.depth = depth + 1
+        tracing = tracemalloc.is_tracing()
+        bytes0 = tracemalloc.get_traced_memory()[0] if tracing else 0
+        blocks0 = sys.getallocatedblocks()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            blocks = sys.getallocatedblocks() - blocks0
+            nbytes = tracemalloc.get_traced_memory()[0] - bytes0 if tracing else 0
+            self._local.depth = depth
+            self.record(name, seconds, blocks, nbytes, depth)
+
+    def instrumented(self, name=None):
+        """함수 호출마다 timed() 적용하는 데코레이터 (이름 미지정 시 모듈.함수)"""
+        def decorate(func):
+            label = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def last_run(self):
+        """이번 스레드의 마지막 실행 구간 목록 (기록 순서 = 구간 종료 순서)"""
+        return list(self._spans())
+
+    def snapshot(self):
+        """기계 판독용 지표 dict (누적 통계는 총 시간 내림차순)"""
+        with self._lock:
+            stats = {name: stat.to_dict() for name, stat in self.stats.items()}
+            runs = self.runs
+        return {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "uptime_s": time.time() - self.started,
+            "pid": os.getpid(),
+            "runs": runs,
+            "tracemalloc": tracemalloc.is_tracing(),
+            "stats": dict(sorted(stats.items(), key=lambda kv: -kv[1]["total_ms"])),
+            "last_run": self.last_run(),
+        }
+
+    def dump(self, path):
+        """지표를 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def reset(self):
+        """누적 통계·실행 횟수 초기화"""
+        with self._lock:
+            self.stats.clear()
+            self.runs = 0
+            self.started = time.time()
+        self._local.spans = []
+        self._local.depth = 0
+
+
+def deep_sizeof(obj, seen=None):
+    """obj와 obj가 참조하는 컨테이너·레코드·배열의 sys.getsizeof 합 (같은 객체는 한 번만)
+
+    클래스·모듈·함수는 세지 않습니다. numpy 배열은 nbytes가 getsizeof에 포함되며,
+    pandas 객체는 memory_usage(deep=True) 기준입니다.
+    """
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        x = stack.pop()
+        if id(x) in seen or isinstance(x, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+            continue
+        seen.add(id(x))
+        memory_usage = getattr(x, "memory_usage", None)
+        if callable(memory_usage) and hasattr(x, "dtypes"):
+            usage = memory_usage(deep=True)
+            total += int(getattr(usage, "sum", lambda: usage)())
+            continue
+        total += sys.getsizeof(x)
+        if isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            stack.extend(x)
+        else:
+            if hasattr(x, "__dict__"):
+                stack.append(x.__dict__)
+            for klass in type(x).__mro__:
+                slots = klass.__dict__.get("__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot not in ("__dict__", "__weakref__") and hasattr(x, slot):
+                        stack.append(getattr(x, slot))
+    return total
+
+
+def session_footprint(state, skip=()):
+    """세션 상태 키별 추정 점유 바이트 (큰 순서, 키끼리 공유하는 객체는 먼저 센 키에 포함)"""
+    seen = set()
+    sizes = {key: deep_sizeof(state[key], seen) for key in list(state.keys()) if key not in skip}
+    return dict(sorted(sizes.items(), key=lambda kv: -kv[1]))
+
+
+# 프로세스 공용 레지스트리
+recorder = Recorder()
+timed = recorder.timed
+instrumented = recorder.instrumented
+begin_run = recorder.begin_run
+snapshot = recorder.snapshot
+
+
+def dump_metrics(path=None):
+    """AIA_METRICS_PATH(또는 path)가 지정되어 있으면 지표를 JSON으로 저장하고 경로 반환"""
+    path = path or os.environ.get("AIA_METRICS_PATH")
+    return recorder.dump(path) if path else None
@@ -0,0 +1,333 @@
+"""
+AIA 2.0 — 실시간 증분 지표
+틱마다 전체 이력을 다시 계산하지 않고 상태만 갱신하는 RSI / 이동평균 / 볼린저 지표
+
+- on_close(price): 일봉 종가 확정 — 상태를 O(1)로 갱신
+- on_tick(price): 장중 현재가 — 상태는 그대로 두고 "지금 가격으로 마감한다면"의 값을 O(1)로 계산
+
+종가를 차례로 on_close에 넣은 뒤의 값은 indicators 모듈(rsi_wilder, sma, bollinger_position)의
+마지막 값과 같습니다. 지표 객체는 __slots__로 상태만 보관하며 state()/from_state()로
+체크포인트를 만들고 복원할 수 있습니다.
+"""
+
+import json
+import math
+
+from signals import calculate_momentum_rsi_signal
+
+NAN = float("nan")
+
+
+class IncrementalRSI:
+    """Wilder RSI — 첫 window개 변화량 단순평균으로 초기화 후 1/window 평활"""
+
+    __slots__ = ("window", "prev", "count", "avg_gain", "avg_loss")
+
+    def __init__(self, window=14):
+        self.window = window
+        self.prev = None
+        self.count = 0          # 누적 변화량 개수 (워밍업 중에는 합계를 보관)
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def _step(self, price):
+        """price를 다음 종가로 반영한 (평균상승, 평균하락, 변화량 개수)"""
+        change = price - self.prev
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        count = self.count + 1
+        window = self.window
+        if count < window:
+            return self.avg_gain + gain, self.avg_loss + loss, count
+        if count == window:
+            return (self.avg_gain + gain) / window, (self.avg_loss + loss) / window, count
+        return (
+            self.avg_gain + (gain - self.avg_gain) / window,
+            self.avg_loss + (loss - self.avg_loss) / window,
+            count,
+        )
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        total = avg_gain + avg_loss
+        return 50.0 if total == 0 else 100.0 * avg_gain / total
+
+    def on_close(self, price):
+        """종가 확정 후 RSI (워밍업 중 NaN)"""
+        if self.prev is not None:
+            self.avg_gain, self.avg_loss, self.count = self._step(price)
+        self.prev = price
+        return self.value
+
+    def on_tick(self, price):
+        """현재가로 마감할 경우의 RSI (상태 변경 없음)"""
+        if self.prev is None:
+            return NAN
+        avg_gain, avg_loss, count = self._step(price)
+        return self._rsi(avg_gain, avg_loss) if count >= self.window else NAN
+
+    @property
+    def value(self):
+        return self._rsi(self.avg_gain, self.avg_loss) if self.count >= self.window else NAN
+
+    def state(self):
+        return (self.window, self.prev, self.count, self.avg_gain, self.avg_loss)
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls.__new__(cls)
+        obj.window, obj.prev, obj.count, obj.avg_gain, obj.avg_loss = state
+        return obj
+
+
+class IncrementalSMA:
+    """링 버퍼 이동평균 — 버퍼가 한 바퀴 돌 때마다 합계를 다시 구해 누적 오차 제거"""
+
+    __slots__ = ("window", "buffer", "pos", "count", "total")
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.pos = 0            # 다음에 덮어쓸 위치 (= 가장 오래된 값)
+        self.count = 0
+        self.total = 0.0
+
+    def on_close(self, price):
+        """종가 확정 후 이동평균 (워밍업 중 NaN)"""
+        if self.count == self.window:
+            self.total -= self.buffer[self.pos]
+        else:
+            self.count += 1
+        self.buffer[self.pos] = price
+        self.total += price
+        self.pos += 1
+        if self.pos == self.window:
+            self.pos = 0
+            self.total = math.fsum(self.buffer)
+        return self.value
+
+    def on_tick(self, price):
+        """현재가로 마감할 경우의 이동평균 (상태 변경 없음)"""
+        window = self.window
+        if self.count == window:
+            return (self.total - self.buffer[self.pos] + price) / window
+        if self.count == window - 1:
+            return (self.total + price) / window
+        return NAN
+
+    @property
+    def value(self):
+        return self.total / self.window if self.count == self.window else NAN
+
+    def state(self):
+        return (self.window, list(self.buffer), self.pos, self.count, self.total)
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls.__new__(cls)
+        obj.window, buffer, obj.pos, obj.count, obj.total = state
+        obj.buffer = list(buffer)
+        return obj
+
+
+class IncrementalBollinger:
+    """볼린저밴드 위치 (%B) — 첫 종가 기준으로 중심화한 합·제곱합을 링 버퍼로 유지"""
+
+    __slots__ = ("window", "num_std", "base", "buffer", "pos", "count", "total", "total_sq")
+
+    def __init__(self, window=20, num_std=2.0):
+        self.window = window
+        self.num_std = num_std
+        self.base = None
+        self.buffer = [0.0] * window
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def _position(self, price, total, total_sq):
+        window = self.window
+        mean = total / window
+        var = total_sq / window - mean * mean
+        std = math.sqrt(var) if var > 0 else 0.0
+        if std == 0:
+            return 0.5
+        return 0.5 + (price - self.base - mean) / (2.0 * self.num_std * std)
+
+    def on_close(self, price):
+        """종가 확정 후 %B (워밍업 중 NaN)"""
+        if self.base is None:
+            self.base = price
+        x = price - self.base
+        if self.count == self.window:
+            old = self.buffer[self.pos]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        self.buffer[self.pos] = x
+        self.total += x
+        self.total_sq += x * x
+        self.pos += 1
+        if self.pos == self.window:
+            self.pos = 0
+            self.total = math.fsum(self.buffer)
+            self.total_sq = math.fsum(v * v for v in self.buffer)
+        return self.value
+
+    def on_tick(self, price):
+        """현재가로 마감할 경우의 %B (상태 변경 없음)"""
+        window = self.window
+        base = price if self.base is None else self.base
+        x = price - base
+        if self.count == window:
+            old = self.buffer[self.pos]
+            total, total_sq = self.total - old + x, self.total_sq - old * old + x * x
+        elif self.count == window - 1:
+            total, total_sq = self.total + x, self.total_sq + x * x
+        else:
+            return NAN
+        if self.base is None:
+            return 0.5
+        return self._position(price, total, total_sq)
+
+    @property
+    def value(self):
+        if self.count < self.window:
+            return NAN
+        last = self.buffer[self.pos - 1] + self.base
+        return self._position(last, self.total, self.total_sq)
+
+    def state(self):
+        return (self.window, self.num_std, self.base, list(self.buffer), self.pos,
+                self.count, self.total, self.total_sq)
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls.__new__(cls)
+        (obj.window, obj.num_std, obj.base, buffer, obj.pos,
+         obj.count, obj.total, obj.total_sq) = state
+        obj.buffer = list(buffer)
+        return obj
+
+
+def _momentum(price, ma):
+    """이동평균 대비 괴리율 (%)"""
+    return (price - ma) / ma * 100.0 if ma == ma and ma != 0 else NAN
+
+
+class TickerIndicators:
+    """종목 하나의 실시간 지표 묶음 (RSI14, 20/60일선, 볼린저 %B)"""
+
+    __slots__ = ("rsi", "sma20", "sma60", "bollinger", "last")
+
+    def __init__(self):
+        self.rsi = IncrementalRSI(14)
+        self.sma20 = IncrementalSMA(20)
+        self.sma60 = IncrementalSMA(60)
+        self.bollinger = IncrementalBollinger(20, 2.0)
+        self.last = NAN
+
+    @classmethod
+    def from_history(cls, closes):
+        """과거 종가로 초기화"""
+        obj = cls()
+        for price in closes:
+            obj.on_close(float(price))
+        return obj
+
+    def on_close(self, price):
+        """종가 확정"""
+        self.rsi.on_close(price)
+        self.sma20.on_close(price)
+        self.sma60.on_close(price)
+        self.bollinger.on_close(price)
+        self.last = price
+
+    def on_tick(self, price):
+        """현재가 기준 (rsi, ma20_momentum, ma60_momentum, bollinger_position)"""
+        return (
+            self.rsi.on_tick(price),
+            _momentum(price, self.sma20.on_tick(price)),
+            _momentum(price, self.sma60.on_tick(price)),
+            self.bollinger.on_tick(price),
+        )
+
+    def signal(self, price):
+        """현재가 기준 calculate_momentum_rsi_signal 점수 (RSI 워밍업 중이면 None)"""
+        rsi, ma20, ma60, _ = self.on_tick(price)
+        if rsi != rsi:
+            return None
+        return calculate_momentum_rsi_signal(rsi, ma20 if ma20 == ma20 else 0.0, ma60 if ma60 == ma60 else 0.0)
+
+    def state(self):
+        return {
+            "rsi": self.rsi.state(),
+            "sma20": self.sma20.state(),
+            "sma60": self.sma60.state(),
+            "bollinger": self.bollinger.state(),
+            "last": self.last,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        obj = cls.__new__(cls)
+        obj.rsi = IncrementalRSI.from_state(state["rsi"])
+        obj.sma20 = IncrementalSMA.from_state(state["sma20"])
+        obj.sma60 = IncrementalSMA.from_state(state["sma60"])
+        obj.bollinger = IncrementalBollinger.from_state(state["bollinger"])
+        obj.last = state["last"]
+        return obj
+
+
+class IndicatorBook:
+    """여러 종목의 실시간 지표 (종목코드 → TickerIndicators)"""
+
+    def __init__(self):
+        self.tickers = {}
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __getitem__(self, ticker):
+        return self.tickers[ticker]
+
+    def seed(self, ticker, closes):
+        """과거 종가로 종목 지표 초기화"""
+        self.tickers[ticker] = TickerIndicators.from_history(closes)
+
+    def on_close(self, ticker, price):
+        """종목 종가 확정 (처음 보는 종목은 새로 등록)"""
+        indicators = self.tickers.get(ticker)
+        if indicators is None:
+            indicators = self.tickers[ticker] = TickerIndicators()
+        indicators.on_close(price)
+
+    def on_tick(self, ticker, price):
+        """종목 현재가 기준 신호 점수 (등록되지 않았거나 워밍업 중이면 None)"""
+        indicators = self.tickers.get(ticker)
+        return None if indicators is None else indicators.signal(price)
+
+    def on_ticks(self, ticks):
+        """(종목코드, 현재가) 목록을 순서대로 처리해 종목별 최신 신호 점수 반환"""
+        tickers = self.tickers
+        scores = {}
+        for ticker, price in ticks:
+            indicators = tickers.get(ticker)
+            if indicators is not None:
+                scores[ticker] = indicators.signal(price)
+        return scores
+
+    def checkpoint(self, path):
+        """전체 상태를 JSON 파일로 저장 (float는 repr 그대로 저장되어 복원 시 동일)"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({t: ind.state() for t, ind in self.tickers.items()}, f, ensure_ascii=False)
+
+    @classmethod
+    def restore(cls, path):
+        """checkpoint 파일에서 복원"""
+        with open(path, encoding="utf-8") as f:
+            states = json.load(f)
+        book = cls()
+        book.tickers = {t: TickerIndicators.from_state(s) for t, s in states.items()}
+        return book
@@ -0,0 +1,142 @@
+"""
+AIA 2.0 — 포트폴리오 몬테카를로 시뮬레이터
+최종 자산배분을 투자 기간 동안 여러 경로로 시뮬레이션해 자산 분포를 추정합니다.
+
+- 자산군 수익률: 공분산의 촐레스키 분해로 상관관계를 반영한 로그정규 수익률
+- 매 기간 목표 비중으로 리밸런싱, 선택적으로 정기 적립금 추가
+- 결과: 연도별 백분위 밴드, 원금 손실 확률, 만기 자산(원)
+
+경로는 batch_size 단위 배치로 나눠 계산하며 배치마다 독립 난수열(SeedSequence.spawn)을
+쓰므로 작업자 수와 관계없이 같은 seed는 같은 결과를 냅니다. workers가 2 이상이면
+프로세스 풀의 각 작업자가 공유 메모리 결과 버퍼에 자기 배치 행을 직접 기록하고,
+on_batch 콜백에는 배치가 끝날 때마다 지금까지의 부분 요약을 전달합니다.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_PATHS = 100_000
+DEFAULT_BATCH = 10_000
+STEPS_PER_YEAR = 12   # 월 단위 시뮬레이션, 결과는 연 단위로 기록
+
+
+def _simulate_batch(weights, log_drift, chol, initial, contribution, n_steps, record_every, n_paths, seed):
+    """배치 하나의 경로별 자산 (n_paths × 기록 시점) 계산"""
+    rng = np.random.default_rng(seed)
+    wealth = np.full(n_paths, float(initial))
+    records = np.empty((n_paths, n_steps // record_every + 1))
+    records[:, 0] = wealth
+    for step in range(1, n_steps + 1):
+        shocks = rng.standard_normal((n_paths, len(weights))) @ chol.T
+        growth = np.exp(log_drift + shocks) @ weights
+        wealth *= growth
+        wealth += contribution
+        if step % record_every == 0:
+            records[:, step // record_every] = wealth
+    return records
+
+
+def _batch_into_shared(buffer_name, shape, row_start, args):
+    """작업자 프로세스: 배치 결과를 공유 메모리 버퍼의 해당 행에 기록"""
+    block = shared_memory.SharedMemory(name=buffer_name)
+    try:
+        records = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        try:
+            batch = _simulate_batch(*args)
+            records[row_start:row_start + len(batch)] = batch
+            return row_start, len(batch)
+        finally:
+            del records   # 예외가 나도 닫기 전에 버퍼 뷰 해제 (남아 있으면 close가 BufferError)
+    finally:
+        block.close()
+
+
+def _summarize(done, invested, paths_total):
+    """완료된 경로들로 백분위 밴드·손실 확률·만기 자산 요약"""
+    bands = np.percentile(done, PERCENTILES, axis=0)
+    terminal = done[:, -1]
+    return {
+        "years": np.arange(done.shape[1]),
+        "bands": {p: bands[i] for i, p in enumerate(PERCENTILES)},
+        "invested": invested,
+        "prob_loss": float((terminal < invested[-1]).mean()),
+        "terminal_mean": float(terminal.mean()),
+        "terminal_median": float(np.median(terminal)),
+        "terminal_p5": float(bands[0, -1]),
+        "terminal_p95": float(bands[-1, -1]),
+        "paths_done": len(done),
+        "paths_total": paths_total,
+    }
+
+
+def simulate_portfolio(weights, expected_returns, covariance, initial, years,
+                       contribution=0.0, n_paths=DEFAULT_PATHS, batch_size=DEFAULT_BATCH,
+                       seed=None, workers=None, on_batch=None):
+    """최종 자산배분 몬테카를로 시뮬레이션
+
+    weights: 자산군 비중(합계 1), expected_returns: 연 기대수익률(산술), covariance: 연율화 공분산
+    initial: 초기 투자금(원), contribution: 월 적립금(원), years: 투자 기간(년)
+    on_batch(summary): 배치가 끝날 때마다 부분 요약을 받는 콜백 (스트리밍 표시용)
+    반환값: years, bands{백분위: 연도별 자산}, invested(누적 원금), prob_loss, terminal_*
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    expected_returns = np.asarray(expected_returns, dtype=np.float64)
+    covariance = np.asarray(covariance, dtype=np.float64)
+    years = int(years)
+    if years < 1:
+        raise ValueError("투자 기간은 1년 이상이어야 합니다")
+
+    n_steps = years * STEPS_PER_YEAR
+    variance = np.diag(covariance)
+    # 산술 기대수익률 μ를 갖는 로그정규 수익률의 기간당 로그 드리프트
+    log_drift = (np.log1p(expected_returns) - 0.5 * variance) / STEPS_PER_YEAR
+    chol = np.linalg.cholesky(covariance / STEPS_PER_YEAR + 1e-12 * np.eye(len(weights)))
+    invested = initial + contribution * STEPS_PER_YEAR * np.arange(years + 1)
+
+    starts = list(range(0, n_paths, batch_size))
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    batch_args = [
+        (weights, log_drift, chol, initial, contribution, n_steps, STEPS_PER_YEAR,
+         min(batch_size, n_paths - start), batch_seed)
+        for start, batch_seed in zip(starts, seeds)
+    ]
+    shape = (n_paths, years + 1)
+    workers = min(workers or 1, os.cpu_count() or 1, len(starts))
+
+    if workers <= 1:
+        records = np.empty(shape)
+        for start, args in zip(starts, batch_args):
+            batch = _simulate_batch(*args)
+            records[start:start + len(batch)] = batch
+            if on_batch is not None:
+                on_batch(_summarize(records[:start + len(batch)], invested, n_paths))
+        return _summarize(records, invested, n_paths)
+
+    block = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        records = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        try:
+            finished = np.zeros(n_paths, dtype=bool)   # 배치가 끝나는 순서대로 완료 행 표시
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_batch_into_shared, block.name, shape, start, args)
+                    for start, args in zip(starts, batch_args)
+                ]
+                for future in as_completed(futures):
+                    row_start, count = future.result()
+                    finished[row_start:row_start + count] = True
+                    if on_batch is not None:
+                        on_batch(_summarize(records[finished], invested, n_paths))
+            return _summarize(records.copy(), invested, n_paths)
+        finally:
+            del records   # 작업자·콜백 예외에도 공유 메모리 해제 전에 버퍼 뷰 제거
+    finally:
+        try:
+            block.close()
+        finally:
+            block.unlink()
@@ -0,0 +1,247 @@
+"""
+AIA 2.0 — 자산군 평균-분산 최적화
+채권/주식/현금/금 비중을 공분산 행렬과 기대수익률 벡터로 계산합니다.
+
+- 최소분산 (min_variance), 최대 샤프 (max_sharpe), 목표 변동성 (target_risk)
+- 제약: 비중 합계 100%, 자산별 최소/최대 비중
+
+자산군이 4개뿐이므로 각 자산이 하한/상한/자유 중 어디에 걸리는지(3^n 경우)를
+모두 나열해 KKT 방정식을 미리 풀어 둡니다. 각 경우의 해는 위험회피 계수 λ에
+대해 w = a + λ·b 형태의 직선이므로, λ를 바꿔 가며 탐색할 때는 행렬 곱 한 번으로
+모든 후보를 평가하고 제약을 만족하는 후보 중 목적함수 최솟값을 고릅니다.
+공분산은 대각 행렬 방향으로 축소 추정하며 세션 공용 캐시에 기준봉 단위로 보관합니다.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from indicators import TRADING_DAYS
+from price_matrix import close_series
+from shared_cache import cached_dataset, current_asof
+
+ASSET_CLASSES = ("채권", "주식", "현금", "금")
+
+# 자산군 대표 지수 — (티커, 기준가, 연 변동성, 연 추세) — 데모 피드 생성 파라미터
+ASSET_PROXIES = {
+    "채권": ("KTB_INDEX", 100.0, 0.05, 0.035),
+    "주식": ("KOSPI", 2400.0, None, 0.0),       # 차트용 KOSPI 시계열 재사용 (피드 기본값)
+    "현금": ("CASH_INDEX", 100.0, 0.005, 0.03),
+    "금": ("GOLD_KRW", 100.0, 0.15, 0.04),
+}
+
+# 자본시장 가정 (연 기대수익률) — 표본 평균 대신 고정 가정치 사용
+EXPECTED_RETURNS = {"채권": 0.04, "주식": 0.09, "현금": 0.03, "금": 0.05}
+
+COVARIANCE_LOOKBACK_YEARS = 3
+
+_RISK_AVERSION_RANGE = (1e-4, 1e3)   # λ 탐색 범위 (로그 스케일)
+_FEASIBILITY_TOL = 1e-9
+
+
+def estimate_covariance(returns, periods_per_year=TRADING_DAYS):
+    """축소 추정 공분산 (Schäfer-Strimmer 방식 — 상관계수를 0 방향으로 축소)
+
+    returns: (일자 × 자산) 수익률 배열. 반환값: (연율화 공분산, 축소 강도 0~1)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[~np.isnan(returns).any(axis=1)]
+    n_obs, n_assets = returns.shape
+    if n_obs < 3:
+        raise ValueError("공분산 추정에는 최소 3개 이상의 수익률이 필요합니다")
+
+    std = returns.std(axis=0, ddof=1)
+    z = (returns - returns.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    products = z[:, :, None] * z[:, None, :]
+    corr = products.sum(axis=0) / (n_obs - 1)
+    corr_var = n_obs / (n_obs - 1) ** 3 * ((products - products.mean(axis=0)) ** 2).sum(axis=0)
+
+    off = ~np.eye(n_assets, dtype=bool)
+    denominator = (corr[off] ** 2).sum()
+    intensity = float(np.clip(corr_var[off].sum() / denominator, 0.0, 1.0)) if denominator > 0 else 1.0
+
+    shrunk = corr * (1.0 - intensity)
+    np.fill_diagonal(shrunk, 1.0)
+    return shrunk * np.outer(std, std) * periods_per_year, intensity
+
+
+def asset_class_returns(asof, years=COVARIANCE_LOOKBACK_YEARS):
+    """자산군 대표 지수의 일간 수익률 DataFrame (열 순서는 ASSET_CLASSES, 이력이 짧으면 있는 구간만)"""
+    end = pd.Timestamp(asof)
+    start = end - pd.DateOffset(years=years)
+    series = {}
+    for asset in ASSET_CLASSES:
+        ticker, base_price, annual_vol, drift = ASSET_PROXIES[asset]
+        feed = {} if annual_vol is None else {
+            "daily_vol": annual_vol / np.sqrt(TRADING_DAYS), "annual_drift": drift,
+        }
+        series[asset] = close_series(ticker, start, end, base_price=base_price, **feed)
+    prices = pd.DataFrame(series).dropna()
+    return prices.pct_change().dropna()
+
+
+def asset_class_covariance(asof=None):
+    """자산군 공분산 (세션 공용 캐시, 기준봉마다 한 번 추정)"""
+    asof = current_asof() if asof is None else asof
+    return cached_dataset(
+        "asset_covariance",
+        lambda: estimate_covariance(asset_class_returns(asof).to_numpy()),
+        asof=asof,
+    )
+
+
+class MeanVarianceProblem:
+    """min ½·wᵀΣw − λ·μᵀw  s.t. Σw = 1, lower ≤ w ≤ upper"""
+
+    def __init__(self, covariance, expected_returns, lower, upper):
+        self.covariance = np.asarray(covariance, dtype=np.float64)
+        self.expected_returns = np.asarray(expected_returns, dtype=np.float64)
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        if self.lower.sum() > 1 + _FEASIBILITY_TOL or self.upper.sum() < 1 - _FEASIBILITY_TOL:
+            raise ValueError("비중 하한/상한으로는 합계 100%를 만들 수 없습니다")
+        if (self.lower > self.upper + _FEASIBILITY_TOL).any():
+            raise ValueError("비중 하한이 상한보다 큰 자산이 있습니다")
+        self._intercepts, self._slopes = self._enumerate_active_sets()
+
+    def _enumerate_active_sets(self):
+        """하한/상한/자유 조합별 해 w = a + λ·b 의 (a, b) 배열"""
+        n = len(self.expected_returns)
+        cov, mu = self.covariance, self.expected_returns
+        intercepts, slopes = [], []
+        for states in itertools.product((0, 1, 2), repeat=n):   # 0: 하한, 1: 상한, 2: 자유
+            states = np.array(states)
+            free = states == 2
+            fixed_value = np.where(states == 0, self.lower, self.upper)
+            a = np.where(free, 0.0, fixed_value)
+            b = np.zeros(n)
+            if free.any():
+                k = int(free.sum())
+                kkt = np.zeros((k + 1, k + 1))
+                kkt[:k, :k] = cov[np.ix_(free, free)]
+                kkt[:k, k] = 1.0
+                kkt[k, :k] = 1.0
+                rhs = np.zeros((k + 1, 2))
+                rhs[:k, 0] = -cov[np.ix_(free, ~free)] @ a[~free]
+                rhs[k, 0] = 1.0 - a[~free].sum()
+                rhs[:k, 1] = mu[free]
+                try:
+                    solution = np.linalg.solve(kkt, rhs)
+                except np.linalg.LinAlgError:
+                    continue
+                a[free] = solution[:k, 0]
+                b[free] = solution[:k, 1]
+            elif abs(a.sum() - 1.0) > _FEASIBILITY_TOL:
+                continue
+            intercepts.append(a)
+            slopes.append(b)
+        return np.array(intercepts), np.array(slopes)
+
+    def solve(self, risk_aversion):
+        """λ(수익 선호도)에 대한 최적 비중 — 0이면 최소분산"""
+        candidates = self._intercepts + risk_aversion * self._slopes
+        feasible = (
+            (candidates >= self.lower - _FEASIBILITY_TOL).all(axis=1)
+            & (candidates <= self.upper + _FEASIBILITY_TOL).all(axis=1)
+        )
+        candidates = candidates[feasible]
+        objective = (
+            0.5 * np.einsum("ij,jk,ik->i", candidates, self.covariance, candidates)
+            - risk_aversion * candidates @ self.expected_returns
+        )
+        weights = np.clip(candidates[np.argmin(objective)], self.lower, self.upper)
+        return weights / weights.sum()
+
+    def stats(self, weights, risk_free=0.0):
+        """비중의 (기대수익률, 변동성, 샤프비율)"""
+        expected = float(weights @ self.expected_returns)
+        volatility = float(np.sqrt(max(weights @ self.covariance @ weights, 0.0)))
+        sharpe = (expected - risk_free) / volatility if volatility > 0 else 0.0
+        return expected, volatility, sharpe
+
+    def min_variance(self):
+        """최소분산 비중"""
+        return self.solve(0.0)
+
+    def max_sharpe(self, risk_free=0.0, iterations=60):
+        """최대 샤프 비중 — 효율적 투자선 위에서 log λ 황금분할 탐색"""
+        low, high = np.log(_RISK_AVERSION_RANGE[0]), np.log(_RISK_AVERSION_RANGE[1])
+        ratio = (np.sqrt(5.0) - 1.0) / 2.0
+
+        def score(log_lambda):
+            return self.stats(self.solve(np.exp(log_lambda)), risk_free)[2]
+
+        left = high - ratio * (high - low)
+        right = low + ratio * (high - low)
+        left_score, right_score = score(left), score(right)
+        for _ in range(iterations):
+            if left_score < right_score:
+                low, left, left_score = left, right, right_score
+                right = low + ratio * (high - low)
+                right_score = score(right)
+            else:
+                high, right, right_score = right, left, left_score
+                left = high - ratio * (high - low)
+                left_score = score(left)
+        candidates = [self.min_variance(), self.solve(np.exp((low + high) / 2))]
+        return max(candidates, key=lambda w: self.stats(w, risk_free)[2])
+
+    def target_risk(self, volatility, iterations=60):
+        """목표 변동성 이하에서 기대수익률이 가장 높은 비중 (달성 불가 시 가장 가까운 끝점)"""
+        low, high = np.log(_RISK_AVERSION_RANGE[0]), np.log(_RISK_AVERSION_RANGE[1])
+        if self.stats(self.min_variance())[1] >= volatility:
+            return self.min_variance()
+        riskiest = self.solve(np.exp(high))
+        if self.stats(riskiest)[1] <= volatility:
+            return riskiest
+        for _ in range(iterations):
+            middle = (low + high) / 2
+            if self.stats(self.solve(np.exp(middle)))[1] > volatility:
+                high = middle
+            else:
+                low = middle
+        return self.solve(np.exp(low))
+
+
+OBJECTIVES = ("min_variance", "max_sharpe", "target_risk")
+
+
+def optimize_allocation(objective, bounds, expected_returns=None, target_volatility=None,
+                        risk_free=None, covariance=None):
+    """자산군 비중 최적화
+
+    bounds: {자산: (최소%, 최대%)}, expected_returns: {자산: 연 기대수익률} (미지정 시 기본 가정)
+    반환값: 비중(%, 소수 첫째 자리, 합계 100), 수익률, 위험도, 샤프, 최적화방식
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"지원하지 않는 최적화 방식입니다: {objective}")
+    returns = {**EXPECTED_RETURNS, **(expected_returns or {})}
+    if covariance is None:
+        covariance, _ = asset_class_covariance()
+    risk_free = returns["현금"] if risk_free is None else risk_free
+
+    problem = MeanVarianceProblem(
+        covariance,
+        [returns[a] for a in ASSET_CLASSES],
+        [bounds[a][0] / 100 for a in ASSET_CLASSES],
+        [bounds[a][1] / 100 for a in ASSET_CLASSES],
+    )
+    if objective == "min_variance":
+        weights = problem.min_variance()
+    elif objective == "max_sharpe":
+        weights = problem.max_sharpe(risk_free)
+    else:
+        weights = problem.target_risk(target_volatility)
+
+    # 소수 첫째 자리 반올림 후 오차는 가장 큰 비중에서 조정해 합계 100% 유지
+    percents = np.round(weights * 100, 1)
+    percents[np.argmax(percents)] += round(100.0 - percents.sum(), 1)
+    expected, volatility, sharpe = problem.stats(weights, risk_free)
+    return {
+        "비중": {a: round(float(p), 1) for a, p in zip(ASSET_CLASSES, percents)},
+        "수익률": expected,
+        "위험도": volatility,
+        "샤프": sharpe,
+        "최적화방식": objective,
+    }
@@ -0,0 +1,339 @@
+"""
+AIA 2.0 — 주문 수량 생성기
+자산군·종목별 목표 금액(원)을 실제 상품과 정수 주식 수로 바꾸고 주문 파일을 씁니다.
+
+    python orders.py plans.parquet -o orders.csv                 # planning.batch 결과 (고객별 DCA 일정대로 분할)
+    python orders.py clients.csv -o orders.csv --tranches 4      # 고객 명부, 영업일 간격 4회 균등 분할
+    python orders.py --synthetic 50000 -o orders.csv             # 고정 시드 가상 고객으로 처리 시간 측정
+
+고객 명부 컬럼: client_id, 채권, 주식, 현금, 금 (원), 종목 (종목명·코드 ';' 구분, 없으면 주식 ETF)
+planning.batch 결과는 {자산}_금액, 핵심종목, DCA_일정 컬럼을 읽습니다.
+
+상품 매핑
+- 채권·금·주식(선택 종목이 없을 때)은 BUCKET_INSTRUMENTS의 ETF, 현금은 예수금으로 두고 주문하지 않음
+- 주식은 선택 종목에 균등 배분 (종목 마스터에 없는 이름은 제외)
+- 기준가는 종목 마스터 현재가 (마스터에 없는 코드는 get_stock_info와 같은 고정 더미값)
+
+수량 결정 (round_lots): Σ|목표금액 − 매수금액| + CASH_WEIGHT × 잔여현금을 비용으로 보는
+탐욕적 반올림입니다. 모든 상품을 내림한 뒤, 남은 현금으로 살 수 있는 상품 중 비용을 가장 많이
+줄이는 상품에 한 단위씩 더하고 더 줄일 수 없으면 멈춥니다. 예산 제약이 있는 정수 문제의 최적해를
+보장하지는 않습니다 (먼저 고른 상품 때문에 나머지 조합이 더 나은 경우를 다시 보지 않음).
+같은 상품의 두 번째 단위는 비용을 늘리므로 반복은 상품 수 이하이며, 고객 축으로 벡터화되어
+(고객 × 상품) 배열을 한 번에 풉니다. 매매단위 비용에는 rebalancing의 매수 수수료·슬리피지를
+포함해 주문 총액이 예산을 넘지 않습니다.
+
+분할 매수는 회차 k까지의 누적 목표를 다시 풀고 직전까지 보유 수량을 하한으로 두어
+회차별 내림 오차가 쌓이지 않게 합니다 (매도 주문은 만들지 않음).
+회차별 지정가 할인율(discounts, 하락매수 사다리)이 있으면 회차마다 가격이 달라 단위 수를 누적할 수
+없으므로, 누적 목표에서 직전 회차까지의 매수금액을 뺀 나머지를 그 회차 지정가로 풉니다.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from rebalancing import cost_rates
+from security_master import load_security_master
+
+# 자산군 → 주문 상품 (코드, 이름) — 현금은 예수금으로 보유
+BUCKET_INSTRUMENTS = {
+    "채권": ("114260", "KODEX 국고채3년"),
+    "주식": ("069500", "KODEX 200"),
+    "금": ("132030", "KODEX 골드선물(H)"),
+}
+CASH_BUCKET = "현금"
+BUCKETS = ("채권", "주식", "현금", "금")
+
+# 국내 주식·ETF 매매단위 (주)
+LOT_SIZE = 1
+
+# 잔여현금 1원의 비용 (목표 대비 오차 1원 = 1) — 0.5면 목표 대비 부족분이 매매단위의 1/4을 넘을 때 한 단위 더 매수
+CASH_WEIGHT = 0.5
+
+# 주문 파일 컬럼 (체결 데스크 적재 형식)
+ORDER_COLUMNS = ("client_id", "tranche", "trade_date", "side", "symbol", "name", "asset", "quantity", "limit_price", "notional")
+
+
+def round_lots(targets, lot_costs, budget=None, held=None, cash_weight=CASH_WEIGHT):
+    """목표 금액을 정수 매매단위 수로 변환 (고객 × 상품 배열)
+
+    targets: 목표 금액, lot_costs: 매매단위당 비용 (비용 포함, 0·nan·inf는 빈 칸)
+    budget: 고객별 예산 (기본 목표 합, 작으면 목표를 비례 축소), held: 유지할 최소 단위 수
+    반환값: int64 단위 수 배열 (입력이 1차원이면 1차원)
+    """
+    single = np.ndim(targets) == 1
+    targets = np.atleast_2d(np.asarray(targets, dtype=np.float64))
+    costs = np.broadcast_to(np.atleast_2d(np.asarray(lot_costs, dtype=np.float64)), targets.shape)
+    valid = np.isfinite(costs) & (costs > 0)
+    costs = np.where(valid, costs, np.inf)           # 빈 칸은 살 수 없는 무한 비용
+    total = targets.sum(axis=1)
+    budget = total if budget is None else np.broadcast_to(np.asarray(budget, dtype=np.float64), total.shape)
+    scale = np.divide(budget, total, out=np.ones_like(total), where=total > budget)
+    targets = targets * scale[:, None]
+
+    lots = np.floor(targets / costs)
+    if held is not None:
+        lots = np.maximum(lots, np.atleast_2d(held))
+    spent = lots * np.where(valid, costs, 0.0)
+    cash = budget - spent.sum(axis=1)
+    deficit = targets - spent
+
+    # 한 단위 추가 시 목적함수 변화: |d − c| − |d| − w·c (음수면 개선) — 고객별로 가장 좋은 상품 하나씩
+    active = np.flatnonzero(cash > 0)
+    for _ in range(targets.shape[1]):
+        if not len(active):
+            break
+        c = costs[active]
+        d = deficit[active]
+        with np.errstate(invalid="ignore"):
+            gain = np.abs(d - c) - np.abs(d) - cash_weight * c
+        gain[~(c <= cash[active, None])] = np.inf
+        best = gain.argmin(axis=1)
+        improve = gain[np.arange(len(active)), best] < 0
+        rows, cols = active[improve], best[improve]
+        lots[rows, cols] += 1
+        cash[rows] -= costs[rows, cols]
+        deficit[rows, cols] -= costs[rows, cols]
+        active = rows
+    lots = lots.astype(np.int64)
+    return lots[0] if single else lots
+
+
+def tranche_lots(targets, lot_costs, fractions, cash_weight=CASH_WEIGHT, discounts=None):
+    """분할 회차별 매수 단위 수 (회차 × 고객 × 상품)
+
+    fractions: 회차별 투입 비율 (합 1로 정규화), discounts: 회차별 지정가 할인율 (기본 모두 0)
+    """
+    targets = np.atleast_2d(np.asarray(targets, dtype=np.float64))
+    fractions = np.asarray(fractions, dtype=np.float64)
+    cumulative = np.cumsum(fractions / fractions.sum())
+    cumulative[-1] = 1.0
+    if discounts is not None and len(discounts) != len(fractions):
+        raise ValueError(f"회차별 할인율 수({len(discounts)})가 투입 비율 수({len(fractions)})와 다릅니다")
+    orders = np.empty((len(cumulative),) + targets.shape, dtype=np.int64)
+    if discounts is not None:
+        lot_costs = np.asarray(lot_costs, dtype=np.float64)
+        spent = np.zeros(targets.shape)
+        for k, (share, discount) in enumerate(zip(cumulative, discounts)):
+            costs = lot_costs * (1.0 - discount)
+            orders[k] = round_lots(np.maximum(targets * share - spent, 0.0), costs, cash_weight=cash_weight)
+            spent += orders[k] * np.where(np.isfinite(costs), costs, 0.0)
+        return orders
+    held = np.zeros(targets.shape)
+    for k, share in enumerate(cumulative):
+        lots = round_lots(targets * share, lot_costs, held=held, cash_weight=cash_weight)
+        orders[k] = lots - held
+        held = lots
+    return orders
+
+
+def resolve_picks(picks, master=None):
+    """종목명·코드 목록 → 마스터에 있는 종목코드 목록 (중복 제거, 순서 유지)"""
+    master = load_security_master() if master is None else master
+    codes = []
+    for pick in picks:
+        code = master.resolve(str(pick).strip())
+        if code is not None and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def instrument_layout(codes):
+    """선택 종목코드 → 주문 칸 [(코드, 자산군, 자산군 금액 중 비율)] (현금 제외, 종목이 없으면 주식 ETF)"""
+    stocks = [(code, "주식", 1.0 / len(codes)) for code in codes] or [(BUCKET_INSTRUMENTS["주식"][0], "주식", 1.0)]
+    return [(BUCKET_INSTRUMENTS["채권"][0], "채권", 1.0)] + stocks + [(BUCKET_INSTRUMENTS["금"][0], "금", 1.0)]
+
+
+def _instrument_info(codes, master):
+    """코드 → (이름, 기준가) — 자산군 ETF 이름은 BUCKET_INSTRUMENTS 기준"""
+    names = {symbol: name for symbol, name in BUCKET_INSTRUMENTS.values()}
+    info = {}
+    for code in codes:
+        row = master.info(code)
+        info[code] = (names.get(code, row["name"]), row["price"])
+    return info
+
+
+def order_records(client_ids, dates, symbols, names, assets, prices, orders, lot_size=LOT_SIZE):
+    """회차별 단위 수 (회차 × 고객 × 칸) → 주문 파일 DataFrame (수량 0인 칸 제외)
+
+    symbols·names·assets: (고객 × 칸) 배열, prices: (고객 × 칸) 또는 회차별 (회차 × 고객 × 칸) 배열,
+    dates: 회차별 주문일
+    """
+    tranche, client, slot = np.nonzero(orders)
+    quantity = orders[tranche, client, slot] * lot_size
+    prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), orders.shape)
+    price = np.round(prices[tranche, client, slot]).astype(np.int64)   # 원 단위 호가
+    return pd.DataFrame({
+        "client_id": np.asarray(client_ids, dtype=object)[client],
+        "tranche": tranche + 1,
+        "trade_date": pd.DatetimeIndex(dates).strftime("%Y-%m-%d").to_numpy()[tranche],
+        "side": "BUY",
+        "symbol": np.asarray(symbols, dtype=object)[client, slot],
+        "name": np.asarray(names, dtype=object)[client, slot],
+        "asset": np.asarray(assets, dtype=object)[client, slot],
+        "quantity": quantity,
+        "limit_price": price,
+        "notional": quantity * price,
+    }, columns=list(ORDER_COLUMNS))
+
+
+def write_order_file(orders, path):
+    """주문 파일 저장 (CSV, 스프레드시트에서 한글이 깨지지 않도록 BOM 포함 UTF-8)"""
+    orders.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def trade_dates(dates):
+    """주문일 목록 → 영업일 (주말이면 다음 월요일)"""
+    days = np.asarray(pd.DatetimeIndex(dates).values.astype("datetime64[D]"))
+    return pd.DatetimeIndex(np.busday_offset(days, 0, roll="forward"))
+
+
+def size_client_orders(clients, fractions=(1.0,), dates=None, master=None, cash_weight=CASH_WEIGHT, discounts=None):
+    """고객 일괄 주문 — clients: client_id·자산군 금액(원)·종목 컬럼 DataFrame
+
+    discounts: 회차별 지정가 할인율 (하락매수 사다리의 하락폭, 지정가 = 기준가 × (1 − 할인율))
+
+    반환값: (주문 DataFrame, 고객별 요약 DataFrame[client_id, budget, invested, cash, deviation])
+    budget은 매수 대상 금액(현금 제외), cash는 예수금(현금 자산군) + 잔여현금,
+    deviation은 상품별 |목표 − 매수금액| 합 / budget
+    """
+    master = load_security_master() if master is None else master
+    if dates is None:
+        dates = pd.bdate_range(pd.Timestamp.now().normalize(), periods=len(fractions))
+    dates = trade_dates(dates)
+    picks = clients["종목"].fillna("").astype(str) if "종목" in clients else pd.Series("", index=clients.index)
+
+    # 같은 종목 조합은 한 번만 해석 — 칸 배치가 같은 고객끼리 행 번호를 모아 한 번에 채움
+    layouts = {}
+    members = {}
+    for i, text in enumerate(picks.tolist()):
+        if text not in layouts:
+            layouts[text] = instrument_layout(resolve_picks(text.split(";") if text else (), master))
+        members.setdefault(text, []).append(i)
+    info = _instrument_info({code for layout in layouts.values() for code, _, _ in layout}, master)
+
+    n = len(clients)
+    n_slots = max((len(layout) for layout in layouts.values()), default=0)
+    amounts = clients.reindex(columns=list(BUCKETS)).fillna(0.0).to_numpy(dtype=np.float64)
+    symbols = np.full((n, n_slots), "", dtype=object)
+    names = np.full((n, n_slots), "", dtype=object)
+    assets = np.full((n, n_slots), "", dtype=object)
+    prices = np.zeros((n, n_slots))
+    targets = np.zeros((n, n_slots))
+    buy_rate = dict(zip(BUCKETS, cost_rates(BUCKETS)[0]))
+    rates = np.zeros((n, n_slots))
+    for text, layout in layouts.items():
+        rows = np.array(members[text])
+        width = len(layout)
+        symbols[rows, :width] = [code for code, _, _ in layout]
+        names[rows, :width] = [info[code][0] for code, _, _ in layout]
+        assets[rows, :width] = [asset for _, asset, _ in layout]
+        prices[rows, :width] = [info[code][1] for code, _, _ in layout]
+        rates[rows, :width] = [buy_rate[asset] for _, asset, _ in layout]
+        columns = [BUCKETS.index(asset) for _, asset, _ in layout]
+        targets[rows, :width] = amounts[rows][:, columns] * [share for _, _, share in layout]
+
+    costs = prices * LOT_SIZE * (1.0 + rates)
+    orders = tranche_lots(targets, costs, fractions, cash_weight, discounts)
+    scale = np.ones(len(orders)) if discounts is None else 1.0 - np.asarray(discounts, dtype=np.float64)
+
+    bought = np.einsum("k,kij->ij", scale, orders) * costs
+    budget = targets.sum(axis=1)
+    invested = bought.sum(axis=1)
+    gap = np.abs(targets - bought).sum(axis=1)
+    summary = pd.DataFrame({
+        "client_id": clients["client_id"].to_numpy(),
+        "budget": budget,
+        "invested": invested,
+        "cash": amounts[:, BUCKETS.index(CASH_BUCKET)] + budget - invested,
+        "deviation": np.divide(gap, budget, out=np.zeros_like(gap), where=budget > 0),
+    })
+    limit_prices = prices if discounts is None else scale[:, None, None] * prices
+    return order_records(clients["client_id"].to_numpy(), dates, symbols, names, assets, limit_prices, orders), summary
+
+
+def _join(value):
+    if isinstance(value, str):
+        return value
+    return ";".join(value) if value is not None and len(value) else ""
+
+
+def clients_from_plans(plans):
+    """planning.batch 결과 → (고객 명부, 고객별 DCA 일정 문자열 '날짜;날짜;…')"""
+    clients = pd.DataFrame({"client_id": plans["client_id"].astype(str).to_numpy()})
+    for asset in BUCKETS:
+        clients[asset] = plans[f"{asset}_금액"].to_numpy(dtype=np.float64)
+    clients["종목"] = plans["핵심종목"].map(_join).to_numpy()
+    schedules = plans["DCA_일정"].map(lambda d: _join([str(x) for x in d]) if not isinstance(d, str) else d)
+    return clients, schedules.to_numpy()
+
+
+def size_plan_orders(plans, master=None, cash_weight=CASH_WEIGHT):
+    """planning.batch 결과의 고객별 DCA 일정대로 회차 분할 주문 — 같은 일정인 고객끼리 한 번에 계산"""
+    clients, schedules = clients_from_plans(plans)
+    group_of, unique = pd.factorize(schedules)
+    order_parts, summary_parts = [], []
+    for g, schedule in enumerate(unique):
+        dates = schedule.split(";") if schedule else [pd.Timestamp.now().normalize()]
+        group = clients.iloc[np.flatnonzero(group_of == g)]
+        orders, summary = size_client_orders(group, np.ones(len(dates)), dates, master, cash_weight)
+        order_parts.append(orders)
+        summary_parts.append(summary)
+    return pd.concat(order_parts, ignore_index=True), pd.concat(summary_parts, ignore_index=True)
+
+
+def synthetic_clients(n, seed=0, master=None):
+    """고정 시드 가상 고객 (금액 100만~10억 원, 종목 0~5개)"""
+    master = load_security_master() if master is None else master
+    rng = np.random.default_rng(seed)
+    total = 10 ** rng.uniform(6, 9, n)
+    weights = rng.dirichlet((3.0, 5.0, 1.0, 0.7), n)
+    universe = list(master.columns["name"])
+    picks = [";".join(rng.choice(universe, k, replace=False)) for k in rng.integers(0, min(5, len(universe)) + 1, n)]
+    frame = pd.DataFrame(np.floor(total[:, None] * weights), columns=list(BUCKETS))
+    frame.insert(0, "client_id", [f"C{i:06d}" for i in range(n)])
+    frame["종목"] = picks
+    return frame
+
+
+def _read_table(path):
+    return pd.read_parquet(path) if not str(path).endswith(".csv") else pd.read_csv(path, dtype={"client_id": str, "종목": str})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="고객별 주문 수량 생성·주문 파일 저장")
+    parser.add_argument("input", nargs="?", help="planning.batch 결과 또는 고객 명부 (CSV/Parquet)")
+    parser.add_argument("-o", "--output", required=True, help="주문 파일 (.csv)")
+    parser.add_argument("--synthetic", type=int, default=None, help="입력 대신 고정 시드 가상 고객 수")
+    parser.add_argument("--tranches", type=int, default=1, help="고객 명부의 균등 분할 회차 수 (영업일 간격)")
+    parser.add_argument("--start", default=None, help="고객 명부 첫 회차 주문일 (기본 오늘)")
+    args = parser.parse_args(argv)
+    if (args.input is None) == (args.synthetic is None):
+        parser.error("입력 파일 또는 --synthetic 중 하나를 지정하세요")
+
+    table = synthetic_clients(args.synthetic) if args.synthetic is not None else _read_table(args.input)
+    if "DCA_일정" not in table and not any(asset in table for asset in BUCKETS):
+        parser.error("자산군 금액 컬럼이 없습니다 — 프로필 명부는 python -m planning.batch로 먼저 계획을 만드세요")
+    t0 = time.perf_counter()
+    if "DCA_일정" in table:
+        orders, summary = size_plan_orders(table)
+    else:
+        tranches = max(1, args.tranches)
+        start = pd.Timestamp(args.start) if args.start else pd.Timestamp.now().normalize()
+        orders, summary = size_client_orders(table, np.ones(tranches), pd.bdate_range(start, periods=tranches))
+    t1 = time.perf_counter()
+    write_order_file(orders, args.output)
+    t2 = time.perf_counter()
+
+    잔여 = (summary["budget"] - summary["invested"]) / summary["budget"].where(summary["budget"] > 0)
+    print(f"고객 {len(summary):,}명 · 주문 {len(orders):,}건 · 수량 계산 {t1 - t0:.2f}s · 파일 저장 {t2 - t1:.2f}s → {args.output}")
+    print(f"잔여현금 평균 {잔여.mean():.3%} · 목표 대비 오차 중앙값 {summary['deviation'].median():.3%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
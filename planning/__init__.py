@@ -0,0 +1,86 @@
+"""
+AIA 2.0 — 헤드리스 투자 플래너
+Streamlit/Plotly 없이 동작하는 계획 로직 (포트폴리오, 트레이드 플랜, 실행 캘린더)
+
+입력은 PlanInputs(세션 상태와 같은 키)로 받고 결과는 dict/DataFrame
+(세션에 보관하는 프로필·배분·최종 포트폴리오는 records의 읽기 전용 Mapping 레코드)으로 반환하므로
+스트림릿 앱은 화면 표시만 담당하고, 배치 실행·벤치마크·작업자 프로세스에서는
+이 패키지만 가져와 같은 계획을 계산할 수 있습니다.
+
+하위 모듈은 이름을 처음 참조할 때 가져옵니다. `from planning import format_money`는
+pandas·가격 저장소·최적화기를 읽지 않으므로 화면별로 필요한 것만 적재됩니다.
+"""
+
+import importlib
+
+# 공개 이름 → 하위 모듈
+_EXPORTS = {
+    "AllocationTable": "allocation",
+    "final_allocation": "allocation",
+    "load_allocation_table": "allocation",
+    "optimize_final_allocation": "allocation",
+    "DIP_LADDER": "calendars",
+    "dca_schedule": "calendars",
+    "generate_dca_calendar": "calendars",
+    "generate_dip_buying_calendar": "calendars",
+    "generate_execution_calendar": "calendars",
+    "generate_lump_sum_calendar": "calendars",
+    "generate_technical_calendar": "calendars",
+    "format_money": "formatting",
+    "format_percent": "formatting",
+    "PlanGraph": "graph",
+    "build_plan_graph": "graph",
+    "DEFAULT_PROFILE": "inputs",
+    "PlanInputs": "inputs",
+    "SECTOR_THEMES": "market",
+    "build_sector_table": "market",
+    "build_stock_table": "market",
+    "get_pick_momentum": "market",
+    "get_pick_risk_profile": "market",
+    "get_stock_info": "market",
+    "get_strategy_backtest": "market",
+    "lookup_stock_info": "market",
+    "pick_exit_levels": "market",
+    "pick_factor_scores": "market",
+    "price_signal_summary": "market",
+    "score_picks": "market",
+    "screen_universe": "market",
+    "theme_sectors": "market",
+    "generate_order_plan": "orders",
+    "order_tranches": "orders",
+    "allocation_amounts": "portfolio",
+    "assemble_final_portfolio": "portfolio",
+    "generate_final_portfolio": "portfolio",
+    "get_dip_buying_evaluation": "portfolio",
+    "get_portfolio_simulation": "portfolio",
+    "get_rebalancing_comparison": "portfolio",
+    "recommend_allocation_by_tolerance": "portfolio",
+    "select_core_stocks": "portfolio",
+    "Allocation": "records",
+    "AssetVector": "records",
+    "Portfolio": "records",
+    "Profile": "records",
+    "decode_session": "records",
+    "encode_session": "records",
+    "generate_asset_trade_plan": "trade_plans",
+    "generate_bond_trade_plan": "trade_plans",
+    "generate_cash_trade_plan": "trade_plans",
+    "generate_default_trade_plan": "trade_plans",
+    "generate_stock_trade_plan": "trade_plans",
+    "pick_monitoring_schedule": "trade_plans",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,293 @@
+"""
+최종 자산배분 — 성향·거시 관점·배분 전략별 최적화와 사전 계산 조회표
+
+    python -m planning.allocation              # 오늘 기준봉 조회표 생성·저장 후 실시간 최적화와 비교
+    python -m planning.allocation --check      # 저장된 조회표만 검증
+
+배분 최적화는 (성향 3 × 거시 관점 3 × 배분 전략 3) 조합과 기준봉 공분산에만 의존하고
+섹터·종목 선택과는 무관합니다. 기준봉마다 27개 조합을 한 번 풀어 조회표로 저장해 두면
+프로필별 계산은 조회표 한 행 읽기 + 총자산 곱셈이 됩니다.
+None이나 목록에 없는 값은 최적화 함수의 기본 처리와 같은 조합(중립형·중립형·균형형)으로 조회합니다.
+조회표에는 배분 공식 서명(파라미터·최적화 코드 해시)을 함께 저장해, 같은 기준봉이라도
+공식이 바뀌었으면 저장된 조회표를 버리고 다시 계산합니다.
+
+AIA_ALLOCATION_TABLE 환경변수로 조회표 파일 위치를 바꿀 수 있습니다.
+"""
+
+import argparse
+import hashlib
+import inspect
+import os
+import sys
+import time
+
+import numpy as np
+
+import optimizer
+from optimizer import ASSET_CLASSES, EXPECTED_RETURNS, optimize_allocation
+from shared_cache import cached_dataset, current_asof
+
+from .records import Allocation, AssetVector
+
+TENDENCIES = ("안정형", "중립형", "공격형")
+MACRO_VIEWS = ("보수형", "중립형", "공격형")
+STRATEGIES = ("방어형", "균형형", "공격형")
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "allocation_table.npz"
+)
+
+# 적재한 조회표의 기준봉 재확인 간격 (초) — 그 사이 조회는 기준봉 계산 없이 바로 반환
+ASOF_RECHECK_SECONDS = 60.0
+
+# 배분 전략 → 최적화 목표
+STRATEGY_OBJECTIVES = {"방어형": "min_variance", "균형형": "max_sharpe", "공격형": "target_risk"}
+
+# 방어형·균형형 주식 최소 비중 (%) — 성향별, 거시 관점에 따라 MACRO_EQUITY_SHIFT만큼 이동
+# 최소분산·최대 샤프 해는 주식 하한에 붙으므로 이 하한이 성향·전략별 주식 비중 순서를 정합니다.
+STRATEGY_EQUITY_FLOOR = {
+    "방어형": {"안정형": 15, "중립형": 20, "공격형": 25},
+    "균형형": {"안정형": 25, "중립형": 35, "공격형": 45},
+}
+MACRO_EQUITY_SHIFT = {"보수형": -5, "중립형": 0, "공격형": 5}
+
+# 자산별 기본 최소/최대 비중 (%) — 성향·거시 관점에 따라 optimize_final_allocation에서 조정
+BASE_BOUNDS = {"채권": (10, 60), "주식": (20, 80), "현금": (5, 25), "금": (0, 10)}
+
+# 성향별 목표 변동성 (거시 관점에 따라 ±1%p)
+TARGET_VOLATILITY = {"안정형": 0.10, "중립형": 0.13, "공격형": 0.16}
+
+_TENDENCY_INDEX = {v: i for i, v in enumerate(TENDENCIES)}
+_MACRO_INDEX = {v: i for i, v in enumerate(MACRO_VIEWS)}
+_STRATEGY_INDEX = {v: i for i, v in enumerate(STRATEGIES)}
+
+
+def optimize_final_allocation(사용자성향, 거시선택, 자산배분선택):
+    """성향·거시 관점·배분 전략으로 자산군 비중 최적화
+
+    방어형은 최소분산, 균형형은 최대 샤프, 공격형은 목표 변동성 최적화입니다.
+    방어형·균형형은 성향·거시 관점별 주식 하한(STRATEGY_EQUITY_FLOOR)을 적용해
+    같은 성향에서 방어형 < 균형형 < 공격형, 같은 전략에서 안정형 ≤ 중립형 순으로 주식 비중이 늘어납니다.
+    반환값: optimize_allocation 결과(비중, 수익률, 위험도, 샤프, 최적화방식) + 기대수익률
+    """
+    # 자산배분 전략 → 최적화 목표
+    최적화방식 = STRATEGY_OBJECTIVES.get(자산배분선택, "max_sharpe")
+
+    # 자산별 최소/최대 비중 (%)
+    비중한도 = {자산: list(한도) for 자산, 한도 in BASE_BOUNDS.items()}
+    기대수익률 = dict(EXPECTED_RETURNS)
+    목표변동성 = TARGET_VOLATILITY.get(사용자성향, TARGET_VOLATILITY["중립형"])
+
+    # 거시 환경에 따른 조정 (주식 기대수익률·목표 변동성)
+    if 거시선택 == "보수형":
+        기대수익률["주식"] -= 0.02
+        목표변동성 -= 0.01
+    elif 거시선택 == "공격형":
+        기대수익률["주식"] += 0.02
+        목표변동성 += 0.01
+
+    # 사용자 성향에 따른 비중 한도 조정 (안정형은 주식 상한을 낮춤)
+    if 사용자성향 == "안정형" and 거시선택 != "보수형":
+        비중한도["주식"][1] = 50
+    elif 사용자성향 == "공격형" and 거시선택 != "공격형":
+        비중한도["주식"][1] = 75
+        비중한도["채권"][0] = 15
+
+    # 방어형·균형형 주식 하한 (목록에 없는 성향·거시 관점은 중립형 기준)
+    주식하한 = STRATEGY_EQUITY_FLOOR.get(자산배분선택 if 자산배분선택 in STRATEGIES else "균형형")
+    if 주식하한 is not None:
+        비중한도["주식"][0] = (
+            주식하한.get(사용자성향, 주식하한["중립형"]) + MACRO_EQUITY_SHIFT.get(거시선택, 0)
+        )
+
+    최적화결과 = optimize_allocation(
+        최적화방식, 비중한도, expected_returns=기대수익률, target_volatility=목표변동성
+    )
+    최적화결과["기대수익률"] = 기대수익률
+    return 최적화결과
+
+
+def formula_signature():
+    """배분 공식 서명 — 파라미터와 최적화 코드(optimize_final_allocation·optimizer 모듈)의 해시
+
+    값이나 코드가 바뀌면 서명이 달라져 같은 기준봉의 저장된 조회표도 다시 계산합니다.
+    자산군 공분산(종가 행렬) 변경은 포함하지 않습니다 — 행렬을 새로 만들면 조회표도 다시 만듭니다.
+    """
+    h = hashlib.sha256()
+    for part in (
+        TENDENCIES, MACRO_VIEWS, STRATEGIES, EXPECTED_RETURNS, STRATEGY_OBJECTIVES,
+        STRATEGY_EQUITY_FLOOR, MACRO_EQUITY_SHIFT, BASE_BOUNDS, TARGET_VOLATILITY,
+    ):
+        h.update(repr(part).encode())
+    h.update(inspect.getsource(optimize_final_allocation).encode())
+    h.update(inspect.getsource(optimizer).encode())
+    return h.hexdigest()[:16]
+
+
+class AllocationTable:
+    """조합별 최적화 결과 조회표 (행 = 성향 × 거시 관점 × 배분 전략, 열 = ASSET_CLASSES)
+
+    weights: 비중(%), expected: 자산별 기대수익률, returns/volatility/sharpe: 포트폴리오 통계
+    signature: 계산 당시 배분 공식 서명 (formula_signature)
+    """
+
+    def __init__(self, asof, weights, expected, returns, volatility, sharpe, methods, signature):
+        self.asof = str(asof)
+        self.signature = str(signature)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.expected = np.asarray(expected, dtype=np.float64)
+        self.returns = np.asarray(returns, dtype=np.float64)
+        self.volatility = np.asarray(volatility, dtype=np.float64)
+        self.sharpe = np.asarray(sharpe, dtype=np.float64)
+        self.methods = np.asarray(methods, dtype=str)
+        if self.weights.shape != (len(TENDENCIES) * len(MACRO_VIEWS) * len(STRATEGIES), len(ASSET_CLASSES)):
+            raise ValueError(f"조회표 크기가 맞지 않습니다: {self.weights.shape}")
+        self._rows = [None] * len(self.weights)   # 행별 Allocation (읽기 전용이라 모든 세션이 공유)
+
+    @staticmethod
+    def index(사용자성향, 거시선택, 자산배분선택):
+        """조합의 행 번호 (목록에 없는 값은 중립형·중립형·균형형)"""
+        return (
+            _TENDENCY_INDEX.get(사용자성향, 1) * len(MACRO_VIEWS) * len(STRATEGIES)
+            + _MACRO_INDEX.get(거시선택, 1) * len(STRATEGIES)
+            + _STRATEGY_INDEX.get(자산배분선택, 1)
+        )
+
+    @staticmethod
+    def combinations():
+        """행 순서대로 (성향, 거시, 배분) 조합"""
+        return [(t, m, s) for t in TENDENCIES for m in MACRO_VIEWS for s in STRATEGIES]
+
+    def lookup(self, 사용자성향, 거시선택, 자산배분선택):
+        """optimize_final_allocation과 같은 항목의 Allocation 레코드 (조회표 한 행)"""
+        i = self.index(사용자성향, 거시선택, 자산배분선택)
+        row = self._rows[i]
+        if row is None:
+            row = self._rows[i] = Allocation(
+                비중=AssetVector(ASSET_CLASSES, self.weights[i].tolist()),
+                수익률=float(self.returns[i]),
+                위험도=float(self.volatility[i]),
+                샤프=float(self.sharpe[i]),
+                최적화방식=str(self.methods[i]),
+                기대수익률=AssetVector(ASSET_CLASSES, self.expected[i].tolist()),
+            )
+        return row
+
+    @classmethod
+    def build(cls, asof=None):
+        """기준봉 공분산으로 27개 조합 최적화 (공분산은 세션 공용 캐시의 현재 기준봉 값)"""
+        결과 = [optimize_final_allocation(*key) for key in cls.combinations()]
+        return cls(
+            current_asof().date() if asof is None else asof,
+            [[r["비중"][a] for a in ASSET_CLASSES] for r in 결과],
+            [[r["기대수익률"][a] for a in ASSET_CLASSES] for r in 결과],
+            [r["수익률"] for r in 결과],
+            [r["위험도"] for r in 결과],
+            [r["샤프"] for r in 결과],
+            [r["최적화방식"] for r in 결과],
+            formula_signature(),
+        )
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp, asof=self.asof, weights=self.weights, expected=self.expected, returns=self.returns,
+            volatility=self.volatility, sharpe=self.sharpe, methods=self.methods, signature=self.signature,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            return cls(
+                f["asof"].item(), f["weights"], f["expected"], f["returns"],
+                f["volatility"], f["sharpe"], f["methods"],
+                f["signature"].item() if "signature" in f else "",   # 서명이 없는 이전 형식은 항상 불일치
+            )
+
+    def verify(self, tolerance=1e-12):
+        """실시간 최적화 결과와 비교 — 불일치 (조합, 항목) 목록 (None·기본값 조합 포함)"""
+        조합 = self.combinations() + [(t, None, None) for t in TENDENCIES] + [("기타", None, None)]
+        불일치 = []
+        for key in 조합:
+            live = optimize_final_allocation(*key)
+            table = self.lookup(*key)
+            for 항목 in ("수익률", "위험도", "샤프"):
+                if abs(live[항목] - table[항목]) > tolerance:
+                    불일치.append((key, 항목))
+            for 항목 in ("비중", "기대수익률", "최적화방식"):
+                if live[항목] != table[항목]:
+                    불일치.append((key, 항목))
+        return 불일치
+
+
+def _table_path():
+    return os.environ.get("AIA_ALLOCATION_TABLE", DEFAULT_TABLE_PATH)
+
+
+_loaded = {}   # 경로 -> (확인 시각, 조회표)
+
+
+def load_allocation_table(path=None):
+    """현재 기준봉 조회표 (프로세스당 기준봉마다 한 번 적재)
+
+    파일이 없거나 기준봉·배분 공식 서명이 다르면 새로 계산해 저장합니다.
+    """
+    path = path or _table_path()
+    checked = time.monotonic()
+    entry = _loaded.get(path)
+    if entry is not None and checked - entry[0] < ASOF_RECHECK_SECONDS:
+        return entry[1]
+    asof = current_asof()
+
+    def compute():
+        try:
+            table = AllocationTable.load(path)
+            if table.asof == str(asof.date()) and table.signature == formula_signature():
+                return table
+        except (OSError, KeyError, ValueError):
+            pass
+        table = AllocationTable.build(asof.date())
+        try:
+            table.save(path)
+        except OSError:
+            pass   # 읽기 전용 배포에서는 메모리 조회표만 사용
+        return table
+
+    table = cached_dataset("allocation_table", compute, ticker=path, asof=asof)
+    _loaded[path] = (checked, table)
+    return table
+
+
+def final_allocation(사용자성향, 거시선택, 자산배분선택):
+    """조합별 최적 배분 (조회표 상수 시간 조회, 결과는 optimize_final_allocation과 동일)"""
+    return load_allocation_table().lookup(사용자성향, 거시선택, 자산배분선택)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="최종 자산배분 조회표 생성·검증")
+    parser.add_argument("--path", default=None, help="조회표 파일 (.npz)")
+    parser.add_argument("--check", action="store_true", help="새로 만들지 않고 저장된 조회표만 검증")
+    args = parser.parse_args(argv)
+    path = args.path or _table_path()
+
+    if args.check:
+        table = AllocationTable.load(path)
+    else:
+        table = AllocationTable.build()
+        table.save(path)
+        print(f"조회표 저장: {path} ({len(table.methods)}개 조합, 기준봉 {table.asof})")
+    if table.asof != str(current_asof().date()):
+        print(f"⚠ 조회표 기준봉({table.asof})이 현재 기준봉({current_asof().date()})과 다릅니다", file=sys.stderr)
+    if table.signature != formula_signature():
+        print(f"⚠ 조회표 배분 공식 서명({table.signature})이 현재 공식({formula_signature()})과 다릅니다", file=sys.stderr)
+    불일치 = table.verify()
+    for key, 항목 in 불일치:
+        print(f"불일치: {'/'.join(str(x) for x in key)} {항목}", file=sys.stderr)
+    print("검증 통과" if not 불일치 else f"검증 실패: {len(불일치)}건")
+    return 1 if 불일치 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
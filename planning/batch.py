@@ -0,0 +1,278 @@
+"""
+고객 일괄 플래닝 (CLI)
+고객 프로필 CSV/Parquet을 청크 단위로 읽어 프로세스 풀에서 최종 배분·자산별 금액·
+DCA 일정을 계산하고 Parquet(또는 CSV) 파일에 청크마다 이어 씁니다.
+
+    python -m planning.batch clients.csv -o plans.parquet --workers 4
+    python -m planning.batch --generate 50000 -o clients.csv    # 데모 고객 명부 생성
+
+입력 컬럼 (없으면 기본값): client_id, asset(만원), 성향, 시장, 기간,
+choice_macro, choice_alloc, choice_sector, picks(세미콜론 구분), 실행기간
+동시에 처리 중인 청크 수를 작업자 수의 두 배로 제한하므로 입력 크기와 관계없이
+메모리 사용량은 chunk_size에 비례합니다.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 입출력은 선택 사항 (CSV는 항상 지원)
+    pa = None
+    pq = None
+
+from optimizer import ASSET_CLASSES
+
+from .allocation import load_allocation_table
+from .calendars import dca_schedule
+from .inputs import DEFAULT_PROFILE
+from .portfolio import select_core_stocks
+
+LIST_SEPARATOR = ";"
+DEFAULT_CHUNK = 5000
+DEFAULT_EXECUTION_PERIOD = "3개월 내"
+
+INPUT_DEFAULTS = {
+    "asset": DEFAULT_PROFILE["asset"],
+    "성향": DEFAULT_PROFILE["성향"],
+    "시장": DEFAULT_PROFILE["시장"],
+    "기간": DEFAULT_PROFILE["기간"],
+    "choice_macro": None,
+    "choice_alloc": None,
+    "choice_sector": "",
+    "picks": "",
+    "실행기간": DEFAULT_EXECUTION_PERIOD,
+}
+
+# 작업자 프로세스별 메모 — 일정은 실행기간에만 의존 (배분은 기준봉 조회표에서 행 단위 조회)
+_schedules = {}
+
+
+def read_profiles(path, chunk_size=DEFAULT_CHUNK):
+    """고객 프로필을 chunk_size 행씩 DataFrame으로 순회 (CSV 또는 Parquet)"""
+    if str(path).endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError("Parquet 입력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype={"client_id": str})
+
+
+def _split(value):
+    """세미콜론 구분 문자열 → 튜플 (빈 값은 빈 튜플)"""
+    if not isinstance(value, str) or not value:
+        return ()
+    return tuple(item.strip() for item in value.split(LIST_SEPARATOR) if item.strip())
+
+
+def _optional(value):
+    """결측값을 None으로"""
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else value
+
+
+def _schedule(실행기간, today):
+    key = (실행기간, today)
+    if key not in _schedules:
+        dates, _, _ = dca_schedule(실행기간, 0.0, today)
+        _schedules[key] = [d.date() for d in dates]
+    return _schedules[key]
+
+
+def plan_chunk(frame, today):
+    """프로필 청크 하나의 최종 배분·자산별 금액·DCA 일정 계산"""
+    frame = frame.reset_index(drop=True)
+    for column, default in INPUT_DEFAULTS.items():
+        if column not in frame:
+            frame[column] = default
+    if "client_id" not in frame:
+        frame["client_id"] = frame.index.astype(str)
+
+    성향 = frame["성향"].fillna(INPUT_DEFAULTS["성향"]).tolist()
+    거시 = [_optional(v) for v in frame["choice_macro"].tolist()]
+    배분전략 = [_optional(v) for v in frame["choice_alloc"].tolist()]
+    실행기간 = frame["실행기간"].fillna(DEFAULT_EXECUTION_PERIOD).tolist()
+
+    조회표 = load_allocation_table()
+    행 = np.fromiter((조회표.index(*key) for key in zip(성향, 거시, 배분전략)), dtype=np.intp, count=len(frame))
+    비중 = 조회표.weights[행]
+    총자산 = frame["asset"].fillna(INPUT_DEFAULTS["asset"]).to_numpy(dtype=np.float64) * 10000
+    # generate_final_portfolio와 같은 연산 순서 — int(사용자자산 * 비중 / 100)
+    금액 = np.floor(총자산[:, None] * 비중 / 100).astype(np.int64)
+    일정 = [_schedule(p, today) for p in 실행기간]
+    회차수 = np.array([len(d) for d in 일정])
+
+    out = {
+        "client_id": frame["client_id"].astype(str),
+        "성향": 성향,
+        "시장": frame["시장"].fillna(INPUT_DEFAULTS["시장"]).tolist(),
+        "choice_macro": 거시,
+        "choice_alloc": 배분전략,
+        "총자산": 총자산.astype(np.int64),
+        "최적화방식": 조회표.methods[행].tolist(),
+        "수익률": 조회표.returns[행],
+        "위험도": 조회표.volatility[행],
+        "샤프": 조회표.sharpe[행],
+    }
+    for i, 자산 in enumerate(ASSET_CLASSES):
+        out[f"{자산}_비중"] = 비중[:, i]
+    for i, 자산 in enumerate(ASSET_CLASSES):
+        out[f"{자산}_금액"] = 금액[:, i]
+    out["핵심종목"] = [
+        select_core_stocks(_split(p), _split(s))
+        for p, s in zip(frame["picks"].tolist(), frame["choice_sector"].tolist())
+    ]
+    out["실행기간"] = 실행기간
+    out["DCA_회차수"] = 회차수
+    out["DCA_회차금액"] = 금액.sum(axis=1) / 회차수
+    out["DCA_일정"] = 일정
+    return pd.DataFrame(out)
+
+
+def _parquet_schema():
+    """결과 Parquet 스키마 (청크마다 결측 컬럼이 있어도 같은 타입 유지)"""
+    text, real, whole = pa.string(), pa.float64(), pa.int64()
+    fields = [
+        ("client_id", text), ("성향", text), ("시장", text),
+        ("choice_macro", text), ("choice_alloc", text),
+        ("총자산", whole), ("최적화방식", text), ("수익률", real), ("위험도", real), ("샤프", real),
+    ]
+    fields += [(f"{자산}_비중", real) for 자산 in ASSET_CLASSES]
+    fields += [(f"{자산}_금액", whole) for 자산 in ASSET_CLASSES]
+    fields += [
+        ("핵심종목", pa.list_(text)), ("실행기간", text),
+        ("DCA_회차수", whole), ("DCA_회차금액", real), ("DCA_일정", pa.list_(pa.date32())),
+    ]
+    return pa.schema(fields)
+
+
+class _PlanWriter:
+    """청크 결과를 Parquet(row group 단위) 또는 CSV로 이어 쓰기"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.parquet = not self.path.endswith(".csv")
+        if self.parquet and pq is None:
+            raise RuntimeError("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow, 또는 .csv 출력)")
+        self._writer = None
+        self._header = True
+
+    def write(self, plans):
+        if self.parquet:
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, _parquet_schema())
+            self._writer.write_table(pa.Table.from_pandas(plans, schema=self._writer.schema, preserve_index=False))
+        else:
+            plans = plans.assign(
+                핵심종목=plans["핵심종목"].map(LIST_SEPARATOR.join),
+                DCA_일정=plans["DCA_일정"].map(lambda d: LIST_SEPARATOR.join(x.isoformat() for x in d)),
+            )
+            plans.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run_batch(input_path, output_path, chunk_size=DEFAULT_CHUNK, workers=None, today=None, progress=None):
+    """고객 명부 전체를 플래닝해 output_path에 기록 — 처리 행 수와 소요 시간 반환
+
+    progress(rows, elapsed): 청크를 쓸 때마다 호출 (진행률·처리량 표시용)
+    """
+    today = (pd.Timestamp.now() if today is None else pd.Timestamp(today)).normalize()
+    workers = min(workers or os.cpu_count() or 1, os.cpu_count() or 1)
+    load_allocation_table()   # 배분 조회표(공분산 포함)를 미리 적재해 작업자들이 물려받도록 함
+
+    writer = _PlanWriter(output_path)
+    rows = 0
+    started = time.perf_counter()
+
+    def emit(plans):
+        nonlocal rows
+        writer.write(plans)
+        rows += len(plans)
+        if progress is not None:
+            progress(rows, time.perf_counter() - started)
+
+    try:
+        chunks = read_profiles(input_path, chunk_size)
+        if workers <= 1:
+            for chunk in chunks:
+                emit(plan_chunk(chunk, today))
+        else:
+            # 입력 순서대로 기록하고, 대기 중인 청크는 작업자 수의 두 배까지만 유지
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(plan_chunk, chunk, today))
+                    if len(pending) >= workers * 2:
+                        emit(pending.popleft().result())
+                while pending:
+                    emit(pending.popleft().result())
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - started
+
+
+def synthetic_client_book(n, seed=0):
+    """데모용 고객 명부 (자산·성향·선택값 무작위)"""
+    rng = np.random.default_rng(seed)
+    sectors = np.array(["AI/반도체", "로봇/자동화", "2차전지", "바이오/헬스", "금융/보험", ""])
+    picks = np.array(["삼성전자", "SK하이닉스", "네이버", "카카오", "셀트리온", "LG에너지솔루션", ""])
+    return pd.DataFrame({
+        "client_id": [f"C{i:07d}" for i in range(n)],
+        "asset": rng.integers(1, 500, n) * 100,
+        "성향": rng.choice(["안정형", "중립형", "공격형"], n),
+        "시장": rng.choice(["국내", "글로벌"], n),
+        "기간": rng.integers(1, 31, n),
+        "choice_macro": rng.choice(["보수형", "중립형", "공격형"], n),
+        "choice_alloc": rng.choice(["방어형", "균형형", "공격형"], n),
+        "choice_sector": [LIST_SEPARATOR.join(dict.fromkeys(filter(None, s))) for s in rng.choice(sectors, (n, 2))],
+        "picks": [LIST_SEPARATOR.join(dict.fromkeys(filter(None, p))) for p in rng.choice(picks, (n, 3))],
+        "실행기간": rng.choice(["1주일 내", "1개월 내", "3개월 내", "6개월 내"], n),
+    })
+
+
+def _report(rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"\r{rows:,}행 처리 | {elapsed:,.1f}초 | {rate:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIA 2.0 고객 일괄 플래닝")
+    parser.add_argument("input", nargs="?", help="고객 프로필 CSV/Parquet")
+    parser.add_argument("-o", "--output", required=True, help="결과 파일 (.parquet 또는 .csv)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--workers", type=int, default=None, help="작업자 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--today", default=None, help="DCA 일정 기준일 (기본: 오늘)")
+    parser.add_argument("--generate", type=int, metavar="N", help="입력 대신 데모 고객 명부 N건을 output에 생성")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        book = synthetic_client_book(args.generate)
+        if args.output.endswith(".parquet"):
+            book.to_parquet(args.output, index=False)
+        else:
+            book.to_csv(args.output, index=False)
+        print(f"데모 고객 명부 {len(book):,}건 → {args.output}", file=sys.stderr)
+        return 0
+    if not args.input:
+        parser.error("입력 파일을 지정하거나 --generate를 사용하세요")
+
+    rows, elapsed = run_batch(args.input, args.output, args.chunk_size, args.workers, args.today, _report)
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"\n완료: {rows:,}행, {elapsed:,.1f}초, {rate:,.0f} rows/s → {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
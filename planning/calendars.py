@@ -0,0 +1,155 @@
+"""
+투자 실행 캘린더 (분할 매수 일정, 하락매수 조건, 기술적 체크포인트, 일시불 체크리스트)
+
+각 함수는 {"제목": 표 제목, "표": DataFrame}을 반환합니다 (하락매수 조건표는 사다리 평가 "평가"도 포함).
+"""
+
+import pandas as pd
+
+from instrumentation import instrumented
+
+from .formatting import format_money
+from .portfolio import get_dip_buying_evaluation
+
+
+def dca_schedule(실행기간, 총투자금, today=None):
+    """분할 매수 회차 일정 — (회차 일자, 회차 단위, 회차별 금액)"""
+    if 실행기간 == "1주일 내":
+        periods = 7
+        interval = "일"
+    elif 실행기간 == "1개월 내":
+        periods = 4
+        interval = "주"
+    elif 실행기간 == "3개월 내":
+        periods = 12
+        interval = "주"
+    else:
+        periods = 6
+        interval = "월"
+
+    today = pd.Timestamp.now() if today is None else pd.Timestamp(today)
+    dates = pd.date_range(start=today, periods=periods+1, freq='W' if interval == "주" else 'D' if interval == "일" else 'ME')[1:]
+    return dates, interval, 총투자금 / periods
+
+
+def generate_dca_calendar(portfolio, 실행기간, today=None):
+    """DCA 실행 캘린더 생성"""
+    # 분할 매수 스케줄 생성
+    dates, interval, 회차별금액 = dca_schedule(실행기간, sum(portfolio['투자금액'].values()), today)
+    periods = len(dates)
+
+    calendar_data = []
+    for i, date in enumerate(dates):
+        calendar_data.append({
+            '일정': date.strftime('%Y-%m-%d (%a)'),
+            f'{interval}차': f"{i+1}/{periods}",
+            '투자금액': format_money(회차별금액),
+            '누적금액': format_money(회차별금액 * (i+1)),
+            '비고': f"전체 포트폴리오 {100/periods:.1f}% 매수"
+        })
+
+    return {"제목": "분할 매수 일정표", "표": pd.DataFrame(calendar_data)}
+
+
+# 하락매수 기본 사다리 — 하락폭(%)별 매수 비중(%)과 안내 문구
+DIP_LADDER = (
+    {'하락폭': 5, '매수비중': 30, '대상': '안정적 대형주/ETF', '조건': 'RSI 40 이하'},
+    {'하락폭': 10, '매수비중': 40, '대상': '전체 포트폴리오', '조건': '볼린저밴드 하단'},
+    {'하락폭': 15, '매수비중': 20, '대상': '성장주 위주', '조건': 'RSI 30 이하'},
+    {'하락폭': 20, '매수비중': 10, '대상': '전략적 기회', '조건': '공포지수 최고점'},
+)
+
+# 실행기간 → 하락매수 대기 거래일
+DIP_HORIZONS = {"즉시 실행": 5, "1주일 내": 5, "1개월 내": 21, "3개월 내": 63, "6개월 내": 126}
+
+
+def generate_dip_buying_calendar(portfolio, 실행기간="6개월 내", 사다리=None):
+    """하락매수 조건표 생성 — 사다리를 확정 배분의 과거·모의 경로에 적용한 체결 확률 포함
+
+    사다리: [(하락폭 %, 매수비중 %), ...] (없으면 DIP_LADDER, 비중은 합 100으로 정규화)
+    반환값의 "평가"는 get_dip_buying_evaluation 결과
+    """
+    if 사다리 is None:
+        사다리 = [(단['하락폭'], 단['매수비중']) for 단 in DIP_LADDER]
+    안내 = {단['하락폭']: 단 for 단 in DIP_LADDER}
+    평가 = get_dip_buying_evaluation(
+        portfolio, [(하락폭 / 100, 비중 / 100) for 하락폭, 비중 in 사다리], DIP_HORIZONS.get(실행기간, 126)
+    )
+
+    조건_data = []
+    for 과거, 모의 in zip(평가['historical']['rungs'], 평가['simulated']['rungs']):
+        하락폭 = round(과거['drop'] * 100, 1)
+        단 = 안내.get(하락폭, {})
+        조건_data.append({
+            '하락폭': f"-{하락폭:g}%",
+            '매수비중': f"{과거['fraction'] * 100:.0f}%",
+            '대상': 단.get('대상', '전체 포트폴리오'),
+            '조건': 단.get('조건', '-'),
+            '체결확률 (과거)': f"{과거['fill_probability'] * 100:.0f}%",
+            '체결확률 (모의)': f"{모의['fill_probability'] * 100:.0f}%",
+            '평균 체결일': '-' if 과거['mean_fill_day'] is None else f"{과거['mean_fill_day']:.0f}거래일",
+        })
+
+    return {"제목": "하락매수 조건표", "표": pd.DataFrame(조건_data), "평가": 평가}
+
+
+def generate_technical_calendar(portfolio):
+    """모멘텀+RSI 기반 기술적 분석 체크포인트"""
+    체크포인트_data = [
+        {
+            '주기': '매일 장마감 후',
+            '체크항목': 'RSI 지표 + 20일선 모멘텀',
+            '매수 조건': 'RSI < 40 + 모멘텀 상승',
+            '매도 조건': 'RSI > 70 + 모멘텀 둔화',
+            '액션': '단기 매매 신호 확인'
+        },
+        {
+            '주기': '매주 월요일',
+            '체크항목': '60일선 장기 모멘텀 + RSI 추세',
+            '매수 조건': 'RSI < 30 + 장기 모멘텀 지지',
+            '매도 조건': 'RSI > 80 + 장기 모멘텀 하락',
+            '액션': '주간 트렌드 방향성 확인'
+        },
+        {
+            '주기': '매월 첫째주',
+            '체크항목': '월간 모멘텀 사이클 + RSI 패턴',
+            '매수 조건': '월간 RSI 바닥권 + 모멘텀 전환',
+            '매도 조건': '월간 RSI 고점 + 모멘텀 피크',
+            '액션': '중기 포지션 재조정'
+        },
+        {
+            '주기': '분기별',
+            '체크항목': '장기 모멘텀 사이클 + RSI 매크로',
+            '매수 조건': '분기 RSI 저점 + 모멘텀 사이클 전환',
+            '매도 조건': '분기 RSI 고점 + 모멘텀 사이클 피크',
+            '액션': '전체 포트폴리오 리밸런싱'
+        }
+    ]
+
+    return {"제목": "모멘텀+RSI 기술적 분석 체크포인트", "표": pd.DataFrame(체크포인트_data)}
+
+
+def generate_lump_sum_calendar(portfolio):
+    """일시불 투자 체크리스트"""
+    체크리스트_data = [
+        {'순서': '1단계', '항목': '시장 상황 최종 점검', '완료': False},
+        {'순서': '2단계', '항목': '포트폴리오 배분 확인', '완료': False},
+        {'순서': '3단계', '항목': '매수 주문 일괄 실행', '완료': False},
+        {'순서': '4단계', '항목': '손절/목표가 설정', '완료': False},
+        {'순서': '5단계', '항목': '모니터링 알림 설정', '완료': False}
+    ]
+
+    return {"제목": "일시불 투자 실행 체크리스트", "표": pd.DataFrame(체크리스트_data)}
+
+
+@instrumented("plan.execution_calendar")
+def generate_execution_calendar(portfolio, 투자방식, 실행기간, today=None, 사다리=None):
+    """투자 실행 방식에 맞는 캘린더 선택 (사다리: 하락매수 [(하락폭 %, 매수비중 %), ...])"""
+    if 투자방식 == "분할 매수 (DCA)":
+        return generate_dca_calendar(portfolio, 실행기간, today)
+    elif 투자방식 == "하락시 점진 매수":
+        return generate_dip_buying_calendar(portfolio, 실행기간, 사다리)
+    elif 투자방식 == "기술적 타이밍":
+        return generate_technical_calendar(portfolio)
+    else:
+        return generate_lump_sum_calendar(portfolio)
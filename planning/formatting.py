@@ -0,0 +1,20 @@
+"""
+표시용 숫자 포맷 (화폐, 퍼센트)
+"""
+
+
+def format_money(value):
+    """숫자를 한국식 화폐 단위로 변환"""
+    if value >= 1000000000000:  # 조
+        return f"{value/1000000000000:.1f}조원"
+    elif value >= 100000000:  # 억
+        return f"{value/100000000:.1f}억원"
+    elif value >= 10000:  # 만
+        return f"{value/10000:.0f}만원"
+    else:
+        return f"{value:,.0f}원"
+
+
+def format_percent(value):
+    """소수를 퍼센트로 변환"""
+    return f"{value*100:.1f}%" if value < 1 else f"{value:.1f}%"
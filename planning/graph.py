@@ -0,0 +1,153 @@
+"""
+증분 계획 그래프 — 세션 입력이 바뀐 노드만 다시 계산
+
+    graph = build_plan_graph()
+    graph.update(PlanInputs.from_state(st.session_state))
+    final_portfolio = graph.get("최종포트폴리오")
+    graph.recomputed    # 이번 실행에서 다시 계산한 노드 이름
+
+노드는 선언한 입력(세션 키 또는 다른 노드)과 마지막 값을 기억합니다.
+입력 버전이 하나라도 바뀐 노드만 다시 계산하며, 다시 계산한 값이 이전과 같으면
+버전을 올리지 않아 그 아래 노드는 무효화되지 않습니다.
+(예: 종목 하나를 토글해도 성향·거시·배분 입력이 그대로면 최적화 노드는 재사용)
+"""
+
+from instrumentation import timed
+
+from .allocation import final_allocation
+from .inputs import DEFAULT_PROFILE, PlanInputs
+from .portfolio import allocation_amounts, assemble_final_portfolio, select_core_stocks
+from .trade_plans import generate_asset_trade_plan
+
+# 세션 입력과 기본값 (PlanInputs 필드 + 트레이드 플래너 투자방식·확정 포트폴리오)
+SOURCES = {
+    "profile": DEFAULT_PROFILE,
+    "choice_macro": None,
+    "choice_alloc": None,
+    "choice_sector": (),
+    "picks": (),
+    "투자방식": "일시불 투자",
+    "확정포트폴리오": None,
+}
+
+
+def _same(a, b):
+    """값 비교 (비교할 수 없는 값은 바뀐 것으로 간주)"""
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class _Node:
+    __slots__ = ("name", "inputs", "func", "value", "version", "stamp")
+
+    def __init__(self, name, inputs, func):
+        self.name = name
+        self.inputs = inputs
+        self.func = func
+        self.value = None
+        self.version = 0
+        self.stamp = None   # 마지막 계산 시점의 입력 버전
+
+
+class PlanGraph:
+    """메모이즈된 파생 노드 그래프 (세션별 인스턴스, 스레드 공유 금지)"""
+
+    def __init__(self):
+        self._nodes = {}
+        self._values = {}
+        self._versions = {}
+        self.recomputed = []
+
+    def source(self, name, default=None):
+        """입력 키 선언"""
+        self._values[name] = default
+        self._versions[name] = 0
+
+    def node(self, name, inputs, func):
+        """파생 노드 선언 — func(*입력값)"""
+        missing = [x for x in inputs if x not in self._versions and x not in self._nodes]
+        if missing:
+            raise ValueError(f"선언되지 않은 입력입니다: {', '.join(missing)}")
+        self._nodes[name] = _Node(name, tuple(inputs), func)
+
+    def begin_run(self):
+        """재실행 시작 — 다시 계산한 노드 기록 초기화"""
+        self.recomputed = []
+
+    def set(self, name, value):
+        """입력값 갱신 (이전 값과 다를 때만 버전 증가)"""
+        if name not in self._versions:
+            raise KeyError(name)
+        if not _same(self._values[name], value):
+            self._values[name] = value
+            self._versions[name] += 1
+
+    def update(self, inputs=None, **values):
+        """PlanInputs(또는 같은 키의 매핑)와 추가 입력을 한 번에 갱신"""
+        if inputs is not None:
+            values = {**(inputs._asdict() if hasattr(inputs, "_asdict") else dict(inputs)), **values}
+        for name, value in values.items():
+            self.set(name, value)
+
+    def _version(self, name):
+        if name in self._versions:
+            return self._versions[name]
+        self.get(name)
+        return self._nodes[name].version
+
+    def get(self, name):
+        """노드 값 (입력이 바뀐 경우에만 다시 계산)"""
+        if name in self._values:
+            return self._values[name]
+        node = self._nodes[name]
+        stamp = tuple(self._version(x) for x in node.inputs)
+        if stamp != node.stamp:
+            with timed(f"graph.{name}"):
+                value = node.func(*(self.get(x) for x in node.inputs))
+            self.recomputed.append(name)
+            if node.stamp is None or not _same(node.value, value):
+                node.value = value
+                node.version += 1
+            node.stamp = stamp
+        return node.value
+
+    def status(self):
+        """노드별 입력·버전·이번 실행 재계산 여부"""
+        return [
+            {"노드": n.name, "입력": ", ".join(n.inputs), "버전": n.version, "재계산": n.name in self.recomputed}
+            for n in self._nodes.values()
+        ]
+
+
+def _trade_plans(portfolio, 투자방식):
+    """확정 포트폴리오 자산별 트레이드 플랜"""
+    if not portfolio:
+        return {}
+    return {
+        자산: generate_asset_trade_plan(자산, portfolio['투자금액'][자산], 투자방식)
+        for 자산, 비중 in portfolio['배분'].items() if 비중 > 0
+    }
+
+
+def build_plan_graph():
+    """6단계 흐름의 파생 결과 그래프
+
+    최적화(배분 비중) ← 성향·거시·배분 전략, 투자금액(원) ← 총자산·최적화,
+    핵심종목 ← 종목·섹터, 최종포트폴리오 ← 최적화·핵심종목·투자금액·총자산,
+    트레이드플랜 ← 확정포트폴리오·투자방식
+    """
+    graph = PlanGraph()
+    for name, default in SOURCES.items():
+        graph.source(name, default)
+    graph.node("총자산", ["profile"], lambda profile: PlanInputs(profile).자산)
+    graph.node("성향", ["profile"], lambda profile: PlanInputs(profile).성향)
+    graph.node("최적화", ["성향", "choice_macro", "choice_alloc"], final_allocation)
+    graph.node("투자금액", ["총자산", "최적화"], lambda 총자산, 최적화: allocation_amounts(총자산, 최적화["비중"]))
+    graph.node("핵심종목", ["picks", "choice_sector"], lambda picks, 섹터: select_core_stocks(picks or [], 섹터 or []))
+    graph.node("최종포트폴리오", ["최적화", "핵심종목", "투자금액", "총자산"], assemble_final_portfolio)
+    graph.node("트레이드플랜", ["확정포트폴리오", "투자방식"], _trade_plans)
+    return graph
@@ -0,0 +1,47 @@
+"""
+플래너 입력 — 세션 상태와 분리된 사용자 선택값
+"""
+
+from collections import namedtuple
+
+from .records import Profile
+
+DEFAULT_PROFILE = {"asset": 2000, "성향": "중립형", "시장": "국내", "기간": 10}
+
+_PlanInputsBase = namedtuple(
+    "PlanInputs",
+    ["profile", "choice_macro", "choice_alloc", "choice_sector", "picks"],
+    defaults=(None, None, None, ()),
+)
+
+
+class PlanInputs(_PlanInputsBase):
+    """플래너 입력값
+
+    profile: {"asset": 가용자산(만원), "성향": 안정형/중립형/공격형, "시장": 국내/글로벌, "기간": 년}
+    choice_macro: 거시 관점 (보수형/중립형/공격형 또는 None)
+    choice_alloc: 자산배분 전략 (방어형/균형형/공격형 또는 None)
+    choice_sector: 선택 섹터 목록, picks: 선택 종목(종목코드 또는 종목명) 목록
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_state(cls, state):
+        """세션 상태(또는 같은 키를 가진 매핑)에서 입력값 생성"""
+        return cls(
+            profile=Profile.from_mapping({**DEFAULT_PROFILE, **(state.get("profile") or {})}),
+            choice_macro=state.get("choice_macro"),
+            choice_alloc=state.get("choice_alloc"),
+            choice_sector=tuple(state.get("choice_sector") or ()),
+            picks=tuple(state.get("picks") or ()),
+        )
+
+    @property
+    def 성향(self):
+        return self.profile.get("성향", DEFAULT_PROFILE["성향"])
+
+    @property
+    def 자산(self):
+        """가용자산 (원)"""
+        return self.profile.get("asset", DEFAULT_PROFILE["asset"]) * 10000
@@ -0,0 +1,285 @@
+"""
+종목·섹터 데이터와 종목별 신호 점수
+"""
+
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from backtest import run_backtest
+from indicators import ma_momentum, rsi_wilder
+from instrumentation import instrumented
+from price_matrix import close_series, load_price_matrix
+from risk_policies import daily_volatility, evaluate_policies, historical_paths, simulated_paths
+from screener import DEFAULT_PAGE_SIZE, factor_scores, load_screener
+from sector_strength import HORIZONS, SectorStrength
+from security_master import load_security_master
+from shared_cache import cached_dataset, current_asof
+from signals import batch_momentum_rsi_signal
+
+
+def get_stock_info(종목코드):
+    """종목 정보 조회 (종목코드 또는 종목명, 프로세스 공용 종목 마스터 사용)"""
+    return load_security_master().info(종목코드)
+
+
+def lookup_stock_info(종목코드):
+    """종목 마스터에 있는 종목만 정보 조회 (없으면 None)"""
+    master = load_security_master()
+    return master.info(종목코드) if master.row(종목코드) >= 0 else None
+
+
+def get_pick_momentum(종목정보):
+    """종목의 20일/60일선 모멘텀과 14일 RSI (종가 행렬/가격 저장소 시계열 기준, 세션 공용 캐시)
+
+    RSI는 같은 종가 시계열에서 계산하고, 시계열이 짧아 값이 없으면 종목 정보의 RSI를 씁니다.
+    """
+    asof = current_asof()
+
+    def compute():
+        close = close_series(종목정보['code'], asof - pd.Timedelta(days=180), asof, base_price=종목정보['price'])
+        rsi = float(rsi_wilder(close.values)[-1])
+        return {
+            'ma20': float(ma_momentum(close.values, 20)[-1]),
+            'ma60': float(ma_momentum(close.values, 60)[-1]),
+            'rsi': rsi if np.isfinite(rsi) else float(종목정보['RSI'])
+        }
+
+    return cached_dataset("pick_momentum", compute, ticker=종목정보['code'], asof=asof)
+
+
+@instrumented("market.strategy_backtest")
+def get_strategy_backtest(종목정보목록):
+    """선택 종목 최근 10년 모멘텀+RSI 전략 백테스트 (세션 공용 캐시)"""
+    asof = current_asof()
+    종목코드 = tuple(info['code'] for info in 종목정보목록)
+
+    def compute():
+        시계열 = [
+            close_series(info['code'], asof - pd.DateOffset(years=10), asof, base_price=info['price'])
+            for info in 종목정보목록
+        ]
+        가격행렬 = pd.concat(시계열, axis=1).ffill().dropna()
+        return run_backtest(가격행렬.to_numpy().T)
+
+    return cached_dataset("strategy_backtest", compute, ticker=종목코드, asof=asof)
+
+
+# 과거 보유기간 구간이 이보다 적으면(이력이 짧은 종목) 모의 경로로 평가
+MIN_HISTORICAL_PATHS = 1000
+
+
+@instrumented("market.pick_risk")
+def get_pick_risk_profile(종목정보):
+    """선택 종목의 위험 관리 방식별 평가 (최근 10년 6개월 보유 구간 전체, 세션 공용 캐시)
+
+    반환값: risk_policies.evaluate_policies 결과 {방식: {exit_rate, drawdown_cut, whipsaw_rate, ...}}
+    """
+    asof = current_asof()
+
+    def compute():
+        close = close_series(
+            종목정보['code'], asof - pd.DateOffset(years=10), asof, base_price=종목정보['price']
+        ).to_numpy()
+        paths = historical_paths(close)
+        if len(paths) < MIN_HISTORICAL_PATHS:
+            paths = simulated_paths(close, seed=zlib.crc32(str(종목정보['code']).encode("utf-8")))
+        return evaluate_policies(paths, daily_volatility(close))
+
+    return cached_dataset("pick_risk", compute, ticker=종목정보['code'], asof=asof)
+
+
+# 섹터 투자 테마별 후보 섹터 (실제 선택은 상대강도 순위 상위 섹터)
+SECTOR_THEMES = {
+    "성장": ["AI/반도체", "로봇/자동화", "2차전지", "바이오/헬스", "게임/엔터"],
+    "가치": ["에너지", "유틸리티", "금융/보험", "화학/소재", "건설", "자동차"],
+    "방어": ["필수소비재", "바이오/헬스", "통신서비스", "유틸리티", "금융/보험"],
+}
+
+BENCHMARK = ("KOSPI", 2400.0)
+
+_sector_engines = {}
+_sector_lock = threading.Lock()
+
+
+def _sector_closes(codes, base_prices, start, end):
+    """종목들과 KOSPI 종가를 KOSPI 거래일 기준 (종목 × 거래일) 행렬로 조회
+
+    종가 행렬에 기간과 종목이 모두 있으면 메모리 맵에서 한 번에 잘라 오고, 아니면 종목별로 저장소를 조회합니다.
+    """
+    matrix = load_price_matrix()
+    if matrix is not None and matrix.covers(start, end) and all(x in matrix for x in [BENCHMARK[0], *codes]):
+        dates, 종가 = matrix.window([BENCHMARK[0], *codes], start, end)
+        return dates, 종가[:, 1:].T.astype(np.float64), 종가[:, 0].astype(np.float64)
+    kospi = close_series(BENCHMARK[0], start, end, base_price=BENCHMARK[1])
+    시계열 = [
+        close_series(code, start, end, base_price=price).reindex(kospi.index)
+        for code, price in zip(codes, base_prices)
+    ]
+    행렬 = np.vstack([s.to_numpy() for s in 시계열]) if 시계열 else np.empty((0, len(kospi)))
+    return kospi.index, 행렬, kospi.to_numpy()
+
+
+def _sector_engine(asof, weighting):
+    """섹터 상대강도 엔진을 asof까지 최신화 (프로세스 공용, 새 봉만 추가)"""
+    with _sector_lock:
+        master = load_security_master()
+        col = master.columns
+        engine = _sector_engines.get(weighting)
+        if engine is not None and engine.asof < asof:
+            dates, 행렬, kospi = _sector_closes(col["code"], col["price"], engine.asof + pd.Timedelta(days=1), asof)
+            if len(dates) <= 5:
+                for i, date in enumerate(dates):
+                    engine.append(date, 행렬[:, i], kospi[i])
+            else:
+                engine = None  # 공백이 길면 새로 구성
+        if engine is None or engine.asof > asof:
+            # 6개월 상대강도에 필요한 거래일 + 휴장일 여유
+            시작 = asof - pd.Timedelta(days=int(max(HORIZONS.values()) * 1.6))
+            dates, 행렬, kospi = _sector_closes(col["code"], col["price"], 시작, asof)
+            engine = SectorStrength(행렬, dates, col["sector"], col["market_cap"], kospi, weighting=weighting)
+        _sector_engines[weighting] = engine
+        return engine
+
+
+@instrumented("market.sector_table")
+def build_sector_table(asof=None, weighting="market_cap"):
+    """섹터 상대강도 순위 (KOSPI 대비 1/3/6개월, 거래일마다 한 번 계산하는 세션 공용 캐시)
+
+    반환 컬럼: 섹터, 종목수, 1개월, 3개월, 6개월, 3개월수익률, 상대강도(=3개월) — 상대강도 내림차순
+    """
+    asof = current_asof() if asof is None else asof
+    return cached_dataset(
+        "sector_strength", lambda: _sector_engine(asof, weighting).ranking(), ticker=weighting, asof=asof
+    )
+
+
+def theme_sectors(테마, 순위표, top=3):
+    """테마 후보 섹터 중 상대강도 상위 섹터 (순위표에 없으면 후보 순서대로)"""
+    후보 = SECTOR_THEMES[테마]
+    순위 = 순위표[순위표["섹터"].isin(후보)].dropna(subset=["상대강도"])
+    선택 = list(순위["섹터"][:top])
+    return 선택 or 후보[:top]
+
+
+def build_stock_table():
+    """종목 분석 테이블 (전체 종목 마스터)"""
+    return load_security_master().to_frame()
+
+
+@instrumented("market.screen_universe")
+def screen_universe(선택섹터, 저평가, 안정성, 성장성, page=0, page_size=DEFAULT_PAGE_SIZE):
+    """전체 종목 스크리닝 한 페이지 (섹터 역색인 + 팩터 점수, 프로세스 공용 스크리너)"""
+    return load_screener().screen(선택섹터, 저평가, 안정성, 성장성, page=page, page_size=page_size)
+
+
+def pick_factor_scores(종목정보):
+    """선택 종목의 저평가·안정성·기술 점수 (스크리너와 같은 공식, RSI는 종가 시계열 기준)"""
+    점수 = factor_scores(종목정보['PER'], get_pick_momentum(종목정보)['rsi'], 종목정보['밴드대비'])
+    return {팩터: float(값) for 팩터, 값 in 점수.items()}
+
+
+@instrumented("market.score_picks")
+def score_picks(picks):
+    """선택 종목 지표 수집 후 모멘텀+RSI 신호 점수를 한 번에 계산
+
+    반환값: 종목별 {코드, 정보, 현재가, RSI, ma20, ma60, 신호점수} 목록
+    """
+    종목지표 = []
+    for 종목코드 in picks:
+        종목정보 = get_stock_info(종목코드)
+        모멘텀 = get_pick_momentum(종목정보)
+        종목지표.append({
+            '코드': 종목코드,
+            '정보': 종목정보,
+            '현재가': 종목정보['price'],
+            'RSI': 모멘텀['rsi'],
+            'ma20': 모멘텀['ma20'],
+            'ma60': 모멘텀['ma60']
+        })
+    if not 종목지표:
+        return 종목지표
+
+    신호점수 = batch_momentum_rsi_signal(
+        np.array([x['RSI'] for x in 종목지표]),
+        np.array([x['ma20'] for x in 종목지표]),
+        np.array([x['ma60'] for x in 종목지표])
+    )
+    for 지표, 점수 in zip(종목지표, 신호점수):
+        지표['신호점수'] = int(점수)
+    return 종목지표
+
+
+def pick_exit_levels(현재가, ma20_momentum, 위험평가=None):
+    """모멘텀 강도와 위험 관리 방식 평가에 따른 목표가·손절가
+
+    위험평가(get_pick_risk_profile 결과 중 선택한 방식 하나)가 있으면
+    - 손절률: 방식의 규칙 손절폭, 규칙이 없으면 손실 청산 경로의 손실 중앙값
+      (장기 보유나 손실 청산이 없는 경우는 손절가 없음)
+    - 추적손절: 손절폭이 현재가가 아닌 보유 중 고점 기준인지 (변동성 기준 조정) — 손절가는 현재가 기준 시작값
+    - 목표수익률: 모멘텀 목표와 방식 적용 경로 상위 25% 수익률 중 낮은 값 (최소 5%)
+    """
+    # 목표 수익률을 모멘텀 강도에 따라 조정
+    if ma20_momentum > 10:
+        목표수익률 = 25  # 강한 상승 모멘텀
+    elif ma20_momentum > 5:
+        목표수익률 = 20  # 보통 상승 모멘텀
+    elif ma20_momentum > 0:
+        목표수익률 = 15  # 약한 상승 모멘텀
+    else:
+        목표수익률 = 10  # 하락 모멘텀
+
+    손절률 = 15
+    추적손절 = False
+    if 위험평가 is not None:
+        목표수익률 = max(5, min(목표수익률, round(위험평가['upside'] * 100)))
+        손절폭 = 위험평가['stop_level'] if 위험평가['stop_level'] is not None else 위험평가['exit_loss']
+        손절률 = round(손절폭 * 100, 1) if 손절폭 is not None and 손절폭 > 0 else None
+        추적손절 = 손절률 is not None and 위험평가.get('trailing', False)
+
+    return {
+        '목표수익률': 목표수익률,
+        '목표가': 현재가 * (1 + 목표수익률/100),
+        '손절률': 손절률,
+        '손절가': None if 손절률 is None else 현재가 * (1 - 손절률/100),
+        '추적손절': 추적손절,
+    }
+
+
+def price_signal_summary(close, chart_start):
+    """종가 시계열의 RSI·20일선 모멘텀과 현재 신호 요약
+
+    close: 워밍업 구간을 포함한 종가 Series, chart_start 이후 구간만 반환합니다.
+    """
+    chart_range = close.index >= chart_start
+    rsi_values = np.nan_to_num(rsi_wilder(close.values), nan=50.0)[chart_range]
+    ma20_values = ma_momentum(close.values, 20)[chart_range]
+    현재RSI = rsi_values[-1]
+    현재모멘텀 = ma20_values[-1]
+
+    if 현재모멘텀 > 0:
+        모멘텀설명, 모멘텀신호 = "20일 이평선 상향 돌파", "매수"
+    else:
+        모멘텀설명, 모멘텀신호 = "20일 이평선 하회", "관망"
+
+    if 현재RSI > 70:
+        RSI설명, RSI신호 = "과매수 구간 진입", "매도"
+    elif 현재RSI < 30:
+        RSI설명, RSI신호 = "과매도 구간", "매수"
+    else:
+        RSI설명, RSI신호 = "중립 구간", "중립"
+
+    return {
+        'dates': close.index[chart_range],
+        'prices': close.values[chart_range],
+        'rsi': rsi_values,
+        'ma20_momentum': ma20_values,
+        '현재RSI': 현재RSI,
+        '현재모멘텀': 현재모멘텀,
+        '모멘텀설명': 모멘텀설명,
+        '모멘텀신호': 모멘텀신호,
+        'RSI설명': RSI설명,
+        'RSI신호': RSI신호,
+    }
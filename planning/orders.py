@@ -0,0 +1,86 @@
+"""
+주문 수량표 — 확정 포트폴리오의 자산군별 투자금액을 상품·정수 주식 수로 변환 (orders 엔진 사용)
+
+- 분할 매수 (DCA): dca_schedule 회차별 균등 분할
+- 하락시 점진 매수: 사다리 가단별 지정가 주문 (현재가 × (1 − 하락폭), 가단 매수비중만큼, 오늘 일괄 접수)
+- 일시불 투자: 오늘 한 번, 기술적 타이밍: 매수 신호일에 낼 한 번 분량 (주문일은 오늘로 표시)
+"""
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import instrumented
+from dip_buying import normalize_ladder
+from orders import size_client_orders, trade_dates
+
+from .calendars import DIP_LADDER, dca_schedule
+from .formatting import format_money
+
+
+def order_tranches(실행기간, 투자방식, today=None, 사다리=None):
+    """(회차별 투입 비율, 회차별 주문일, 회차별 지정가 할인율 또는 None)
+
+    분할 매수는 dca_schedule 회차(휴일은 다음 영업일), 하락시 점진 매수는 사다리 가단별
+    (사다리: [(하락폭 %, 매수비중 %), ...], 없으면 DIP_LADDER — 모든 가단을 오늘 지정가로 접수),
+    그 외는 오늘 한 번
+    """
+    today = pd.Timestamp.now() if today is None else pd.Timestamp(today)
+    if 투자방식 == "분할 매수 (DCA)":
+        dates, _, _ = dca_schedule(실행기간, 1.0, today)
+        return np.ones(len(dates)), trade_dates(dates), None
+    if 투자방식 == "하락시 점진 매수":
+        if 사다리 is None:
+            사다리 = [(단['하락폭'], 단['매수비중']) for 단 in DIP_LADDER]
+        하락폭, 비중 = normalize_ladder([(폭 / 100, 매수비중 / 100) for 폭, 매수비중 in 사다리])
+        return 비중, trade_dates([today.normalize()] * len(비중)), 하락폭
+    return np.ones(1), trade_dates([today.normalize()]), None
+
+
+@instrumented("plan.orders")
+def generate_order_plan(portfolio, 투자방식, 실행기간, today=None, client_id="본인", 사다리=None):
+    """회차별 주문 수량표 (사다리: 하락매수 [(하락폭 %, 매수비중 %), ...])
+
+    반환값: {"제목", "표": 화면용 DataFrame, "주문파일": orders.ORDER_COLUMNS 형식 DataFrame,
+             "잔여현금": 원, "예수금": 현금 자산군 금액(원), "목표오차": |목표 − 매수금액| 합 / 매수 대상 금액,
+             "안내": 표를 읽는 법 (DCA·일시불은 None)}
+    하락시 점진 매수의 잔여현금·목표오차는 모든 가단이 체결됐을 때 기준입니다.
+    """
+    투자금액 = portfolio['투자금액']
+    고객 = pd.DataFrame([{
+        "client_id": client_id, **{자산: float(금액) for 자산, 금액 in 투자금액.items()},
+        "종목": ";".join(portfolio.get('종목') or ()),
+    }])
+    비율, 주문일, 할인율 = order_tranches(실행기간, 투자방식, today, 사다리)
+    주문, 요약 = size_client_orders(고객, 비율, 주문일, discounts=할인율)
+    요약 = 요약.iloc[0]
+
+    if 할인율 is None:
+        회차 = [f"{t}/{len(비율)}" for t in 주문['tranche']]
+    else:
+        회차 = [f"-{할인율[t - 1] * 100:g}% 가단" for t in 주문['tranche']]
+    표 = pd.DataFrame({
+        '회차': 회차,
+        '주문일': 주문['trade_date'],
+        '자산': 주문['asset'],
+        '종목코드': 주문['symbol'],
+        '상품': 주문['name'],
+        '수량': [f"{q:,}주" for q in 주문['quantity']],
+        '기준가' if 할인율 is None else '지정가': [f"{p:,.0f}원" for p in 주문['limit_price']],
+        '주문금액': [format_money(v) for v in 주문['notional']],
+    })
+    안내 = None
+    if 할인율 is not None:
+        안내 = ("가단별 지정가 매수 주문 (현재가 × (1 − 하락폭), 가단 매수비중만큼) — 대기기간 안에 체결되지 않은 "
+                "가단은 하락매수 조건표 기준으로 다시 검토하세요. 잔여현금·목표 오차는 모든 가단 체결 기준입니다")
+    elif 투자방식 == "기술적 타이밍":
+        안내 = ("매수 신호(RSI < 40 + 모멘텀 상승)가 나온 날 낼 수량입니다 — 주문일은 오늘로 표시되며, "
+                "신호일의 가격으로 수량을 다시 확인하세요")
+    return {
+        "제목": "주문 수량표" if 할인율 is None else "하락매수 지정가 주문표",
+        "표": 표,
+        "주문파일": 주문,
+        "잔여현금": float(요약['budget'] - 요약['invested']),
+        "예수금": float(요약['cash'] - (요약['budget'] - 요약['invested'])),
+        "목표오차": float(요약['deviation']),
+        "안내": 안내,
+    }
@@ -0,0 +1,147 @@
+"""
+최종 포트폴리오 구성과 성과 시뮬레이션
+"""
+
+import os
+
+import numpy as np
+
+from dip_buying import compare_ladder, historical_paths, simulated_paths
+from instrumentation import instrumented
+from montecarlo import simulate_portfolio
+from optimizer import ASSET_CLASSES, asset_class_covariance, asset_class_returns
+from rebalancing import compare_policies
+from shared_cache import cached_dataset, current_asof
+
+from .allocation import final_allocation
+from .records import Portfolio
+
+
+def select_core_stocks(선택종목, 선택섹터):
+    """핵심 종목 선정 (선택된 종목들 우선, 없으면 섹터 기반)"""
+    if 선택종목:
+        return list(선택종목)[:5]  # 최대 5개
+
+    # 섹터 기반 기본 종목
+    기본종목 = []
+    if "AI/반도체" in 선택섹터:
+        기본종목.extend(["삼성전자", "네이버"])
+    if "로봇/자동화" in 선택섹터:
+        기본종목.append("레인보우로보틱스")
+    if "2차전지" in 선택섹터:
+        기본종목.append("LG에너지솔루션")
+    if "바이오/헬스" in 선택섹터:
+        기본종목.append("셀트리온")
+
+    if not 기본종목:  # 선택된 섹터가 없으면 기본 우량주
+        기본종목 = ["삼성전자", "LG에너지솔루션", "셀트리온"]
+
+    return 기본종목[:5]
+
+
+def allocation_amounts(사용자자산, 배분):
+    """자산군 비중(%)별 투자 금액 (원, 원 단위 절사)"""
+    return {자산: int(사용자자산 * 비중 / 100) for 자산, 비중 in 배분.items()}
+
+
+def assemble_final_portfolio(최적화결과, 핵심종목, 자산별금액, 사용자자산):
+    """최적화 결과·핵심 종목·투자 금액을 최종 포트폴리오 레코드(Portfolio)로 조합"""
+    return Portfolio(
+        배분=최적화결과["비중"],
+        종목=핵심종목,
+        수익률=최적화결과["수익률"],
+        위험도=최적화결과["위험도"],
+        샤프=최적화결과["샤프"],
+        최적화방식=최적화결과["최적화방식"],
+        기대수익률=최적화결과["기대수익률"],
+        투자금액=자산별금액,
+        총자산=사용자자산,
+    )
+
+
+@instrumented("plan.final_portfolio")
+def generate_final_portfolio(inputs):
+    """사용자 선택(PlanInputs)을 기반으로 최종 포트폴리오 생성
+
+    반환값: 배분(%), 종목, 수익률, 위험도, 샤프, 최적화방식, 기대수익률, 투자금액(원), 총자산(원)
+    """
+    사용자자산 = inputs.자산
+    최적화결과 = final_allocation(inputs.성향, inputs.choice_macro, inputs.choice_alloc)
+    핵심종목 = select_core_stocks(inputs.picks or [], inputs.choice_sector or [])
+    자산별금액 = allocation_amounts(사용자자산, 최적화결과["비중"])
+    return assemble_final_portfolio(최적화결과, 핵심종목, 자산별금액, 사용자자산)
+
+
+@instrumented("plan.portfolio_simulation")
+def get_portfolio_simulation(final_portfolio, 투자기간, 월적립금, on_batch=None):
+    """최종 포트폴리오 몬테카를로 시뮬레이션 (세션 공용 캐시, 계산 중에는 배치마다 on_batch 호출)"""
+    asof = current_asof()
+    비중 = tuple(final_portfolio['배분'][자산] / 100 for 자산 in ASSET_CLASSES)
+    기대수익률 = tuple(final_portfolio['기대수익률'][자산] for 자산 in ASSET_CLASSES)
+    조건 = (비중, 기대수익률, final_portfolio['총자산'], 투자기간, 월적립금)
+
+    def compute():
+        공분산, _ = asset_class_covariance(asof)
+        return simulate_portfolio(
+            비중, 기대수익률, 공분산, final_portfolio['총자산'], 투자기간,
+            contribution=월적립금, seed=0, workers=os.cpu_count(), on_batch=on_batch
+        )
+
+    return cached_dataset("portfolio_simulation", compute, ticker=조건, asof=asof)
+
+
+# 리밸런싱 비교에 쓰는 과거 구간 (년, 가격 이력이 더 짧으면 있는 구간만)
+REBALANCE_LOOKBACK_YEARS = 20
+
+
+@instrumented("plan.rebalancing")
+def get_rebalancing_comparison(final_portfolio, years=REBALANCE_LOOKBACK_YEARS):
+    """확정 배분을 과거 자산군 수익률에 재현한 리밸런싱 주기별 회전율·비용·추적오차 (세션 공용 캐시)
+
+    반환값: rebalancing.compare_policies 결과 {"years", "policies": {주기: {...}}}
+    """
+    asof = current_asof()
+    비중 = tuple(final_portfolio['배분'][자산] / 100 for 자산 in ASSET_CLASSES)
+
+    def compute():
+        수익률 = asset_class_returns(asof, years)
+        return compare_policies(수익률.to_numpy(), 비중, ASSET_CLASSES)
+
+    return cached_dataset("rebalancing", compute, ticker=(비중, years), asof=asof)
+
+
+def _dip_buying_paths(final_portfolio, horizon, years):
+    """확정 배분 포트폴리오 지수의 과거·모의 경로 (세션 공용 캐시, 배분·대기기간마다 한 번)"""
+    asof = current_asof()
+    비중 = tuple(final_portfolio['배분'][자산] / 100 for 자산 in ASSET_CLASSES)
+
+    def compute():
+        수익률 = asset_class_returns(asof, years).to_numpy() @ (np.array(비중) / sum(비중))
+        return historical_paths(수익률, horizon), simulated_paths(수익률, horizon, seed=0)
+
+    return cached_dataset("dip_paths", compute, ticker=(비중, horizon, years), asof=asof)
+
+
+@instrumented("plan.dip_buying")
+def get_dip_buying_evaluation(final_portfolio, 사다리, horizon, years=REBALANCE_LOOKBACK_YEARS):
+    """하락매수 사다리 [(하락폭, 비중), ...]를 확정 배분의 과거·모의 경로에 적용
+
+    경로는 배분·대기기간마다 한 번 만들고 사다리를 바꾸면 평가만 다시 합니다.
+    반환값: dip_buying.compare_ladder 결과 {"historical": {...}, "simulated": {...}}
+    """
+    과거경로, 모의경로 = _dip_buying_paths(final_portfolio, horizon, years)
+    return compare_ladder(과거경로, 모의경로, 사다리)
+
+
+def recommend_allocation_by_tolerance(risk_tolerance):
+    """위험 감수 수준(간편 상담 응답)별 추천 자산배분 (%)"""
+    if not risk_tolerance:
+        return {"현금/예금": 10, "채권": 30, "주식": 50, "대안투자": 10}
+    if "매우 보수적" in risk_tolerance:
+        return {"현금/예금": 40, "채권": 40, "주식": 15, "대안투자": 5}
+    elif "보수적" in risk_tolerance:
+        return {"현금/예금": 20, "채권": 50, "주식": 25, "대안투자": 5}
+    elif "보통" in risk_tolerance:
+        return {"현금/예금": 10, "채권": 30, "주식": 50, "대안투자": 10}
+    else:  # 적극적
+        return {"현금/예금": 5, "채권": 15, "주식": 65, "대안투자": 15}
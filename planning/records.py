@@ -0,0 +1,297 @@
+"""
+세션 레코드 — 프로필·자산배분·최종 포트폴리오를 __slots__ 레코드로 보관
+
+세션 상태에 dict 대신 넣으면 인스턴스마다 키 해시표를 두지 않고 필드 슬롯만 차지하며,
+자산군별 값(비중·금액·기대수익률)은 키 튜플(공유) + array 하나로 저장합니다.
+모두 읽기 전용 Mapping이라 기존 코드의 portfolio['배분'][자산], profile.get('성향')이 그대로 동작합니다.
+
+to_bytes()/from_bytes()는 struct 기반 고정 형식 직렬화(세션 영속화용)이며
+encode_session()/decode_session()은 세션 상태의 계획 관련 키를 한 번에 바이트로 변환합니다.
+"""
+
+import struct
+from array import array
+from collections.abc import Mapping
+
+FORMAT_VERSION = 1
+
+_NONE_LEN = 0xFFFF   # 문자열 길이 자리의 None 표시
+
+# 같은 키 집합(예: ASSET_CLASSES)은 튜플 하나를 모든 벡터가 공유
+_KEYSETS = {}
+
+
+def _keyset(keys):
+    keys = tuple(keys)
+    return _KEYSETS.setdefault(keys, keys)
+
+
+class AssetVector(Mapping):
+    """자산군 → 값 (키 튜플 공유 + array('d' 실수 / 'q' 정수))"""
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys, values, typecode="d"):
+        self._keys = _keyset(keys)
+        self._values = array(typecode, values)
+        if len(self._keys) != len(self._values):
+            raise ValueError("자산군 수와 값 개수가 다릅니다")
+
+    @classmethod
+    def from_mapping(cls, mapping, typecode="d"):
+        if isinstance(mapping, AssetVector) and mapping._values.typecode == typecode:
+            return mapping
+        return cls(mapping.keys(), mapping.values(), typecode)
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"AssetVector({dict(self.items())!r})"
+
+
+# 필드 형식: i 정수, f 실수, s 문자열, S 문자열 튜플, v 실수 벡터, V 정수 벡터, 레코드 클래스(중첩)
+# 모든 필드는 None을 허용합니다 (to_bytes는 값 있는 필드만 기록)
+def _pack_str(out, value):
+    if value is None:
+        out.append(struct.pack("<H", _NONE_LEN))
+        return
+    data = str(value).encode("utf-8")
+    out.append(struct.pack("<H", len(data)))
+    out.append(data)
+
+
+def _unpack_str(buf, pos):
+    (n,) = struct.unpack_from("<H", buf, pos)
+    pos += 2
+    if n == _NONE_LEN:
+        return None, pos
+    return bytes(buf[pos:pos + n]).decode("utf-8"), pos + n
+
+
+def _pack_field(out, kind, value):
+    if kind == "i":
+        out.append(struct.pack("<q", int(value)))
+    elif kind == "f":
+        out.append(struct.pack("<d", float(value)))
+    elif kind == "s":
+        _pack_str(out, value)
+    elif kind == "S":
+        out.append(struct.pack("<H", len(value)))
+        for item in value:
+            _pack_str(out, item)
+    elif kind in ("v", "V"):
+        _pack_field(out, "S", value._keys)
+        out.append(value._values.tobytes())
+    else:
+        blob = value.to_bytes()
+        out.append(struct.pack("<I", len(blob)))
+        out.append(blob)
+
+
+def _unpack_field(buf, pos, kind):
+    if kind == "i":
+        return struct.unpack_from("<q", buf, pos)[0], pos + 8
+    if kind == "f":
+        return struct.unpack_from("<d", buf, pos)[0], pos + 8
+    if kind == "s":
+        return _unpack_str(buf, pos)
+    if kind == "S":
+        (n,) = struct.unpack_from("<H", buf, pos)
+        pos += 2
+        items = []
+        for _ in range(n):
+            item, pos = _unpack_str(buf, pos)
+            items.append(item)
+        return tuple(items), pos
+    if kind in ("v", "V"):
+        keys, pos = _unpack_field(buf, pos, "S")
+        typecode = "d" if kind == "v" else "q"
+        end = pos + len(keys) * 8
+        values = array(typecode)
+        values.frombytes(bytes(buf[pos:end]))
+        return AssetVector(keys, values, typecode), end
+    (n,) = struct.unpack_from("<I", buf, pos)
+    pos += 4
+    return kind.from_bytes(buf[pos:pos + n]), pos + n
+
+
+def _slots(fields):
+    return tuple(name for name, _ in fields)
+
+
+class Record(Mapping):
+    """필드 슬롯 레코드 기반 클래스 — FIELDS: (이름, 형식) 목록, TAG: 직렬화 식별 바이트
+
+    생성 시 빠진 필드는 None이며, Mapping으로는 없는 키로 보입니다.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+    TAG = 0
+
+    def __init__(self, *args, **kwargs):
+        names = self._names()
+        if len(args) > len(names):
+            raise TypeError(f"{type(self).__name__}: 필드는 {len(names)}개입니다")
+        values = dict(zip(names, args))
+        for name, value in kwargs.items():
+            if name not in names or name in values:
+                raise TypeError(f"{type(self).__name__}: 잘못된 필드 {name!r}")
+            values[name] = value
+        for name, kind in self.FIELDS:
+            object.__setattr__(self, name, self._convert(kind, values.get(name)))
+
+    @staticmethod
+    def _convert(kind, value):
+        if value is None:
+            return None
+        if kind == "i":
+            return int(value)
+        if kind == "f":
+            return float(value)
+        if kind == "S":
+            return tuple(value)
+        if kind == "v":
+            return AssetVector.from_mapping(value, "d")
+        if kind == "V":
+            return AssetVector.from_mapping(value, "q")
+        if isinstance(kind, type) and not isinstance(value, kind):
+            return kind.from_mapping(value)
+        return value
+
+    @classmethod
+    def _names(cls):
+        return cls.__slots__
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """dict(또는 Mapping)에서 레코드 생성 — 모르는 키는 무시"""
+        if isinstance(mapping, cls):
+            return mapping
+        return cls(**{name: mapping[name] for name in cls._names() if name in mapping})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}는 읽기 전용입니다")
+
+    # 값이 None인 필드는 없는 키로 취급 (dict에 키가 없던 것과 같게 .get 기본값이 적용됨)
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        return (name for name in self._names() if getattr(self, name) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        return (type(self).from_bytes, (self.to_bytes(),))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._names())
+        return f"{type(self).__name__}({fields})"
+
+    def to_bytes(self):
+        """TAG·버전·값 있는 필드 비트마스크 + 필드 순서대로 값 (None 필드는 생략)"""
+        values = [getattr(self, name) for name in self._names()]
+        present = sum(1 << i for i, value in enumerate(values) if value is not None)
+        out = [struct.pack("<BBI", self.TAG, FORMAT_VERSION, present)]
+        for (_, kind), value in zip(self.FIELDS, values):
+            if value is not None:
+                _pack_field(out, kind, value)
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        buf = memoryview(data)
+        tag, version, present = struct.unpack_from("<BBI", buf, 0)
+        if tag != cls.TAG or version != FORMAT_VERSION:
+            raise ValueError(f"{cls.__name__} 형식이 아닙니다 (tag={tag}, version={version})")
+        pos = struct.calcsize("<BBI")
+        values = {}
+        for i, (name, kind) in enumerate(cls.FIELDS):
+            if present >> i & 1:
+                values[name], pos = _unpack_field(buf, pos, kind)
+        return cls(**values)
+
+
+class Profile(Record):
+    """투자자 프로필 — asset(만원), 성향, 시장, 기간(년)"""
+
+    FIELDS = (("asset", "i"), ("성향", "s"), ("시장", "s"), ("기간", "i"))
+    __slots__ = _slots(FIELDS)
+    TAG = 1
+
+
+class Allocation(Record):
+    """자산배분 최적화 결과 — 비중(%), 수익률, 위험도, 샤프, 최적화방식, 기대수익률"""
+
+    FIELDS = (
+        ("비중", "v"), ("수익률", "f"), ("위험도", "f"), ("샤프", "f"),
+        ("최적화방식", "s"), ("기대수익률", "v"),
+    )
+    __slots__ = _slots(FIELDS)
+    TAG = 2
+
+
+class Portfolio(Record):
+    """최종 포트폴리오 — 배분(%), 종목, 수익률, 위험도, 샤프, 최적화방식, 기대수익률, 투자금액(원), 총자산(원)"""
+
+    FIELDS = (
+        ("배분", "v"), ("종목", "S"), ("수익률", "f"), ("위험도", "f"), ("샤프", "f"),
+        ("최적화방식", "s"), ("기대수익률", "v"), ("투자금액", "V"), ("총자산", "i"),
+    )
+    __slots__ = _slots(FIELDS)
+    TAG = 3
+
+
+class SessionSnapshot(Record):
+    """세션 상태의 계획 관련 키 (영속화·복원용)"""
+
+    FIELDS = (
+        ("profile", Profile), ("choice_macro", "s"), ("choice_alloc", "s"), ("choice_sector", "S"),
+        ("picks", "S"), ("decision", "s"), ("final_portfolio", Portfolio),
+    )
+    __slots__ = _slots(FIELDS)
+    TAG = 4
+
+
+def encode_session(state):
+    """세션 상태(또는 같은 키의 매핑) → 바이트"""
+    profile = state.get("profile")
+    return SessionSnapshot(
+        profile=profile or None,
+        choice_macro=state.get("choice_macro"),
+        choice_alloc=state.get("choice_alloc"),
+        choice_sector=state.get("choice_sector"),
+        picks=state.get("picks"),
+        decision=state.get("decision"),
+        final_portfolio=state.get("final_portfolio"),
+    ).to_bytes()
+
+
+def decode_session(data):
+    """바이트 → 세션 상태에 넣을 dict (목록 키는 앱이 수정할 수 있도록 list로 복원)"""
+    snapshot = SessionSnapshot.from_bytes(data)
+    return {
+        "profile": snapshot.profile if snapshot.profile is not None else {},
+        "choice_macro": snapshot.choice_macro,
+        "choice_alloc": snapshot.choice_alloc,
+        "choice_sector": None if snapshot.choice_sector is None else list(snapshot.choice_sector),
+        "picks": list(snapshot.picks or ()),
+        "decision": snapshot.decision,
+        "final_portfolio": snapshot.final_portfolio,
+    }
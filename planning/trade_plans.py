@@ -0,0 +1,200 @@
+"""
+자산별 트레이드 플랜 (매수 단계, 타이밍 신호, 매도 조건, 위험 신호)
+"""
+
+import functools
+
+from instrumentation import instrumented
+
+from .formatting import format_money
+
+
+@instrumented("plan.asset_trade_plan")
+def generate_asset_trade_plan(자산, 투자금액, 투자방식):
+    """자산 특성에 따라 알맞은 트레이드 플랜 선택"""
+    if "주식" in 자산 or "ETF" in 자산:
+        return generate_stock_trade_plan(자산, 투자금액, 투자방식)
+    elif "채권" in 자산:
+        return generate_bond_trade_plan(자산, 투자금액, 투자방식)
+    elif "현금" in 자산:
+        return generate_cash_trade_plan(자산, 투자금액)
+    else:
+        return generate_default_trade_plan(자산, 투자금액, 투자방식)
+
+
+def generate_stock_trade_plan(자산명, 투자금액, 투자방식):
+    """주식/ETF 모멘텀+RSI 기반 매매 전략 생성"""
+    if 투자방식 == "분할 매수 (DCA)":
+        return {
+            '매수단계': [
+                "1차: RSI 50 이하 + 모멘텀 중립시 40% 매수",
+                "2차: RSI 40 이하 + 모멘텀 상승시 30% 추가", 
+                "3차: RSI 30 이하 + 모멘텀 강화시 20% 추가",
+                "4차: RSI 20 이하 극과매도시 10% 마지막 매수"
+            ],
+            '타이밍신호': [
+                "RSI 30-40 구간 + 20일선 모멘텀 상승",
+                "RSI 과매도 + 60일선 지지 확인",
+                "단기 모멘텀 반등 + 장기 추세 유지",
+                "거래량 증가와 함께 RSI 상승"
+            ],
+            '매도조건': [
+                "RSI 70 이상 + 모멘텀 둔화시 50% 매도",
+                "RSI 80 이상시 30% 추가 매도",
+                "모멘텀 하락 전환 + RSI 피크시 매도 고려",
+                "장기 모멘텀 하락시 전량 매도"
+            ],
+            '위험신호': [
+                "RSI 과매수 + 모멘텀 급격한 둔화",
+                "20일선 데드크로스 + RSI 하락",
+                "거래량 급증과 함께 RSI 급락",
+                "장기 모멘텀 하락 전환 신호"
+            ],
+            '분할스케줄': [
+                {'주차': '1주차', '비중': '40%', '금액': format_money(투자금액 * 0.4), '조건': 'RSI 50↓ + 모멘텀 중립'},
+                {'주차': '2주차', '비중': '30%', '금액': format_money(투자금액 * 0.3), '조건': 'RSI 40↓ + 모멘텀 상승'},
+                {'주차': '3-4주차', '비중': '20%', '금액': format_money(투자금액 * 0.2), '조건': 'RSI 30↓ + 모멘텀 강화'},
+                {'주차': '5-8주차', '비중': '10%', '금액': format_money(투자금액 * 0.1), '조건': 'RSI 20↓ 극과매도'}
+            ]
+        }
+    else:
+        return {
+            '매수단계': [
+                "RSI + 모멘텀 복합신호 확인 후 일시불 매수",
+                "매수 즉시 RSI 80 손절라인 설정",
+                "모멘텀 지속성 확인하여 포지션 유지"
+            ],
+            '타이밍신호': [
+                "RSI 30-40 구간 + 모멘텀 상승 전환",
+                "20일선 골든크로스 + RSI 상승",
+                "거래량 폭증 + RSI 과매도 탈출",
+                "장기 모멘텀 지지 + 단기 반등"
+            ],
+            '매도조건': [
+                "RSI 70 이상 + 모멘텀 피크 확인",
+                "20일선 데드크로스 + RSI 하락",
+                "목표 수익률 달성 + 모멘텀 둔화",
+                "RSI 80 이상 강제 손절"
+            ],
+            '위험신호': [
+                "RSI 급락 + 모멘텀 급속 하락",
+                "거래량 폭증과 함께 RSI 과매수",
+                "장기 모멘텀 하락 전환",
+                "시장 전체 RSI 과열 신호"
+            ]
+        }
+
+
+def generate_bond_trade_plan(자산명, 투자금액, 투자방식):
+    """채권 매매 전략 생성"""
+    return {
+        '매수단계': [
+            "금리 상승 국면에서 단계별 매수",
+            "듀레이션 리스크 고려한 분산 매수",
+            "만기별 래더링 전략 적용"
+        ],
+        '타이밍신호': [
+            "중앙은행 통화정책 변화",
+            "국채 금리 상승 추세",
+            "신용 스프레드 확대",
+            "인플레이션 지표 안정화"
+        ],
+        '매도조건': [
+            "금리 하락 국면 진입",
+            "만기 1년 이내 도달",
+            "신용 등급 하향",
+            "더 좋은 대안 발생"
+        ],
+        '위험신호': [
+            "급격한 금리 변동",
+            "발행기관 신용도 악화",
+            "유동성 부족 현상",
+            "통화정책 불확실성 증가"
+        ]
+    }
+
+
+def generate_cash_trade_plan(자산명, 투자금액):
+    """현금성 자산 관리 전략"""
+    return {
+        '매수단계': [
+            "고금리 예적금 우선 배치",
+            "CMA/MMF 등 유동성 자산 활용",
+            "단기 채권형 펀드 고려"
+        ],
+        '타이밍신호': [
+            "시장 불확실성 증가",
+            "투자 기회 대기",
+            "금리 상승 국면",
+            "포트폴리오 리밸런싱 필요"
+        ],
+        '매도조건': [
+            "매력적인 투자 기회 발생",
+            "금리 하락 전환점",
+            "자산 재배분 필요",
+            "긴급 자금 필요"
+        ],
+        '위험신호': [
+            "인플레이션 급상승",
+            "금리 급락",
+            "통화 가치 하락",
+            "기회비용 증가"
+        ]
+    }
+
+
+def generate_default_trade_plan(자산명, 투자금액, 투자방식):
+    """기본 매매 전략 생성"""
+    return {
+        '매수단계': [
+            "시장 상황 분석 후 매수",
+            "리스크 관리 하에 진입",
+            "분산 투자 원칙 적용"
+        ],
+        '타이밍신호': [
+            "기술적 지표 호전",
+            "펀더멘털 개선",
+            "시장 심리 회복",
+            "거시 환경 안정"
+        ],
+        '매도조건': [
+            "목표 수익률 달성",
+            "투자 논리 변화",
+            "리스크 증가",
+            "더 나은 기회 발생"
+        ],
+        '위험신호': [
+            "예상치 못한 변수",
+            "시장 구조 변화",
+            "유동성 위기",
+            "시스템 리스크"
+        ]
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def pick_monitoring_schedule():
+    """종목별 모멘텀+RSI 모니터링 일정 (모든 종목 공통 — 프로세스당 한 번 구성, 수정하지 말 것)"""
+    import pandas as pd
+
+    return pd.DataFrame({
+        '주기': ['매일 장마감 후', '매주 월요일', '매월 첫째주', '분기별'],
+        '체크포인트': [
+            'RSI 지표 + 20일선 모멘텀 확인',
+            '60일선 장기 모멘텀 추세 점검',
+            '모멘텀 전환점 및 매매 타이밍 재조정',
+            '전체 포지션 리뷰 및 전략 수정'
+        ],
+        '매수 조건': [
+            'RSI < 40 + 모멘텀 상승 전환',
+            'RSI < 30 + 20일선 골든크로스',  
+            '장기 하락 후 모멘텀 반등 신호',
+            '시장 사이클 변화에 따른 재진입'
+        ],
+        '매도 조건': [
+            'RSI > 70 + 모멘텀 둔화',
+            'RSI > 80 or 20일선 데드크로스',
+            '목표 수익률 달성 + 모멘텀 피크',
+            '장기 모멘텀 하락 전환 확인'
+        ]
+    })
@@ -0,0 +1,303 @@
+"""
+AIA 2.0 — 유니버스 종가 행렬 (메모리 맵)
+(거래일 × 종목) float32 종가를 한 파일에 두고 모든 세션·작업자 프로세스가 읽기 전용으로 공유
+
+    python price_matrix.py build     # 종목 마스터 전체 + 지수 종가로 행렬 생성 (가격 저장소 기준)
+    python price_matrix.py update    # 마지막 거래일 이후 새 거래일만 파일 끝에 추가
+    python price_matrix.py info
+
+디렉터리 구성 (AIA_PRICE_MATRIX, 기본 data/price_matrix):
+- close.f32: float32 (거래일 × 종목) 행 우선 — 새 거래일은 파일 끝에 행으로 덧붙임
+- days.i64: 거래일 (1970-01-01 기준 일수, int64)
+- meta.json: 종목 순서, 거래일 수 — 거래일 수를 마지막에 교체하므로 추가 중인 행은 보이지 않습니다
+
+읽기는 np.memmap(mode="r")라 프로세스마다 페이지 캐시를 공유하며 세션별 복사본이 없습니다.
+종목 마스터에 종목이 추가되면 build로 다시 만듭니다. 행렬에 없는 종목이나
+행렬이 아직 따라잡지 못한 기간은 close_series()가 가격 저장소 조회로 대신합니다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from price_store import load_close_series
+
+FORMAT_VERSION = 1
+
+DEFAULT_MATRIX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "price_matrix")
+
+# 기본 이력 시작일 (데모 피드 원점)
+HISTORY_START = "2014-01-02"
+
+# 열린 행렬의 meta.json 변경 재확인 간격 (초)
+RECHECK_SECONDS = 60.0
+
+_CLOSE_FILE = "close.f32"
+_DAYS_FILE = "days.i64"
+_META_FILE = "meta.json"
+
+
+def _day(value):
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+def _index(days):
+    return pd.DatetimeIndex(np.asarray(days, dtype="datetime64[D]").astype("datetime64[ns]"), name="date")
+
+
+class PriceMatrix:
+    """읽기 전용 종가 행렬 (close[거래일, 종목], days[거래일])"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, _META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 행렬 형식입니다: {meta.get('version')}")
+        self.tickers = tuple(meta["tickers"])
+        self.column_index = {t: i for i, t in enumerate(self.tickers)}
+        n_days = int(meta["n_days"])
+        shape = (n_days, len(self.tickers))
+        # 빈 파일은 매핑할 수 없으므로 빈 배열로 대신
+        self.days = (
+            np.memmap(os.path.join(path, _DAYS_FILE), dtype=np.int64, mode="r", shape=(n_days,))
+            if n_days else np.empty(0, dtype=np.int64)
+        )
+        self.close = (
+            np.memmap(os.path.join(path, _CLOSE_FILE), dtype=np.float32, mode="r", shape=shape)
+            if n_days and len(self.tickers) else np.empty(shape, dtype=np.float32)
+        )
+
+    def __len__(self):
+        return len(self.days)
+
+    def __contains__(self, ticker):
+        return ticker in self.column_index
+
+    @property
+    def first_date(self):
+        return pd.Timestamp(np.datetime64(int(self.days[0]), "D")) if len(self.days) else None
+
+    @property
+    def last_date(self):
+        return pd.Timestamp(np.datetime64(int(self.days[-1]), "D")) if len(self.days) else None
+
+    def rows(self, start=None, end=None):
+        """기간(start/end 포함)의 거래일 행 범위 slice"""
+        lo = 0 if start is None else int(np.searchsorted(self.days, _day(start)))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, _day(end), side="right"))
+        return slice(lo, hi)
+
+    def covers(self, start, end):
+        """start~end 구간이 행렬 안에 있는지 (end는 직전 영업일 기준)"""
+        if not len(self.days):
+            return False
+        last_needed = np.busday_offset(np.datetime64(pd.Timestamp(end).date(), "D"), 0, roll="backward")
+        return int(self.days[0]) <= _day(start) and int(self.days[-1]) >= int(last_needed.astype(np.int64))
+
+    def column(self, ticker):
+        """종목 전체 종가 (복사 없는 float32 열 뷰)"""
+        return self.close[:, self.column_index[ticker]]
+
+    def window(self, tickers, start=None, end=None):
+        """(거래일 DatetimeIndex, (거래일 × 종목) float32 행렬) — 종목 순서는 tickers 순서"""
+        rows = self.rows(start, end)
+        cols = [self.column_index[t] for t in tickers]
+        return _index(self.days[rows]), self.close[rows][:, cols]
+
+    def series(self, ticker, start=None, end=None):
+        """가격 저장소 load_close_series()와 같은 형식의 종가 Series (float64)"""
+        rows = self.rows(start, end)
+        values = self.close[rows, self.column_index[ticker]].astype(np.float64)
+        return pd.Series(values, index=_index(self.days[rows]), name="close")
+
+
+def _matrix_path():
+    return os.environ.get("AIA_PRICE_MATRIX", DEFAULT_MATRIX_PATH)
+
+
+def _meta_stamp(path):
+    try:
+        stat = os.stat(os.path.join(path, _META_FILE))
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+_opened = {}   # 경로 -> (확인 시각, meta 스탬프, 행렬)
+_opened_lock = threading.Lock()
+
+
+def load_price_matrix(path=None):
+    """프로세스 공용 종가 행렬 (없으면 None) — meta.json이 바뀌면 다시 매핑"""
+    path = path or _matrix_path()
+    now = time.monotonic()
+    entry = _opened.get(path)
+    if entry is not None and now - entry[0] < RECHECK_SECONDS:
+        return entry[2]
+    with _opened_lock:
+        stamp = _meta_stamp(path)
+        matrix = entry[2] if entry is not None and entry[1] == stamp else None
+        if matrix is None and stamp is not None:
+            try:
+                matrix = PriceMatrix(path)
+            except (OSError, KeyError, ValueError):
+                matrix = None
+        _opened[path] = (now, stamp, matrix)
+        return matrix
+
+
+def close_series(ticker, start, end, base_price, warmup_days=0, **feed_options):
+    """종가 시계열 — 행렬에 있는 종목·기간이면 메모리 맵에서, 아니면 가격 저장소에서 조회
+
+    인자는 load_close_series()와 같으며 base_price·feed_options는 저장소 조회 때만 쓰입니다.
+    """
+    first = pd.Timestamp(start) - pd.Timedelta(days=warmup_days)
+    matrix = load_price_matrix()
+    if matrix is not None and ticker in matrix and matrix.covers(first, end):
+        return matrix.series(ticker, first, end)
+    return load_close_series(ticker, start, end, base_price, warmup_days=warmup_days, **feed_options)
+
+
+def default_universe():
+    """행렬에 담을 종목 [(티커, 기준가, 피드 옵션)] — KOSPI, 자산군 대표 지수, 종목 마스터 전체"""
+    from indicators import TRADING_DAYS
+    from optimizer import ASSET_PROXIES
+    from security_master import load_security_master
+
+    universe = {"KOSPI": (2400.0, {})}
+    for ticker, base_price, annual_vol, drift in ASSET_PROXIES.values():
+        feed = {} if annual_vol is None else {"daily_vol": annual_vol / np.sqrt(TRADING_DAYS), "annual_drift": drift}
+        universe.setdefault(ticker, (base_price, feed))
+    col = load_security_master().columns
+    for code, price in zip(col["code"], col["price"]):
+        universe.setdefault(str(code), (float(price), {}))
+    return [(ticker, price, feed) for ticker, (price, feed) in universe.items()]
+
+
+def _fill(block, days, universe, start, end):
+    """universe 종목 종가를 가격 저장소에서 읽어 block(거래일 × 종목)에 채움 (없는 날은 NaN)"""
+    for j, (ticker, base_price, feed) in enumerate(universe):
+        close = load_close_series(ticker, start, end, base_price=base_price, **feed)
+        source = _day_array(close.index)
+        pos = np.searchsorted(source, days)
+        found = (pos < len(source)) & (source[np.minimum(pos, len(source) - 1)] == days)
+        block[found, j] = close.to_numpy()[pos[found]]
+
+
+def _day_array(index):
+    return np.asarray(pd.DatetimeIndex(index).values.astype("datetime64[D]").astype(np.int64))
+
+
+def _calendar(universe, start, end):
+    """거래일 = 첫 종목(KOSPI) 저장소 거래일"""
+    ticker, base_price, feed = universe[0]
+    return _day_array(load_close_series(ticker, start, end, base_price=base_price, **feed).index)
+
+
+def _write_meta(path, tickers, n_days):
+    tmp = os.path.join(path, f"{_META_FILE}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": FORMAT_VERSION, "dtype": "float32", "tickers": list(tickers), "n_days": n_days},
+                  f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(path, _META_FILE))
+
+
+def build_price_matrix(path=None, start=HISTORY_START, end=None, universe=None):
+    """행렬 전체 생성 (임시 디렉터리에 만든 뒤 교체 — 이미 매핑한 프로세스는 이전 파일을 계속 읽음)"""
+    path = path or _matrix_path()
+    end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end)
+    universe = default_universe() if universe is None else universe
+    days = _calendar(universe, start, end)
+    block = np.full((len(days), len(universe)), np.nan, dtype=np.float32)
+    _fill(block, days, universe, start, end)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    block.tofile(os.path.join(tmp, _CLOSE_FILE))
+    days.astype(np.int64).tofile(os.path.join(tmp, _DAYS_FILE))
+    _write_meta(tmp, [t for t, _, _ in universe], len(days))
+    old = f"{path}.{os.getpid()}.old"
+    if os.path.exists(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return len(days), len(universe)
+
+
+def update_price_matrix(path=None, until=None, universe=None):
+    """마지막 거래일 이후 새 거래일을 파일 끝에 추가하고 추가한 거래일 수 반환
+
+    종목 순서는 그대로이며, 마스터에 새로 생긴 종목은 build 전까지 행렬에 없습니다.
+    (한 번에 하나의 갱신 프로세스만 실행)
+    """
+    path = path or _matrix_path()
+    until = pd.Timestamp.now().normalize() if until is None else pd.Timestamp(until)
+    matrix = PriceMatrix(path)
+    if not len(matrix):
+        raise ValueError("빈 행렬입니다 — build로 다시 만들어주세요")
+    known = {t: (p, f) for t, p, f in (default_universe() if universe is None else universe)}
+    start = matrix.last_date + pd.Timedelta(days=1)
+    if start > until:
+        return 0
+    days = _calendar([(matrix.tickers[0], *known[matrix.tickers[0]])], start, until)
+    if not len(days):
+        return 0
+    # 마스터에서 빠진 종목은 NaN으로 둠
+    present = [j for j, t in enumerate(matrix.tickers) if t in known]
+    fresh = np.full((len(days), len(present)), np.nan, dtype=np.float32)
+    _fill(fresh, days, [(matrix.tickers[j], *known[matrix.tickers[j]]) for j in present], start, until)
+    block = np.full((len(days), len(matrix.tickers)), np.nan, dtype=np.float32)
+    block[:, present] = fresh
+
+    # 이전에 중단된 추가가 남긴 꼬리를 잘라낸 뒤 덧붙이고, meta의 거래일 수를 마지막에 교체
+    row_bytes = len(matrix.tickers) * 4
+    for name, size, data in (
+        (_CLOSE_FILE, len(matrix) * row_bytes, block.tobytes()),
+        (_DAYS_FILE, len(matrix) * 8, days.astype(np.int64).tobytes()),
+    ):
+        with open(os.path.join(path, name), "r+b") as f:
+            f.truncate(size)
+            f.seek(size)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    _write_meta(path, matrix.tickers, len(matrix) + len(days))
+    return len(days)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="유니버스 종가 행렬 생성·갱신")
+    parser.add_argument("command", choices=["build", "update", "info"])
+    parser.add_argument("--path", default=None, help="행렬 디렉터리")
+    parser.add_argument("--start", default=HISTORY_START, help="build 이력 시작일")
+    parser.add_argument("--until", default=None, help="마지막 거래일 (기본: 오늘)")
+    args = parser.parse_args(argv)
+    path = args.path or _matrix_path()
+
+    if args.command == "build":
+        t0 = time.perf_counter()
+        n_days, n_tickers = build_price_matrix(path, args.start, args.until)
+        print(f"행렬 생성: {path} ({n_days:,}거래일 × {n_tickers:,}종목, {time.perf_counter() - t0:.1f}s)")
+    elif args.command == "update":
+        added = update_price_matrix(path, args.until)
+        print(f"새 거래일 {added}일 추가" if added else "이미 최신입니다")
+    matrix = PriceMatrix(path)
+    if not len(matrix):
+        print(f"빈 행렬: {path}")
+        return 1
+    print(f"{matrix.first_date:%Y-%m-%d} ~ {matrix.last_date:%Y-%m-%d}, {len(matrix):,}거래일 × "
+          f"{len(matrix.tickers):,}종목, {matrix.close.nbytes / 2**20:.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
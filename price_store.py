@@ -0,0 +1,342 @@
+"""
+AIA 2.0 — 로컬 OHLCV 가격 저장소
+종목별로 나뉜 일봉 저장소 (SQLite 기본, pyarrow 설치 시 Parquet)
+
+- write(): 과거 이력 일괄 적재 (기존 데이터 대체)
+- append(): 마지막 저장일 이후의 새 봉만 추가
+- read(): 기간 조회 — SQLite는 연도별 컬럼 청크 중 해당 연도만,
+  Parquet은 row group 통계로 필요한 구간만 읽습니다.
+
+AIA_PRICE_STORE 환경변수로 저장소 위치를 바꿀 수 있습니다.
+(.db/.sqlite 파일이면 SQLite, 그 외 디렉터리면 Parquet)
+"""
+
+import os
+import sqlite3
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 백엔드는 선택 사항
+    pa = None
+    pq = None
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "prices.sqlite")
+
+# Parquet row group 크기 (약 1년치 거래일) — 기간 조회 시 통계 기반 건너뛰기 단위
+PARQUET_ROW_GROUP = 252
+
+
+def _to_days(dates):
+    """날짜 배열을 1970-01-01 기준 일수(int64)로 변환"""
+    return np.asarray(pd.to_datetime(dates).values.astype("datetime64[D]").astype(np.int64))
+
+
+def _day(value):
+    """단일 날짜를 일수로 변환 (None은 그대로)"""
+    if value is None:
+        return None
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+def _frame(days, values):
+    """일수 배열 + OHLCV 배열로 날짜 인덱스 DataFrame 생성"""
+    index = pd.DatetimeIndex(np.asarray(days, dtype="datetime64[D]").astype("datetime64[ns]"), name="date")
+    return pd.DataFrame(values, index=index, columns=BAR_COLUMNS)
+
+
+def _normalize(bars):
+    """입력 봉 데이터를 날짜 오름차순·중복 제거된 DataFrame으로 정리"""
+    bars = bars.copy()
+    bars.index = pd.to_datetime(bars.index).normalize()
+    bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+    for column in BAR_COLUMNS:
+        if column not in bars:
+            bars[column] = bars["close"] if column != "volume" else 0.0
+    return bars[BAR_COLUMNS].astype(np.float64)
+
+
+class SQLitePriceStore:
+    """SQLite 기반 컬럼형 가격 저장소
+
+    (종목, 연도)별로 한 행에 날짜·OHLCV 컬럼을 각각 float64/int64 BLOB으로 저장합니다.
+    10년치 조회는 약 11행을 읽어 np.frombuffer로 바로 배열화하므로 행 단위
+    테이블보다 훨씬 빠르고, first_day/last_day 컬럼으로 기간 밖 연도는 건너뜁니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    ticker TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    first_day INTEGER NOT NULL,
+                    last_day INTEGER NOT NULL,
+                    day BLOB, open BLOB, high BLOB, low BLOB, close BLOB, volume BLOB,
+                    PRIMARY KEY (ticker, year)
+                ) WITHOUT ROWID
+            """)
+
+    def _connect(self):
+        # 스트림릿 세션마다 스레드가 다르므로 호출마다 연결을 엽니다 (연결 비용 < 0.1ms)
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _decode(row):
+        """chunks 행(day, open, ..., volume BLOB)을 (일수 배열, OHLCV 배열)로 변환"""
+        days = np.frombuffer(row[0], dtype=np.int64)
+        values = np.column_stack([np.frombuffer(blob, dtype=np.float64) for blob in row[1:]])
+        return days, values
+
+    def _put(self, conn, ticker, days, values):
+        """연도별 청크로 나누어 저장 (같은 연도 청크는 대체)"""
+        years = days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+        bounds = np.flatnonzero(np.diff(years)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(days)]):
+            conn.execute(
+                "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ticker, int(years[lo]), int(days[lo]), int(days[hi - 1]),
+                 days[lo:hi].tobytes(),
+                 *(np.ascontiguousarray(values[lo:hi, k]).tobytes() for k in range(len(BAR_COLUMNS)))),
+            )
+
+    def tickers(self):
+        """저장된 종목 목록"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT ticker FROM chunks ORDER BY ticker")]
+
+    def last_date(self, ticker):
+        """마지막 저장일 (없으면 None)"""
+        with self._connect() as conn:
+            (day,) = conn.execute("SELECT MAX(last_day) FROM chunks WHERE ticker = ?", (ticker,)).fetchone()
+        return None if day is None else pd.Timestamp(np.datetime64(day, "D"))
+
+    def write(self, ticker, bars):
+        """종목 이력 전체를 일괄 적재 (기존 데이터 대체)"""
+        bars = _normalize(bars)
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM chunks WHERE ticker = ?", (ticker,))
+            if len(bars):
+                self._put(conn, ticker, _to_days(bars.index), bars.to_numpy())
+        return len(bars)
+
+    def append(self, ticker, bars):
+        """마지막 저장일 이후의 새 봉만 추가하고 추가된 건수 반환
+
+        새 봉이 들어갈 마지막 연도 청크만 다시 쓰고 이전 연도는 건드리지 않습니다.
+        """
+        bars = _normalize(bars)
+        with self._lock, self._connect() as conn:
+            tail = conn.execute(
+                "SELECT day, open, high, low, close, volume FROM chunks "
+                "WHERE ticker = ? ORDER BY year DESC LIMIT 1",
+                (ticker,),
+            ).fetchone()
+            days = _to_days(bars.index)
+            values = bars.to_numpy()
+            if tail is not None:
+                tail_days, tail_values = self._decode(tail)
+                fresh = days > tail_days[-1]
+                days, values = days[fresh], values[fresh]
+                added = len(days)
+                if added:
+                    days = np.concatenate([tail_days, days])
+                    values = np.concatenate([tail_values, values])
+            else:
+                added = len(days)
+            if added:
+                self._put(conn, ticker, days, values)
+        return added
+
+    def read(self, ticker, start=None, end=None):
+        """기간 조회 (start/end 포함, 날짜 인덱스 DataFrame)"""
+        lo = _day(start) if start is not None else np.iinfo(np.int64).min
+        hi = _day(end) if end is not None else np.iinfo(np.int64).max
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT day, open, high, low, close, volume FROM chunks "
+                "WHERE ticker = ? AND last_day >= ? AND first_day <= ? ORDER BY year",
+                (ticker, lo, hi),
+            ).fetchall()
+        if not rows:
+            return _frame([], np.empty((0, len(BAR_COLUMNS))))
+        decoded = [self._decode(row) for row in rows]
+        days = np.concatenate([d for d, _ in decoded])
+        values = np.concatenate([v for _, v in decoded])
+        mask = slice(np.searchsorted(days, lo), np.searchsorted(days, hi, side="right"))
+        return _frame(days[mask], values[mask])
+
+
+class ParquetPriceStore:
+    """Parquet 기반 가격 저장소 (root/ticker=종목/part-NNNNN.parquet)
+
+    append()는 새 봉만 담은 part 파일을 추가하고, compact()로 병합합니다.
+    """
+
+    def __init__(self, root):
+        if pq is None:
+            raise ImportError("Parquet 가격 저장소를 사용하려면 pyarrow를 설치해주세요")
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, ticker):
+        return os.path.join(self.root, f"ticker={ticker}")
+
+    def _parts(self, ticker):
+        directory = self._dir(ticker)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".parquet"))
+
+    def _write_part(self, ticker, bars, number):
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        table = pa.table({"day": _to_days(bars.index), **{c: bars[c].to_numpy() for c in BAR_COLUMNS}})
+        path = os.path.join(self._dir(ticker), f"part-{number:05d}.parquet")
+        pq.write_table(table, path, row_group_size=PARQUET_ROW_GROUP)
+
+    def tickers(self):
+        """저장된 종목 목록"""
+        return sorted(d.split("=", 1)[1] for d in os.listdir(self.root) if d.startswith("ticker="))
+
+    def last_date(self, ticker):
+        """마지막 저장일 (part 파일 메타데이터 통계만 읽음)"""
+        last = None
+        for path in self._parts(ticker):
+            meta = pq.ParquetFile(path).metadata
+            column = meta.schema.to_arrow_schema().get_field_index("day")
+            for i in range(meta.num_row_groups):
+                stats = meta.row_group(i).column(column).statistics
+                if stats is not None and stats.has_min_max:
+                    last = stats.max if last is None else max(last, stats.max)
+        return None if last is None else pd.Timestamp(np.datetime64(last, "D"))
+
+    def write(self, ticker, bars):
+        """종목 이력 전체를 일괄 적재 (기존 part 파일 대체)"""
+        bars = _normalize(bars)
+        with self._lock:
+            for path in self._parts(ticker):
+                os.remove(path)
+            self._write_part(ticker, bars, 0)
+        return len(bars)
+
+    def append(self, ticker, bars):
+        """마지막 저장일 이후의 새 봉만 새 part 파일로 추가"""
+        bars = _normalize(bars)
+        with self._lock:
+            last = self.last_date(ticker)
+            if last is not None:
+                bars = bars[bars.index > last]
+            if len(bars):
+                self._write_part(ticker, bars, len(self._parts(ticker)))
+        return len(bars)
+
+    def compact(self, ticker):
+        """part 파일들을 하나로 병합"""
+        bars = self.read(ticker)
+        return self.write(ticker, bars)
+
+    def read(self, ticker, start=None, end=None):
+        """기간 조회 (row group 통계로 범위 밖 구간은 읽지 않음)"""
+        parts = self._parts(ticker)
+        if not parts:
+            return _frame([], np.empty((0, len(BAR_COLUMNS))))
+        filters = []
+        if start is not None:
+            filters.append(("day", ">=", _day(start)))
+        if end is not None:
+            filters.append(("day", "<=", _day(end)))
+        table = pq.read_table(parts, filters=filters or None)
+        days = table.column("day").to_numpy()
+        order = np.argsort(days, kind="stable")
+        values = np.column_stack([table.column(c).to_numpy() for c in BAR_COLUMNS])
+        return _frame(days[order], values[order])
+
+
+def open_price_store(path):
+    """경로 형식에 맞는 저장소 생성 (.db/.sqlite → SQLite, 그 외 → Parquet 디렉터리)"""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLitePriceStore(path)
+    return ParquetPriceStore(path)
+
+
+@lru_cache(maxsize=1)
+def default_price_store():
+    """프로세스 공용 가격 저장소"""
+    return open_price_store(os.environ.get("AIA_PRICE_STORE", DEFAULT_STORE_PATH))
+
+
+# 데모용 가격 피드 — 실제 시세 API 연동 전까지 사용하는 결정적(시드 고정) 합성 일봉
+_SYNTHETIC_ORIGIN = pd.Timestamp("2014-01-02")
+_SYNTHETIC_ANCHOR = pd.Timestamp("2024-01-02")
+
+
+def synthetic_bars(ticker, start, end, base_price, daily_vol=0.012, annual_drift=0.0):
+    """종목별 시드로 생성한 합성 일봉 (같은 종목·날짜는 항상 같은 값)
+
+    기준일(2024-01-02) 종가가 base_price가 되도록 맞추고,
+    원점부터 순서대로 난수를 뽑아 조회 구간이 달라도 값이 바뀌지 않습니다.
+    """
+    last = max(pd.Timestamp(end), _SYNTHETIC_ANCHOR)
+    dates = pd.bdate_range(_SYNTHETIC_ORIGIN, last)
+    rng = np.random.default_rng(zlib.crc32(ticker.encode("utf-8")))
+    noise = rng.standard_normal((len(dates), 3))
+    log_close = np.cumsum(noise[:, 0] * daily_vol + annual_drift / 252)
+    anchor = dates.searchsorted(_SYNTHETIC_ANCHOR)
+    close = base_price * np.exp(log_close - log_close[anchor])
+
+    prev_close = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev_close * np.exp(noise[:, 1] * daily_vol * 0.3)
+    spread = np.abs(noise[:, 2]) * daily_vol * 0.5
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = np.round(1_000_000 * np.exp(noise[:, 2] * 0.3))
+
+    bars = pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=pd.DatetimeIndex(dates, name="date"),
+    )
+    return bars.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+
+def sync_history(store, ticker, fetch, until, history_start=_SYNTHETIC_ORIGIN):
+    """저장소를 until까지 최신화 — 처음엔 전체 이력 적재, 이후엔 새 봉만 추가
+
+    fetch(ticker, start, end)는 OHLCV DataFrame을 반환하는 시세 조회 함수입니다.
+    """
+    until = pd.Timestamp(until).normalize()
+    last = store.last_date(ticker)
+    if last is None:
+        return store.write(ticker, fetch(ticker, history_start, until))
+    if last >= until:
+        return 0
+    return store.append(ticker, fetch(ticker, last + pd.Timedelta(days=1), until))
+
+
+def load_close_series(ticker, start, end, base_price, warmup_days=0, store=None, **feed_options):
+    """차트용 종가 시계열 조회 (저장소에 없으면 데모 피드로 적재 후 조회)
+
+    warmup_days를 주면 지표 계산용으로 시작일 이전 구간까지 함께 반환합니다.
+    feed_options(daily_vol, annual_drift)는 데모 피드에 그대로 전달됩니다.
+    """
+    store = store or default_price_store()
+    sync_history(
+        store, ticker,
+        lambda t, s, e: synthetic_bars(t, s, e, base_price, **feed_options),
+        end,
+    )
+    first = pd.Timestamp(start) - pd.Timedelta(days=warmup_days)
+    return store.read(ticker, first, end)["close"]
@@ -0,0 +1,152 @@
+"""
+AIA 2.0 — 리밸런싱 주기 시뮬레이터
+확정 포트폴리오 목표 비중을 과거 자산군 일간 수익률에 재현해 Trade Planner의 리밸런싱 주기 선택지를 비교합니다.
+
+정책 (tab_trade_planner 리밸런싱 주기 선택지와 같은 이름)
+- 분기별/반기별/연간: 63/126/252거래일마다
+- 편차 20% 도달시: 어느 자산이든 목표 비중 대비 ±20%(상대) 벗어난 날
+- 시장 상황 변화시: 기준 자산(주식) 지수가 120일 이동평균을 상향·하향 돌파한 날 (직전 조정 후 21거래일 이내 재전환은 무시)
+
+조정은 당일 종가에 목표 비중으로 되돌리며 수수료·매도 시 증권거래세·호가 스프레드(슬리피지)를
+매매 금액에 곱해 평가금액에서 차감합니다. 최초 매수 비용은 모든 정책에 같으므로 제외합니다.
+조정 사이 구간은 누적 수익률(cumprod) 한 번으로 계산하고, 편차 정책은 그 구간에서
+처음 한도를 넘는 날을 배열 연산으로 찾으므로 20년 일봉 5개 정책이 수 ms에 끝납니다.
+
+추적오차는 매일 목표 비중을 유지하는 무비용 포트폴리오 대비 일간 수익률 차이의 연율화 표준편차입니다.
+"""
+
+import numpy as np
+
+from indicators import TRADING_DAYS
+
+# 정책 이름 → (방식, 매개변수)
+POLICIES = {
+    "분기별 (3개월)": ("calendar", TRADING_DAYS // 4),
+    "반기별 (6개월)": ("calendar", TRADING_DAYS // 2),
+    "연간 (12개월)": ("calendar", TRADING_DAYS),
+    "편차 20% 도달시": ("drift", 0.20),
+    "시장 상황 변화시": ("regime", 120),
+}
+
+# 시장 상황 정책의 최소 조정 간격 (거래일)
+REGIME_MIN_GAP = 21
+
+# 자산군별 거래비용 (매매 금액 대비 비율, 슬리피지는 호가 스프레드 절반 bp)
+DEFAULT_COSTS = {
+    "commission": {"채권": 0.00015, "주식": 0.00015, "현금": 0.0, "금": 0.00015},   # 편도 수수료
+    "transaction_tax": {"주식": 0.0018},                                            # 매도 시 증권거래세 (농특세 포함)
+    "slippage_bps": {"채권": 3.0, "주식": 5.0, "현금": 0.0, "금": 8.0},
+}
+
+
+def cost_rates(assets, costs=None):
+    """자산 순서의 (매수 비용률, 매도 비용률) 배열"""
+    costs = DEFAULT_COSTS if costs is None else costs
+    commission = np.array([costs.get("commission", {}).get(a, 0.0) for a in assets])
+    slippage = np.array([costs.get("slippage_bps", {}).get(a, 0.0) for a in assets]) / 10000.0
+    tax = np.array([costs.get("transaction_tax", {}).get(a, 0.0) for a in assets])
+    return commission + slippage, commission + slippage + tax
+
+
+def regime_change_days(returns, column, window=120, min_gap=REGIME_MIN_GAP):
+    """기준 자산 지수가 이동평균을 돌파한 날(인덱스) — 직전 전환 후 min_gap일 이내 재전환 제외"""
+    level = np.cumprod(1.0 + returns[:, column])
+    if len(level) <= window:
+        return np.empty(0, dtype=np.int64)
+    csum = np.concatenate([[0.0], np.cumsum(level)])
+    ma = (csum[window:] - csum[:-window]) / window          # ma[i] = level[i:i+window] 평균
+    above = level[window - 1:] > ma
+    flips = np.flatnonzero(above[1:] != above[:-1]) + window
+    days = []
+    for day in flips.tolist():
+        if not days or day - days[-1] >= min_gap:
+            days.append(day)
+    return np.array(days, dtype=np.int64)
+
+
+def simulate_rebalancing(returns, weights, policy, buy_rate, sell_rate, regime_days=None):
+    """정책 하나로 목표 비중 재현 — 일별 평가금액(시작 1, 비용 차감)과 조정 통계
+
+    returns: (거래일 × 자산) 일간 수익률, weights: 목표 비중 (합 1)
+    """
+    kind, param = POLICIES[policy]
+    returns = np.asarray(returns, dtype=np.float64)
+    target = np.asarray(weights, dtype=np.float64)
+    n_days = len(returns)
+    growth = 1.0 + returns
+    value = np.empty(n_days)
+    watched = target > 0
+    limit = param * target
+
+    level = 1.0
+    start = 0
+    rebalances = 0
+    turnover = 0.0
+    kept = 1.0
+    while start < n_days:
+        if kind == "calendar":
+            stop = min(start + param, n_days)
+        elif kind == "regime":
+            k = np.searchsorted(regime_days, start)
+            stop = int(regime_days[k]) + 1 if k < len(regime_days) else n_days
+        else:
+            stop = n_days
+        holdings = target * np.cumprod(growth[start:stop], axis=0)
+        total = holdings.sum(axis=1)
+        if kind == "drift":
+            drifted = holdings / total[:, None]
+            breach = (np.abs(drifted - target) > limit) & watched
+            hit = np.flatnonzero(breach.any(axis=1))
+            if len(hit):
+                stop = start + int(hit[0]) + 1
+        value[start:stop] = level * total[:stop - start]
+        level = value[stop - 1]
+        if stop >= n_days:
+            break
+
+        drift = holdings[stop - start - 1] / total[stop - start - 1]
+        trade = target - drift
+        bought = np.clip(trade, 0.0, None)
+        sold = np.clip(-trade, 0.0, None)
+        cost = float(bought @ buy_rate + sold @ sell_rate)
+        level *= 1.0 - cost
+        value[stop - 1] = level
+        kept *= 1.0 - cost
+        turnover += float(bought.sum())
+        rebalances += 1
+        start = stop
+
+    return {"value": value, "rebalances": rebalances, "turnover": turnover, "kept": kept}
+
+
+def compare_policies(returns, weights, assets, costs=None, market_asset="주식", policies=None):
+    """정책별 연 회전율·비용 부담·추적오차·연수익률
+
+    반환값: {"years", "policies": {정책: {rebalances, turnover, cost_drag, tracking_error, cagr}}}
+    turnover는 연간 편도 매매 비중 합, cost_drag는 비용으로 줄어든 연수익률(비율)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    buy_rate, sell_rate = cost_rates(assets, costs)
+    n_days = len(returns)
+    years = n_days / TRADING_DAYS
+    ideal = returns @ weights
+    column = list(assets).index(market_asset) if market_asset in assets else int(np.argmax(returns.std(axis=0)))
+    regime_days = None
+
+    results = {}
+    for policy in policies or POLICIES:
+        if POLICIES[policy][0] == "regime" and regime_days is None:
+            regime_days = regime_change_days(returns, column, POLICIES[policy][1])
+        run = simulate_rebalancing(returns, weights, policy, buy_rate, sell_rate, regime_days)
+        value = run["value"]
+        daily = np.diff(value, prepend=1.0) / np.concatenate([[1.0], value[:-1]])
+        results[policy] = {
+            "rebalances": run["rebalances"],
+            "turnover": run["turnover"] / years if years else 0.0,
+            "cost_drag": 1.0 - run["kept"] ** (1.0 / years) if years else 0.0,
+            "tracking_error": float(np.std(daily - ideal, ddof=1) * np.sqrt(TRADING_DAYS)) if n_days > 1 else 0.0,
+            "cagr": float(value[-1] ** (1.0 / years) - 1.0) if years else 0.0,
+        }
+    return {"years": years, "policies": results}
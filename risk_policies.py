@@ -0,0 +1,140 @@
+"""
+AIA 2.0 — 위험 관리 방식 평가기
+Trade Planner 위험 관리 방식 선택지를 종목의 과거·모의 가격 경로 수천 개에 한 번에 적용합니다.
+
+경로는 시작가 1로 정규화한 (경로 × 보유일+1) 행렬입니다.
+- historical_paths(): 과거 종가의 겹치는 보유기간 구간 전체 (10년 일봉, 6개월 보유면 약 2,400개)
+- simulated_paths(): 과거 일간 로그수익률 평균·표준편차로 만든 기하 브라운 운동 경로
+
+정책 (선택지와 같은 이름)
+- 스톱로스 -20% / -15%: 진입가 대비 고정 손절
+- 시장상황 모니터링: 5거래일마다 점검해 20일 수익률이 -10% 미만이면 청산
+- 장기 보유: 청산하지 않음 (비교 기준)
+- 변동성 기준 조정: 고점 대비 2×(일간 변동성×√20) 하락 시 청산하는 추적 손절 (5~35%로 제한)
+
+청산일은 (경로 × 일) 조건 행렬의 첫 True 위치(argmax)로 찾고, 청산 후에는 현금으로 봅니다.
+지표 (장기 보유 대비)
+- drawdown_cut: 평균 최대낙폭 감소폭
+- whipsaw_rate: 청산된 경로 중 보유기간 말 가격이 청산가보다 높았던 비율 (괜히 판 비율)
+- return_given_up: 평균 수익률 차이 (보유 − 정책, 음수면 정책이 유리)
+"""
+
+import numpy as np
+
+# 정책 이름 → (방식, 매개변수)
+RISK_POLICIES = {
+    "스톱로스 -20%": ("stop", 0.20),
+    "스톱로스 -15%": ("stop", 0.15),
+    "시장상황 모니터링": ("monitor", 0.10),
+    "장기 보유": ("hold", None),
+    "변동성 기준 조정": ("trailing_vol", 2.0),
+}
+
+# 보유 기간 (거래일, 6개월)
+DEFAULT_HORIZON = 126
+
+# 모니터링 정책: 점검 간격·수익률 기간 (거래일)
+MONITOR_EVERY = 5
+MONITOR_LOOKBACK = 20
+
+# 변동성 추적 손절폭 범위
+TRAILING_RANGE = (0.05, 0.35)
+
+# 목표가에 쓰는 정책 수익률 분위
+TARGET_QUANTILE = 0.75
+
+
+def daily_volatility(close):
+    """종가 배열의 일간 로그수익률 표준편차"""
+    close = np.asarray(close, dtype=np.float64)
+    close = close[np.isfinite(close)]
+    if len(close) < 3:
+        return 0.0
+    return float(np.std(np.diff(np.log(close)), ddof=1))
+
+
+def historical_paths(close, horizon=DEFAULT_HORIZON):
+    """과거 종가의 겹치는 horizon일 구간 전체를 시작가 1로 정규화한 경로 (경로 × horizon+1)"""
+    close = np.asarray(close, dtype=np.float64)
+    close = close[np.isfinite(close)]
+    if len(close) <= horizon:
+        return np.empty((0, horizon + 1))
+    windows = np.lib.stride_tricks.sliding_window_view(close, horizon + 1)
+    return windows / windows[:, :1]
+
+
+def simulated_paths(close, horizon=DEFAULT_HORIZON, n_paths=2000, seed=0):
+    """과거 일간 로그수익률 평균·표준편차를 따르는 모의 경로 (경로 × horizon+1)"""
+    close = np.asarray(close, dtype=np.float64)
+    close = close[np.isfinite(close)]
+    log_returns = np.diff(np.log(close)) if len(close) > 2 else np.zeros(2)
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(log_returns.mean(), log_returns.std(ddof=1), (n_paths, horizon))
+    paths = np.ones((n_paths, horizon + 1))
+    paths[:, 1:] = np.exp(np.cumsum(steps, axis=1))
+    return paths
+
+
+def _exit_days(paths, peak, kind, param, daily_vol):
+    """경로별 청산일 (청산 없으면 -1)과 정책 손절폭 (고정 규칙이 없으면 None) — peak: 경로별 누적 고점"""
+    n_paths, n_days = paths.shape
+    if kind == "hold":
+        return np.full(n_paths, -1), None
+    if kind == "stop":
+        breach = paths <= 1.0 - param
+        level = param
+    elif kind == "trailing_vol":
+        level = float(np.clip(param * daily_vol * np.sqrt(MONITOR_LOOKBACK), *TRAILING_RANGE))
+        breach = paths <= peak * (1.0 - level)
+    else:  # monitor
+        breach = np.zeros(paths.shape, dtype=bool)
+        checks = np.arange(MONITOR_LOOKBACK, n_days, MONITOR_EVERY)
+        breach[:, checks] = paths[:, checks] / paths[:, checks - MONITOR_LOOKBACK] - 1.0 < -param
+        level = None
+    first = breach.argmax(axis=1)
+    return np.where(breach[np.arange(n_paths), first], first, -1), level
+
+
+def evaluate_policies(paths, daily_vol, policies=None):
+    """정책별 경로 평가
+
+    반환값: {정책: {exit_rate, drawdown_cut, whipsaw_rate, return_given_up, mean_return,
+                   stop_level, trailing, exit_loss, upside, paths}}
+    stop_level은 규칙상 손절폭(없으면 None, trailing이면 고점 대비 추적 손절폭),
+    exit_loss는 진입가 아래에서 청산된 경로의 손실 중앙값 (손실 청산이 없으면 None),
+    upside는 정책 적용 수익률의 TARGET_QUANTILE 분위
+    """
+    paths = np.asarray(paths, dtype=np.float64)
+    n_paths, n_days = paths.shape
+    final = paths[:, -1]
+    hold_return = final - 1.0
+    rows = np.arange(n_paths)
+    # 누적 고점과 그날까지의 최대낙폭 — 정책별 최대낙폭은 청산일 값만 읽으면 됨
+    peak = np.maximum.accumulate(paths, axis=1)
+    running_drawdown = np.maximum.accumulate(1.0 - paths / peak, axis=1)
+    hold_drawdown = running_drawdown[:, -1]
+
+    results = {}
+    for policy in policies or RISK_POLICIES:
+        kind, param = RISK_POLICIES[policy]
+        exit_day, level = _exit_days(paths, peak, kind, param, daily_vol)
+        exited = exit_day >= 0
+        last = np.where(exited, exit_day, n_days - 1)
+        exit_price = paths[rows, last]
+        policy_return = exit_price - 1.0
+        drawdown = running_drawdown[rows, last]
+        n_exited = int(exited.sum())
+        losing = exited & (exit_price < 1.0)
+        results[policy] = {
+            "exit_rate": n_exited / n_paths if n_paths else 0.0,
+            "drawdown_cut": float(hold_drawdown.mean() - drawdown.mean()) if n_paths else 0.0,
+            "whipsaw_rate": float((final[exited] > exit_price[exited]).mean()) if n_exited else 0.0,
+            "return_given_up": float((hold_return - policy_return).mean()) if n_paths else 0.0,
+            "mean_return": float(policy_return.mean()) if n_paths else 0.0,
+            "stop_level": level,
+            "trailing": kind == "trailing_vol",
+            "exit_loss": float(np.median(1.0 - exit_price[losing])) if losing.any() else None,
+            "upside": float(np.quantile(policy_return, TARGET_QUANTILE)) if n_paths else 0.0,
+            "paths": n_paths,
+        }
+    return results
@@ -0,0 +1,110 @@
+"""
+AIA 2.0 — 섹터 상대강도
+구성 종목 종가를 섹터 지수로 합산하고 KOSPI 대비 1/3/6개월 상대강도를 계산
+
+섹터 지수는 (섹터 × 종목) 가중치 행렬과 종가 행렬의 곱 한 번으로 만들며,
+가중치는 시가총액(보유 주식수 고정) 또는 동일가중(기준일 동일 금액)입니다.
+새 봉이 들어오면 append()가 종가 벡터 하나만 곱해 지수 한 열을 추가하므로
+과거 이력을 다시 읽거나 계산하지 않습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 상대강도 기간 (거래일)
+HORIZONS = {"1개월": 21, "3개월": 63, "6개월": 126}
+
+WEIGHTINGS = ("market_cap", "equal")
+
+
+class SectorStrength:
+    """섹터 지수 + KOSPI 대비 상대강도
+
+    prices: (종목 × 거래일) 종가 행렬, dates: 거래일, sectors: 종목별 섹터,
+    market_caps: 종목별 최근 시가총액, benchmark: 거래일별 KOSPI 종가
+    """
+
+    def __init__(self, prices, dates, sectors, market_caps, benchmark, weighting="market_cap"):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"지원하지 않는 가중 방식입니다: {weighting}")
+        self.weighting = weighting
+        self.window = max(HORIZONS.values()) + 1
+        prices = np.asarray(prices, dtype=np.float64)[:, -self.window:]
+
+        # 섹터 소속 행렬 (섹터 × 종목)
+        sectors = np.asarray(sectors, dtype=object)
+        self.sectors, 소속 = np.unique(sectors, return_inverse=True)
+        membership = np.zeros((len(self.sectors), len(sectors)))
+        membership[소속, np.arange(len(sectors))] = 1.0
+        self.counts = membership.sum(axis=1).astype(int)
+
+        # 고정 가중치: 시총 가중은 최근 시총 / 최근 종가 (= 주식수), 동일가중은 1 / 기준일 종가
+        # 창 시작일 종가가 없는 종목(신규 상장 등)은 지수가 끊기지 않도록 제외
+        prices = _ffill(prices)
+        last = prices[:, -1]
+        if weighting == "market_cap":
+            scale = np.nan_to_num(np.asarray(market_caps, dtype=np.float64)) / last
+        else:
+            scale = 1.0 / prices[:, 0]
+        scale = np.where(np.isfinite(scale) & ~np.isnan(prices[:, 0]), scale, 0.0)
+        self.weights = membership * scale
+
+        self.last_prices = last
+        self.dates = list(pd.DatetimeIndex(dates)[-self.window:])
+        self.levels = self._levels(prices)
+        self.benchmark = np.asarray(benchmark, dtype=np.float64)[-self.window:]
+
+    def _levels(self, prices):
+        """종가(열 단위)를 섹터 지수로 변환"""
+        return self.weights @ np.nan_to_num(prices)
+
+    def append(self, date, prices, benchmark):
+        """새 봉 반영 — 결측 종목은 직전 종가 유지, 지수 한 열만 추가"""
+        prices = np.asarray(prices, dtype=np.float64)
+        prices = np.where(np.isnan(prices), self.last_prices, prices)
+        self.last_prices = prices
+        level = self._levels(prices[:, None])
+        self.levels = np.concatenate([self.levels, level], axis=1)[:, -self.window:]
+        self.benchmark = np.append(self.benchmark, benchmark)[-self.window:]
+        self.dates = (self.dates + [pd.Timestamp(date)])[-self.window:]
+
+    @property
+    def asof(self):
+        return self.dates[-1]
+
+    def index_frame(self):
+        """섹터 지수 (창 시작일 = 100) DataFrame"""
+        base = np.where(self.levels[:, :1] > 0, self.levels[:, :1], np.nan)
+        return pd.DataFrame((self.levels / base * 100).T, index=pd.DatetimeIndex(self.dates), columns=self.sectors)
+
+    def ranking(self):
+        """섹터별 기간 수익률·KOSPI 대비 상대강도 (%) — 3개월 상대강도 내림차순
+
+        반환 컬럼: 섹터, 종목수, 1개월/3개월/6개월 (상대강도), 3개월수익률, 상대강도(=3개월)
+        """
+        표 = {"섹터": self.sectors, "종목수": self.counts}
+        for 기간, days in HORIZONS.items():
+            if len(self.dates) <= days:
+                표[기간] = np.full(len(self.sectors), np.nan)
+                continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                섹터수익 = self.levels[:, -1] / self.levels[:, -1 - days]
+            시장수익 = self.benchmark[-1] / self.benchmark[-1 - days]
+            표[기간] = (섹터수익 / 시장수익 - 1) * 100
+            if 기간 == "3개월":
+                표["3개월수익률"] = (섹터수익 - 1) * 100
+        표.setdefault("3개월수익률", np.full(len(self.sectors), np.nan))
+        df = pd.DataFrame(표)
+        df["상대강도"] = df["3개월"]
+        return df.sort_values("상대강도", ascending=False, na_position="last").reset_index(drop=True)
+
+
+def _ffill(prices):
+    """종목별 결측 종가를 직전 값으로 채움 (행 = 종목)"""
+    mask = np.isnan(prices)
+    if not mask.any():
+        return prices
+    idx = np.where(mask, 0, np.arange(prices.shape[1]))
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return prices[np.arange(prices.shape[0])[:, None], idx]
+
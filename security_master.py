@@ -0,0 +1,177 @@
+"""
+AIA 2.0 — 종목 마스터
+프로세스당 한 번 적재하는 컬럼형 종목 정보 저장소
+
+종목코드 → 행 번호, 종목명 → 종목코드 인덱스를 두어 단건 조회는 O(1),
+여러 종목 조회는 행 번호 배열로 한 번에 처리합니다.
+AIA_SECURITY_MASTER 환경변수에 CSV 경로를 지정하면 전체 상장 종목을 적재하고,
+없으면 내장 샘플 종목(더미 데이터)을 사용합니다.
+"""
+
+import os
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# CSV 컬럼명 → 내부 컬럼명
+CSV_COLUMNS = {
+    "종목코드": "code",
+    "종목명": "name",
+    "섹터": "sector",
+    "현재가": "price",
+    "PER": "per",
+    "PBR": "pbr",
+    "시총": "market_cap",
+    "RSI": "rsi",
+    "밴드대비": "band",
+    "설명": "caption",
+}
+
+TEXT_COLUMNS = ("code", "name", "sector", "caption")
+NUMERIC_COLUMNS = ("price", "per", "pbr", "market_cap", "rsi", "band")
+
+# 내장 샘플 종목 (시총: 조원, 밴드대비: %)
+_SAMPLE_ROWS = [
+    # 종목코드, 종목명, 섹터, 현재가, PER, PBR, 시총, RSI, 밴드대비, 설명
+    ("005930", "삼성전자", "AI/반도체", 78000, 20.5, 2.1, 450, 58, 2.6, "🏭 반도체 | 시총 1위 | 배당주"),
+    ("035420", "네이버", "AI/반도체", 198000, 34.0, 4.2, 45, 62, 8.8, "💻 IT | 플랫폼 | 성장주"),
+    ("277810", "레인보우로보틱스", "로봇/자동화", 337000, 82.1, 5.2, 6.5, 64, 16.2, "🤖 로봇 | 혁신기업 | 테마주"),
+    ("373220", "LG에너지솔루션", "2차전지", 485000, 28.5, 3.8, 85, 45, -5.2, "🔋 배터리 | 글로벌 | ESG"),
+    ("035720", "카카오", "AI/반도체", 55000, 45.2, 3.5, 25, 55, 12.1, "💬 IT | 플랫폼 | 성장주"),
+    ("068270", "셀트리온", "바이오/헬스", 185000, 25.8, 2.9, 35, 72, 22.5, "💊 바이오 | 신약개발 | 성장"),
+    ("000660", "SK하이닉스", "AI/반도체", 89000, 15.2, 1.6, 65, 38.7, -12.3, "🏭 반도체 | 메모리 | 성장주"),
+    ("207940", "삼성바이오로직스", "바이오/헬스", 750000, 28.5, 6.1, 53, 62.3, 8.7, "💊 바이오 | 위탁생산 | 성장"),
+    ("051910", "LG화학", "화학/소재", 320000, 18.7, 1.1, 22, 52.1, -3.4, "🧪 화학 | 소재 | 경기민감"),
+    ("006400", "삼성SDI", "2차전지", 380000, 16.8, 1.4, 26, 48.9, -6.7, "🔋 배터리 | 글로벌 | 성장주"),
+    ("028260", "삼성물산", "건설", 85000, 8.9, 0.7, 16, 33.5, -18.9, "🏗️ 건설 | 지주 | 가치주"),
+    ("323410", "카카오뱅크", "금융/보험", 18500, 12.3, 1.5, 8.8, 44.1, -9.8, "🏦 금융 | 인터넷은행 | 성장주"),
+    ("454740", "L&K바이오메드", "바이오/헬스", 24500, 45.2, 3.3, 0.3, 67.8, 12.4, "💊 바이오 | 의료기기 | 테마주"),
+]
+
+
+class SecurityMaster:
+    """컬럼형 종목 마스터 (컬럼별 NumPy 배열 + 코드/종목명 인덱스)"""
+
+    def __init__(self, columns):
+        self.columns = {}
+        for key in TEXT_COLUMNS:
+            self.columns[key] = np.asarray(columns[key], dtype=object)
+        for key in NUMERIC_COLUMNS:
+            self.columns[key] = np.asarray(columns[key], dtype=np.float64)
+
+        codes = self.columns["code"]
+        self.code_index = {code: row for row, code in enumerate(codes)}
+        if len(self.code_index) != len(codes):
+            raise ValueError("종목 마스터에 중복된 종목코드가 있습니다")
+        self.name_index = {name: code for name, code in zip(self.columns["name"], codes)}
+
+    def __len__(self):
+        return len(self.columns["code"])
+
+    @classmethod
+    def from_rows(cls, rows):
+        """(종목코드, 종목명, ...) 튜플 목록으로 생성"""
+        keys = list(CSV_COLUMNS.values())
+        return cls({key: [row[i] for row in rows] for i, key in enumerate(keys)})
+
+    @classmethod
+    def from_frame(cls, df):
+        """한글 컬럼명 DataFrame으로 생성 (설명/PBR/시총 컬럼은 선택)"""
+        df = df.rename(columns=CSV_COLUMNS)
+        df["code"] = df["code"].astype(str).str.zfill(6)
+        for key in TEXT_COLUMNS:
+            if key not in df:
+                df[key] = ""
+        for key in NUMERIC_COLUMNS:
+            if key not in df:
+                df[key] = np.nan
+        return cls({key: df[key].to_numpy() for key in TEXT_COLUMNS + NUMERIC_COLUMNS})
+
+    @classmethod
+    def from_csv(cls, path):
+        """CSV 파일에서 적재 (종목코드는 문자열로 읽음)"""
+        return cls.from_frame(pd.read_csv(path, dtype={"종목코드": str}))
+
+    def resolve(self, code_or_name):
+        """종목코드 또는 종목명을 종목코드로 변환 (없으면 None)"""
+        if code_or_name in self.code_index:
+            return code_or_name
+        return self.name_index.get(code_or_name)
+
+    def row(self, code_or_name):
+        """단건 행 번호 조회 (없으면 -1)"""
+        code = self.resolve(code_or_name)
+        return self.code_index[code] if code is not None else -1
+
+    def rows(self, codes):
+        """여러 종목의 행 번호 배열 (없는 종목은 -1)"""
+        return np.fromiter((self.row(c) for c in codes), dtype=np.int64, count=len(codes))
+
+    def info(self, code_or_name):
+        """get_stock_info 호환 단건 정보 (없는 종목은 코드 기반 고정 더미값)"""
+        row = self.row(code_or_name)
+        if row < 0:
+            return placeholder_info(code_or_name)
+        col = self.columns
+        return {
+            'code': col["code"][row],
+            'name': col["name"][row],
+            'sector': col["sector"][row],
+            'price': float(col["price"][row]),
+            'PER': float(col["per"][row]),
+            'PBR': float(col["pbr"][row]),
+            '시총': float(col["market_cap"][row]),
+            'RSI': float(col["rsi"][row]),
+            '밴드대비': float(col["band"][row]),
+            'caption': col["caption"][row],
+        }
+
+    def bulk_info(self, codes):
+        """여러 종목 정보를 한글 컬럼 DataFrame으로 일괄 조회 (없는 종목 제외)"""
+        rows = self.rows(codes)
+        return self.to_frame(rows[rows >= 0])
+
+    def to_frame(self, rows=None):
+        """tab_analyst 형식 DataFrame (rows 미지정 시 전체)"""
+        col = self.columns
+        if rows is None:
+            rows = slice(None)
+        return pd.DataFrame({
+            "종목코드": col["code"][rows],
+            "종목명": col["name"][rows],
+            "섹터": col["sector"][rows],
+            "시총": col["market_cap"][rows],
+            "현재가": col["price"][rows],
+            "PER": col["per"][rows],
+            "PBR": col["pbr"][rows],
+            "RSI": col["rsi"][rows],
+            "밴드대비": col["band"][rows],
+        })
+
+
+def placeholder_info(종목코드):
+    """마스터에 없는 종목의 더미 정보 (같은 코드는 항상 같은 값)"""
+    rng = np.random.default_rng(zlib.crc32(str(종목코드).encode("utf-8")))
+    return {
+        'code': 종목코드,
+        'name': f'종목{종목코드}',
+        'sector': '기타',
+        'price': float(50000 + rng.integers(-20000, 20000)),
+        'PER': float(15 + rng.integers(-10, 15)),
+        'PBR': float('nan'),
+        '시총': float('nan'),
+        'RSI': float(50 + rng.integers(-30, 30)),
+        '밴드대비': float(rng.integers(-20, 20)),
+        'caption': "📈 우량주",
+    }
+
+
+@lru_cache(maxsize=1)
+def load_security_master():
+    """프로세스 공용 종목 마스터 (최초 호출 시 한 번만 적재)"""
+    path = os.environ.get("AIA_SECURITY_MASTER")
+    if path and os.path.exists(path):
+        return SecurityMaster.from_csv(path)
+    return SecurityMaster.from_rows(_SAMPLE_ROWS)
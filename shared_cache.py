@@ -0,0 +1,166 @@
+"""
+AIA 2.0 — 프로세스 공용 캐시
+모든 스트림릿 세션이 공유하는 TTL + LRU 캐시
+
+키는 (데이터셋, 종목, 기준봉) 튜플이며, 같은 키를 여러 세션이 동시에 요청하면
+한 세션만 계산하고 나머지는 그 결과를 기다려 재사용합니다.
+캐시된 값은 세션 간에 공유되므로 호출하는 쪽에서 수정하지 않아야 합니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+CacheKey = namedtuple("CacheKey", ["dataset", "ticker", "asof"])
+
+DEFAULT_MAXSIZE = 2048
+DEFAULT_TTL = 6 * 60 * 60  # 6시간
+
+
+class _InFlight:
+    """계산 중인 키 — 같은 키 요청은 완료될 때까지 대기"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SharedCache:
+    """스레드 안전 TTL + 크기 제한 LRU 캐시 (적중/미스/만료/축출 카운터 포함)"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (만료시각, 값)
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def _lookup(self, key, now):
+        """잠금 상태에서 유효한 값 조회 (만료 항목은 제거)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < now:
+            del self._entries[key]
+            self.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value, ttl):
+        """잠금 상태에서 값 저장 후 용량 초과분을 오래된 순으로 축출"""
+        self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        """캐시 조회 (없거나 만료되면 default)"""
+        with self._lock:
+            found, value = self._lookup(key, self._clock())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value, ttl=None):
+        """값 저장 (ttl 미지정 시 기본 TTL)"""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """캐시에 있으면 반환, 없으면 한 번만 계산해 저장 후 반환"""
+        with self._lock:
+            found, value = self._lookup(key, self._clock())
+            if found:
+                self.hits += 1
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = self._inflight[key] = _InFlight()
+                owner = True
+            else:
+                # 다른 세션이 계산 중인 값을 기다리는 경우도 적중으로 집계
+                self.hits += 1
+                owner = False
+
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            pending.error = exc
+            raise
+        else:
+            pending.value = value
+            with self._lock:
+                self._store(key, value, ttl)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.event.set()
+
+    def invalidate(self, dataset=None, ticker=None):
+        """데이터셋/종목 조건에 맞는 항목 삭제 (조건 없으면 전체) 후 삭제 건수 반환"""
+        with self._lock:
+            targets = [
+                key for key in self._entries
+                if (dataset is None or key[0] == dataset) and (ticker is None or key[1] == ticker)
+            ]
+            for key in targets:
+                del self._entries[key]
+        return len(targets)
+
+    def stats(self):
+        """적중/미스 카운터와 현재 크기"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_shared = SharedCache()
+
+
+def shared_cache():
+    """프로세스 공용 캐시 인스턴스"""
+    return _shared
+
+
+def current_asof(now=None):
+    """캐시 기준봉 — 가장 최근 영업일 (주말이면 직전 금요일)"""
+    today = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    today = today.normalize()
+    return today if today.dayofweek < 5 else today - pd.offsets.BDay(1)
+
+
+def cached_dataset(dataset, compute, ticker=None, asof=None, ttl=None):
+    """(dataset, ticker, asof) 키로 공용 캐시를 거쳐 계산"""
+    key = CacheKey(dataset, ticker, current_asof() if asof is None else asof)
+    return _shared.get_or_compute(key, compute, ttl)
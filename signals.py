@@ -0,0 +1,142 @@
+"""
+AIA 2.0 — 모멘텀 + RSI 매매 신호 점수
+단일 종목용 스칼라 함수와 전체 유니버스용 벡터화 함수
+
+벡터화 버전은 스칼라 버전의 if/elif 순서를 np.select 조건 순서로 그대로
+옮겨 모든 입력에서 동일한 점수를 반환합니다. (NaN 입력은 해당 항목 0점)
+"""
+
+import numpy as np
+
+
+def calculate_momentum_rsi_signal(rsi, ma20_momentum, ma60_momentum):
+    """단순 모멘텀 + RSI 기반 매매 신호 계산"""
+    score = 0
+
+    # RSI 신호 (50% 가중치)
+    if rsi < 30:
+        score += 50  # 강한 매수
+    elif rsi < 40:
+        score += 30  # 보통 매수
+    elif rsi < 50:
+        score += 10  # 약한 매수
+    elif rsi > 70:
+        score -= 30  # 매도 신호
+    elif rsi > 80:
+        score -= 50  # 강한 매도
+
+    # 단기 모멘텀 신호 (30% 가중치)
+    if ma20_momentum > 5:
+        score += 30
+    elif ma20_momentum > 0:
+        score += 15
+    elif ma20_momentum < -5:
+        score -= 20
+    elif ma20_momentum < -10:
+        score -= 30
+
+    # 장기 모멘텀 신호 (20% 가중치)
+    if ma60_momentum > 10:
+        score += 20
+    elif ma60_momentum > 0:
+        score += 10
+    elif ma60_momentum < -10:
+        score -= 15
+    elif ma60_momentum < -20:
+        score -= 25
+
+    return max(0, min(100, score))
+
+
+def calculate_buy_signal_score(rsi, bollinger_position, ma20_diff, ma60_diff):
+    """단순 모멘텀 + RSI 기반 매수 신호 점수 계산 (0-100)"""
+    score = 50  # 기본 점수
+
+    # RSI 기반 점수 (가중치 40%)
+    if rsi < 30:
+        rsi_score = 40  # 강한 매수 신호
+    elif rsi < 40:
+        rsi_score = 25  # 보통 매수 신호
+    elif rsi < 50:
+        rsi_score = 10  # 약한 매수 신호
+    elif rsi > 70:
+        rsi_score = -30  # 매도 신호
+    elif rsi > 80:
+        rsi_score = -50  # 강한 매도 신호
+    else:
+        rsi_score = 0  # 중립
+
+    # 모멘텀 기반 점수 (가중치 60%)
+    momentum_score = 0
+
+    # 20일선 모멘텀 (30% 가중치)
+    if ma20_diff > 5:
+        momentum_score += 20
+    elif ma20_diff > 0:
+        momentum_score += 10
+    elif ma20_diff < -5:
+        momentum_score -= 15
+    elif ma20_diff < -10:
+        momentum_score -= 25
+
+    # 60일선 모멘텀 (30% 가중치)
+    if ma60_diff > 10:
+        momentum_score += 20
+    elif ma60_diff > 0:
+        momentum_score += 10
+    elif ma60_diff < -10:
+        momentum_score -= 15
+    elif ma60_diff < -20:
+        momentum_score -= 25
+
+    # 최종 점수 계산
+    final_score = score + rsi_score + momentum_score
+
+    return max(0, min(100, final_score))
+
+
+def _tiered(values, thresholds, points):
+    """if/elif 단계 점수를 np.select로 변환 (thresholds: (비교연산, 기준값) 목록)"""
+    values = np.asarray(values, dtype=np.float64)
+    conditions = [op(values, level) for op, level in thresholds]
+    return np.select(conditions, points, default=0)
+
+
+_RSI_TIERS = [(np.less, 30), (np.less, 40), (np.less, 50), (np.greater, 70), (np.greater, 80)]
+_MA20_TIERS = [(np.greater, 5), (np.greater, 0), (np.less, -5), (np.less, -10)]
+_MA60_TIERS = [(np.greater, 10), (np.greater, 0), (np.less, -10), (np.less, -20)]
+
+
+def batch_momentum_rsi_signal(rsi, ma20_momentum, ma60_momentum):
+    """calculate_momentum_rsi_signal의 벡터화 버전 (입력 배열은 브로드캐스트 가능해야 함)"""
+    score = (
+        _tiered(rsi, _RSI_TIERS, [50, 30, 10, -30, -50])
+        + _tiered(ma20_momentum, _MA20_TIERS, [30, 15, -20, -30])
+        + _tiered(ma60_momentum, _MA60_TIERS, [20, 10, -15, -25])
+    )
+    return np.clip(score, 0, 100)
+
+
+def batch_buy_signal_score(rsi, bollinger_position, ma20_diff, ma60_diff):
+    """calculate_buy_signal_score의 벡터화 버전 (bollinger_position은 스칼라 버전과 동일하게 미사용)"""
+    score = (
+        50
+        + _tiered(rsi, _RSI_TIERS, [40, 25, 10, -30, -50])
+        + _tiered(ma20_diff, _MA20_TIERS, [20, 10, -15, -25])
+        + _tiered(ma60_diff, _MA60_TIERS, [20, 10, -15, -25])
+    )
+    return np.clip(score, 0, 100)
+
+
+def score_latest(indicator_panel):
+    """indicators.compute_indicators 결과의 마지막 거래일 기준 종목별 점수"""
+    latest = {k: np.asarray(v)[..., -1] for k, v in indicator_panel.items()}
+    return {
+        "momentum_rsi": batch_momentum_rsi_signal(
+            latest["rsi"], latest["ma20_momentum"], latest["ma60_momentum"]
+        ),
+        "buy_signal": batch_buy_signal_score(
+            latest["rsi"], latest["bollinger_position"],
+            latest["ma20_momentum"], latest["ma60_momentum"]
+        ),
+    }
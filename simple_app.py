@@ -1,10 +1,6 @@
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import random
+
+# 차트 라이브러리·가격 저장소·planning 모듈은 각 단계 함수 안에서 필요한 것만 가져옵니다
 
 # 페이지 설정
 st.set_page_config(
@@ -397,6 +393,10 @@ def step_consultant():
 
 def step_market_analyst():
     """5단계: 시장전략가"""
+    import plotly.graph_objects as go
+
+    from price_matrix import close_series
+    
     st.markdown('<div class="main-title">📊 시장전략가</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">거시경제 분석 및 시장 전망</div>', unsafe_allow_html=True)
     
@@ -417,14 +417,13 @@ def step_market_analyst():
     # 시장 분석
     st.markdown("### 🔍 현재 시장 분석")
     
-    # 차트 데이터 생성
-    dates = pd.date_range(start='2024-01-01', end='2024-10-15', freq='D')
-    kospi_data = 2400 + np.cumsum(np.random.randn(len(dates)) * 5)
+    # 차트 데이터 (유니버스 종가 행렬, 없으면 로컬 가격 저장소)
+    kospi = close_series("KOSPI", "2024-01-01", "2024-10-15", base_price=2400)
     
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        x=dates, 
-        y=kospi_data,
+        x=kospi.index, 
+        y=kospi.values,
         mode='lines',
         name='KOSPI',
         line=dict(color='#1f77b4', width=2)
@@ -472,25 +471,20 @@ def step_market_analyst():
 
 def step_asset_allocator():
     """6단계: 자산배분전문가"""
+    import plotly.express as px
+
+    from planning import recommend_allocation_by_tolerance
+    
     st.markdown('<div class="main-title">💰 자산배분전문가</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">최적화된 포트폴리오 구성</div>', unsafe_allow_html=True)
     
     st.markdown("---")
     
     # 사용자 프로필 기반 추천
+    risk_level = None
     if st.session_state.user_profile:
         risk_level = st.session_state.user_profile.get('risk_tolerance', '보통 (10-20%)')
-        
-        if "매우 보수적" in risk_level:
-            portfolio = {"현금/예금": 40, "채권": 40, "주식": 15, "대안투자": 5}
-        elif "보수적" in risk_level:
-            portfolio = {"현금/예금": 20, "채권": 50, "주식": 25, "대안투자": 5}
-        elif "보통" in risk_level:
-            portfolio = {"현금/예금": 10, "채권": 30, "주식": 50, "대안투자": 10}
-        else:  # 적극적
-            portfolio = {"현금/예금": 5, "채권": 15, "주식": 65, "대안투자": 15}
-    else:
-        portfolio = {"현금/예금": 10, "채권": 30, "주식": 50, "대안투자": 10}
+    portfolio = recommend_allocation_by_tolerance(risk_level)
     
     # 파이 차트
     fig = px.pie(
@@ -519,6 +513,10 @@ def step_asset_allocator():
 
 def step_sector_researcher():
     """7단계: 산업리서처"""
+    import plotly.express as px
+
+    from planning import build_sector_table
+    
     st.markdown('<div class="main-title">🔍 산업리서처</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">유망 섹터 발굴 및 분석</div>', unsafe_allow_html=True)
     
@@ -551,10 +549,8 @@ def step_sector_researcher():
     # 섹터 성과 차트
     st.markdown("### 📊 섹터별 성과 비교 (최근 3개월)")
     
-    sectors_perf = pd.DataFrame({
-        '섹터': ['AI/빅데이터', '2차전지', '바이오헬스', '사이버보안', '친환경에너지', '전통제조', '금융'],
-        '수익률(%)': [18.5, 12.3, 15.7, 8.9, 6.4, -2.1, 3.8]
-    })
+    # 구성 종목 종가로 만든 섹터 지수의 3개월 수익률 (거래일마다 한 번 계산)
+    sectors_perf = build_sector_table().rename(columns={'3개월수익률': '수익률(%)'}).sort_values('수익률(%)', ascending=False)
     
     fig = px.bar(
         sectors_perf, 
@@ -570,6 +566,12 @@ def step_sector_researcher():
 
 def step_stock_analyzer():
     """8단계: 종목분석가"""
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    from planning import price_signal_summary
+    from price_matrix import close_series
+    
     st.markdown('<div class="main-title">📈 종목분석가</div>', unsafe_allow_html=True)
     st.markdown('<div class="subtitle">모멘텀 + RSI 기반 종목 추천</div>', unsafe_allow_html=True)
     
@@ -603,38 +605,16 @@ def step_stock_analyzer():
     # 모멘텀 분석 예시 (삼성전자)
     st.markdown("### 📊 모멘텀 분석 예시: 삼성전자")
     
-    # 가상 주가 데이터 생성
-    dates = pd.date_range(start='2024-07-01', end='2024-10-15', freq='D')
-    prices = 65000 + np.cumsum(np.random.randn(len(dates)) * 800)
-    
-    # RSI 계산 (간단 버전)
-    rsi_values = []
-    for i in range(len(prices)):
-        if i < 14:
-            rsi_values.append(50)
-        else:
-            gains = []
-            losses = []
-            for j in range(i-13, i+1):
-                if j > 0:
-                    change = prices[j] - prices[j-1]
-                    if change > 0:
-                        gains.append(change)
-                        losses.append(0)
-                    else:
-                        gains.append(0)
-                        losses.append(abs(change))
-            
-            avg_gain = np.mean(gains) if gains else 0
-            avg_loss = np.mean(losses) if losses else 0
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
+    # 주가 데이터 (유니버스 종가 행렬, 지표 워밍업용으로 120일 앞 구간까지 조회)
+    close = close_series("005930", "2024-07-01", "2024-10-15", base_price=65000, warmup_days=120)
+    
+    # RSI / 20일선 모멘텀 계산 및 신호 요약 (헤드리스 플래너)
+    분석 = price_signal_summary(close, "2024-07-01")
+    dates = 분석['dates']
+    prices = 분석['prices']
+    rsi_values = 분석['rsi']
+    현재RSI = 분석['현재RSI']
+    현재모멘텀 = 분석['현재모멘텀']
     
     # 차트 생성
     fig = go.Figure()
@@ -679,20 +659,23 @@ def step_stock_analyzer():
     
     col1, col2, col3 = st.columns(3)
     
+    모멘텀설명, 모멘텀신호 = 분석['모멘텀설명'], 분석['모멘텀신호']
+    RSI설명, RSI신호 = 분석['RSI설명'], 분석['RSI신호']
+    
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         **📈 모멘텀 분석**
-        - 20일 이평선 상향 돌파
+        - {모멘텀설명} ({현재모멘텀:+.1f}%)
         - 거래량 증가 확인
-        - **신호: 매수**
+        - **신호: {모멘텀신호}**
         """)
     
     with col2:
-        st.markdown("""
+        st.markdown(f"""
         **⚖️ RSI 분석**
-        - 현재 RSI: 45
-        - 과매도 구간 탈출
-        - **신호: 중립**
+        - 현재 RSI: {현재RSI:.0f}
+        - {RSI설명}
+        - **신호: {RSI신호}**
         """)
     
     with col3:
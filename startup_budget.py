@@ -0,0 +1,95 @@
+"""
+AIA 2.0 — 시작 시간 예산 점검
+스트림릿 진입점을 새 프로세스에서 실행해 첫 요청(콜드 스타트)과 재실행 시간을 측정
+
+    python startup_budget.py                    # 세 진입점 모두 점검, 예산 초과 시 종료코드 1
+    python startup_budget.py app.py --reruns 10
+
+측정 항목 (초)
+- streamlit: 스트림릿 프레임워크 import (앱 코드와 무관한 고정 비용)
+- cold: 새 프로세스에서 첫 화면 스크립트 실행 (앱 모듈 import + 설정 + 첫 렌더)
+- rerun: 같은 화면 재실행 중앙값 (위젯 조작마다 드는 비용)
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = ("app.py", "simple_app.py", "simple_app_v2.py")
+
+# 예산 (초) — 1 vCPU 컨테이너 기준
+BUDGETS = {"cold": 0.5, "rerun": 0.15}
+
+# 첫 화면에서 적재되지 않아야 하는 무거운 모듈 (plotly.graph_objects는 스트림릿이 직접 가져옴)
+DEFERRED_MODULES = ("pandas", "plotly.express", "optimizer", "montecarlo", "price_store")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _measure_child(entry, reruns):
+    """(자식 프로세스) 진입점 첫 실행·재실행 시간 측정 후 JSON 출력"""
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    t1 = time.perf_counter()
+
+    at = AppTest.from_file(os.path.join(ROOT, entry), default_timeout=120)
+    at.run()
+    t2 = time.perf_counter()
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "entry": entry,
+        "streamlit": t1 - t0,
+        "cold": t2 - t1,
+        "rerun": statistics.median(times) if times else float("nan"),
+        "loaded": loaded,
+        "error": [str(e.value) for e in at.exception][:1],
+    }, ensure_ascii=False))
+
+
+def measure(entry, reruns=5):
+    """새 파이썬 프로세스에서 진입점 측정 (import 캐시가 없는 콜드 스타트)"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", entry, "--reruns", str(reruns)],
+        capture_output=True, text=True, cwd=ROOT, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스트림릿 진입점 콜드 스타트·재실행 시간 예산 점검")
+    parser.add_argument("entries", nargs="*", default=list(ENTRY_POINTS))
+    parser.add_argument("--reruns", type=int, default=5, help="재실행 측정 횟수")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _measure_child(args.child, args.reruns)
+        return 0
+
+    초과 = False
+    print(f"{'진입점':<18}{'streamlit':>10}{'cold':>8}{'rerun':>8}  첫 화면에서 적재된 무거운 모듈")
+    for entry in args.entries:
+        r = measure(entry, args.reruns)
+        over = [k for k, limit in BUDGETS.items() if r[k] > limit]
+        초과 |= bool(over) or bool(r["error"])
+        표시 = ", ".join(r["loaded"]) or "-"
+        경고 = f"  ⚠ 예산 초과: {', '.join(over)}" if over else ""
+        오류 = f"  ⚠ 오류: {r['error'][0]}" if r["error"] else ""
+        print(f"{entry:<18}{r['streamlit']:>10.3f}{r['cold']:>8.3f}{r['rerun']:>8.3f}  {표시}{경고}{오류}")
+    print(f"예산: cold ≤ {BUDGETS['cold']}s, rerun ≤ {BUDGETS['rerun']}s")
+    return 1 if 초과 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
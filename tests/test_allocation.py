@@ -0,0 +1,44 @@
+"""
+최종 자산배분 — 성향·거시 관점·배분 전략별 주식 비중 순서 검사 (27개 조합)
+"""
+
+import pytest
+
+from planning.allocation import MACRO_VIEWS, STRATEGIES, TENDENCIES, optimize_final_allocation
+
+
+@pytest.fixture(scope="module")
+def 주식비중():
+    return {
+        (t, m, s): optimize_final_allocation(t, m, s)["비중"]["주식"]
+        for t in TENDENCIES for m in MACRO_VIEWS for s in STRATEGIES
+    }
+
+
+@pytest.mark.parametrize("거시선택", MACRO_VIEWS)
+@pytest.mark.parametrize("사용자성향", TENDENCIES)
+def test_strategy_order(주식비중, 사용자성향, 거시선택):
+    """방어형 < 균형형 < 공격형 순으로 주식 비중 증가"""
+    비중 = [주식비중[(사용자성향, 거시선택, s)] for s in STRATEGIES]
+    assert 비중[0] < 비중[1] < 비중[2]
+
+
+@pytest.mark.parametrize("자산배분선택", STRATEGIES)
+@pytest.mark.parametrize("거시선택", MACRO_VIEWS)
+def test_stable_not_above_neutral(주식비중, 거시선택, 자산배분선택):
+    """안정형 주식 비중은 중립형 이하"""
+    assert 주식비중[("안정형", 거시선택, 자산배분선택)] <= 주식비중[("중립형", 거시선택, 자산배분선택)]
+
+
+def test_table_rebuilt_on_formula_change(tmp_path, monkeypatch):
+    """같은 기준봉이라도 배분 공식 서명이 다르면 저장된 조회표를 다시 계산"""
+    from planning import allocation
+
+    path = str(tmp_path / "allocation_table.npz")
+    table = allocation.AllocationTable.build()
+    table.save(path)
+    monkeypatch.setattr(allocation, "MACRO_EQUITY_SHIFT", {"보수형": -4, "중립형": 0, "공격형": 4})
+    assert allocation.formula_signature() != table.signature
+    loaded = allocation.load_allocation_table(path)
+    assert loaded.signature == allocation.formula_signature()
+    assert not loaded.verify()